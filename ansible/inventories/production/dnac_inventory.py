@@ -8,7 +8,12 @@ Hosts are grouped by their ``family`` attribute (e.g. ``routers``,
 management IP), username, password and network OS derived from the
 device's software type.  Credentials and the base URL for Catalyst
 Center are read from environment variables ``DNAC_BURL``,
-``DNAC_USER`` and ``DNAC_PASS``.
+``DNAC_USER`` and ``DNAC_PASS``.  Device pages are fetched in parallel;
+``DNAC_INVENTORY_WORKERS`` sets how many page requests may be in
+flight at once (default 8, use 1 for sequential paging).  Responses
+are shared with the other tools through the on-disk cache described in
+:mod:`na_utils.cache`; export ``DNAC_CACHE=refresh`` or ``DNAC_CACHE=off``
+to bypass it, since Ansible does not pass extra options to the script.
 
 Usage:
 
@@ -41,7 +46,8 @@ from na_utils.dnac import get_device_list, to_ansible_inventory
 
 def generate_inventory() -> dict[str, Any]:
     """Fetch devices from Catalyst Center and build an inventory."""
-    devices = get_device_list()
+    max_in_flight = int(os.getenv("DNAC_INVENTORY_WORKERS", "8"))
+    devices = get_device_list(max_in_flight=max_in_flight, as_models=True)
     return to_ansible_inventory(devices)
 
 
@@ -15,16 +15,77 @@ Modules
 
 ``dnac``
     Wraps Cisco DNA (Catalyst) Center API calls such as token
-    retrieval, generic GET requests, and device listing.  See
+    retrieval, generic GET requests, and device listing.  Requests
+    share a pooled session owned by :class:`~na_utils.dnac.DnacClient`.  See
     :mod:`na_utils.dnac` for details.
 
+``dnac_async``
+    :mod:`asyncio` versions of the :mod:`na_utils.dnac` helpers built
+    on :mod:`aiohttp`, for fanning out many queries from one process.
+
+``jsonstream``
+    Incremental decoder that yields the records of a large JSON list
+    response as it arrives, with optional field projection.
+
+``models``
+    Compact, slotted record types such as
+    :class:`~na_utils.models.NetworkDevice`.
+
+``inventory``
+    :class:`~na_utils.inventory.DeviceInventory` indexes a device list
+    for constant time lookups by hostname, IP, serial, id, family,
+    reachability and site, plus fast hostname substring/glob matching.
+
+``net_device_async``
+    :mod:`asyncssh` based sessions with IOS prompt and configuration
+    mode handling, for collecting from thousands of devices in one
+    process.
+
+``simulate``
+    Dry-run mode for push scripts: applies their commands to a model of
+    archived configurations in a process pool and reports predicted
+    diffs.
+
+``transaction``
+    Per-device transactional changes: snapshot, apply, verify the
+    touched sections, then save or roll back.
+
+``change_plan``
+    Plans ``no`` command lists against a device's archived
+    configuration, keeping only configured targets in dependency order.
+
+``command_compiler``
+    Rewrites flat per-interface command lists into ``interface range``
+    blocks without redundant ``exit`` lines.
+
+``ios_config``
+    One-pass IOS configuration parser with a parent/child tree, a
+    top-level keyword index and ``ciscoconfparse`` style queries.
+
 ``config_utils``
-    Contains helpers for performing configuration diffs using the
-    standard library and third‑party libraries.
+    Contains helpers for performing configuration diffs: unified text
+    diffs and a built-in block-aware structured diff that also renders
+    remediation commands.
+
+``line_diff``
+    Unified diffs in :mod:`difflib` format computed with interned lines
+    and Myers' linear-space algorithm, for large configurations.  Opt
+    in with ``fast=True``; hunks may differ from :mod:`difflib`'s.
+
+``config_store``
+    Content-addressed, compressed archive of device configurations
+    with per-device history, latest/as-of lookups and change detection.
+
+``batch_diff``
+    Fleet-wide diffs between two snapshots (directories or archive
+    dates) that skip unchanged devices by hash and diff the rest in a
+    process pool.
 
 ``net_device``
     Provides convenience wrappers around the Netmiko library for
-    connecting to network devices and executing configuration sets.
+    connecting to network devices and executing configuration sets,
+    a thread pool fan-out executor (``run_on_devices``) and a
+    per-host SSH ``ConnectionPool``.
 
 The package attempts to follow Python best practices as described in
 PEP 8 and the `Real Python`_ guide.  In particular, every public
@@ -35,11 +96,12 @@ sure to add appropriate documentation and unit tests.
 .. _Real Python: https://realpython.com/python-pep8/
 """
 
-from .dnac import get_device_list, get_api_response, get_auth_token  # noqa: F401
+from .dnac import DnacClient, get_device_list, get_api_response, get_auth_token  # noqa: F401
 from .config_utils import compare_configs  # noqa: F401
 from .net_device import connect_device, send_config_commands  # noqa: F401
 
 __all__ = [
+    "DnacClient",
     "get_device_list",
     "get_api_response",
     "get_auth_token",
@@ -0,0 +1,214 @@
+"""Fleet-wide configuration diffs between two snapshots.
+
+:func:`na_utils.config_utils.compare_configs` compares two files.
+Answering "what changed across the fleet since yesterday" with it means
+one run per device.  :func:`iter_batch_diff` compares two complete
+snapshots in one call instead.  A snapshot is either a directory of
+``<hostname>.conf`` files, as written by ``get_device_config_v2.py``,
+or a point in time of a :class:`~na_utils.config_store.ConfigStore`.
+
+* Configurations are compared after :func:`~na_utils.config_store.normalize_config`,
+  so volatile lines never show up as changes.
+* Pairs whose digests are known to match (archive snapshots) are
+  skipped without reading either configuration.  Other pairs are
+  hashed in the worker before any diff is computed.
+* Changed pairs are diffed in a process pool and results are yielded
+  as they complete.  ``fast=True`` uses
+  :func:`~na_utils.line_diff.unified_diff` instead of :mod:`difflib`.
+
+Usage example:
+
+    >>> from na_utils.batch_diff import iter_batch_diff, load_snapshot
+    >>> store = ConfigStore("/backups/archive")
+    >>> old = load_snapshot("2026-01-30", store=store)
+    >>> new = load_snapshot("2026-01-31", store=store)
+    >>> for result in iter_batch_diff(old, new):
+    ...     print(result.hostname, result.added, result.removed)
+"""
+
+from __future__ import annotations
+
+import difflib
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .config_store import ConfigStore, config_digest, normalize_config
+from .line_diff import unified_diff
+
+# Suffix of configuration files in snapshot directories.
+CONFIG_SUFFIX = ".conf"
+
+
+@dataclass(frozen=True)
+class ConfigRef:
+    """Location of one configuration in a snapshot.
+
+    :param label: Name used in diff headers.
+    :param path: Configuration file, for directory snapshots.
+    :param store_root: Archive root, for archive snapshots.
+    :param digest: Normalised digest, when known without reading.
+    """
+
+    label: str
+    path: Optional[str] = None
+    store_root: Optional[str] = None
+    digest: Optional[str] = None
+
+    def load(self) -> str:
+        """Return the normalised configuration text."""
+        if self.path is not None:
+            with open(self.path, "r", encoding="utf-8", errors="replace") as fh:
+                return normalize_config(fh.read())
+        return ConfigStore(self.store_root).read(self.digest)
+
+
+@dataclass
+class DeviceDiff:
+    """Difference between two snapshots of one device.
+
+    ``status`` is ``changed``, ``unchanged``, ``added`` (only in the new
+    snapshot) or ``removed`` (only in the old snapshot).
+    """
+
+    hostname: str
+    status: str
+    added: int = 0
+    removed: int = 0
+    diff: str = ""
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the result as a JSON serialisable dictionary."""
+        return asdict(self)
+
+
+def load_snapshot(spec: str, *, store: Optional[ConfigStore] = None) -> Dict[str, ConfigRef]:
+    """Resolve a snapshot specification to per-device references.
+
+    :param spec: A directory of ``<hostname>.conf`` files, or, with
+        ``store``, a date/timestamp understood by
+        :meth:`ConfigStore.as_of` or ``latest``.
+    :param store: Archive used for non-directory specifications.
+    :returns: Mapping of hostname to :class:`ConfigRef`.
+    :raises ValueError: If ``spec`` is neither a directory nor usable
+        with ``store``.
+    """
+    if os.path.isdir(spec):
+        refs: Dict[str, ConfigRef] = {}
+        with os.scandir(spec) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith(CONFIG_SUFFIX):
+                    hostname = entry.name[: -len(CONFIG_SUFFIX)]
+                    refs[hostname] = ConfigRef(label=entry.path, path=entry.path)
+        return refs
+    if store is None:
+        raise ValueError(f"'{spec}' is not a directory and no configuration archive was given")
+    snapshots = store.snapshot(None if spec == "latest" else spec)
+    return {
+        hostname: ConfigRef(label=f"{hostname}@{snap.timestamp}", store_root=store.root, digest=snap.digest)
+        for hostname, snap in snapshots.items()
+    }
+
+
+def _count_changes(diff_lines: List[str]) -> Tuple[int, int]:
+    added = removed = 0
+    for line in diff_lines:
+        if line.startswith("+") and not line.startswith("+++"):
+            added += 1
+        elif line.startswith("-") and not line.startswith("---"):
+            removed += 1
+    return added, removed
+
+
+def diff_pair(
+    hostname: str, old: Optional[ConfigRef], new: Optional[ConfigRef], context: int = 3, fast: bool = False
+) -> DeviceDiff:
+    """Diff one device between two snapshots.
+
+    Runs in a worker process.  The normalised digests are compared
+    first and the diff is only computed when they differ.
+    """
+    old_text = old.load() if old is not None else ""
+    new_text = new.load() if new is not None else ""
+    if old is not None and new is not None:
+        if config_digest(old_text, normalized=True) == config_digest(new_text, normalized=True):
+            return DeviceDiff(hostname, "unchanged")
+        status = "changed"
+    else:
+        status = "added" if old is None else "removed"
+    diff_lines = list(
+        (unified_diff if fast else difflib.unified_diff)(
+            old_text.splitlines(),
+            new_text.splitlines(),
+            fromfile=old.label if old is not None else "/dev/null",
+            tofile=new.label if new is not None else "/dev/null",
+            n=context,
+            lineterm="",
+        )
+    )
+    added, removed = _count_changes(diff_lines)
+    return DeviceDiff(hostname, status, added, removed, "\n".join(diff_lines))
+
+
+def iter_batch_diff(
+    old: Dict[str, ConfigRef],
+    new: Dict[str, ConfigRef],
+    *,
+    workers: Optional[int] = None,
+    context: int = 3,
+    include_unchanged: bool = False,
+    fast: bool = False,
+) -> Iterator[DeviceDiff]:
+    """Diff every device between two snapshots, yielding results as they finish.
+
+    :param old: Earlier snapshot from :func:`load_snapshot`.
+    :param new: Later snapshot from :func:`load_snapshot`.
+    :param workers: Size of the process pool; defaults to the CPU count.
+        ``1`` diffs in the calling process.
+    :param context: Lines of context in unified diffs.
+    :param include_unchanged: Also yield ``unchanged`` results.
+    :param fast: Diff with :func:`na_utils.line_diff.unified_diff`.
+    :returns: An iterator over :class:`DeviceDiff` objects.
+    """
+    pending = []
+    for hostname in sorted(set(old) | set(new)):
+        before, after = old.get(hostname), new.get(hostname)
+        if before is not None and after is not None and before.digest and before.digest == after.digest:
+            if include_unchanged:
+                yield DeviceDiff(hostname, "unchanged")
+            continue
+        pending.append((hostname, before, after))
+
+    if workers == 1 or len(pending) <= 1:
+        results = (diff_pair(hostname, before, after, context, fast) for hostname, before, after in pending)
+        for result in results:
+            if include_unchanged or result.status != "unchanged":
+                yield result
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(diff_pair, hostname, before, after, context, fast) for hostname, before, after in pending]
+        try:
+            for future in as_completed(futures):
+                result = future.result()
+                if include_unchanged or result.status != "unchanged":
+                    yield result
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+def batch_diff(old: Dict[str, ConfigRef], new: Dict[str, ConfigRef], **kwargs: Any) -> List[DeviceDiff]:
+    """Return :func:`iter_batch_diff` results sorted by hostname."""
+    return sorted(iter_batch_diff(old, new, **kwargs), key=lambda result: result.hostname)
+
+
+def format_summary(results: List[DeviceDiff]) -> str:
+    """Return a plain text table of per-device added/removed line counts."""
+    width = max([len("Device")] + [len(result.hostname) for result in results])
+    lines = [f"{'Device':<{width}}  {'Status':<9}  {'Added':>7}  {'Removed':>7}"]
+    lines.append("-" * len(lines[0]))
+    for result in sorted(results, key=lambda r: r.hostname):
+        lines.append(f"{result.hostname:<{width}}  {result.status:<9}  {result.added:>7}  {result.removed:>7}")
+    return "\n".join(lines)
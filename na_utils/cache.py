@@ -0,0 +1,196 @@
+"""On-disk TTL cache for read-only Catalyst Center responses.
+
+Several scripts in this repository download the full device inventory
+within minutes of each other.  :class:`ResponseCache` stores parsed
+JSON responses on disk, keyed by base URL, endpoint and query
+parameters, so that later calls within the time-to-live are served
+locally.  It is used by :class:`na_utils.dnac.DnacClient` for ``GET``
+requests only.
+
+Design notes:
+
+* TTLs are configured per endpoint prefix; endpoints without a
+  matching rule (and a positive ``default_ttl``) are never cached.
+* Every entry is written to a temporary file and moved into place with
+  :func:`os.replace`, so concurrent processes sharing the directory
+  never observe partially written entries.
+* The directory is bounded by ``max_bytes``.  Hits refresh an entry's
+  modification time and the least recently used entries are evicted
+  first.
+
+The cache directory defaults to ``DNAC_CACHE_DIR`` or
+``~/.cache/na_utils/dnac`` and is created with ``0700`` permissions.
+Set ``DNAC_CACHE=off`` to disable caching or ``DNAC_CACHE=refresh`` to
+ignore existing entries while still storing fresh ones.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Optional
+
+# Time-to-live in seconds per endpoint prefix.  The longest matching
+# prefix wins.
+DEFAULT_CACHE_TTLS: Dict[str, float] = {
+    "/dna/intent/api/v1/network-device": 300.0,
+    "/api/v1/network-device": 300.0,
+    "/dna/intent/api/v1/site": 3600.0,
+    "/api/v1/topology/site-topology": 3600.0,
+}
+DEFAULT_CACHE_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_CACHE_DIR = os.path.join("~", ".cache", "na_utils", "dnac")
+
+
+class ResponseCache:
+    """Size bounded, per-endpoint TTL cache of JSON responses.
+
+    ``stats`` counts ``hits``, ``misses``, ``stores`` and ``evictions``.
+
+    :param directory: Directory holding cache entries.
+    :param ttls: Mapping of endpoint prefix to TTL in seconds.
+    :param default_ttl: TTL for endpoints without a matching prefix.
+        ``0`` means such endpoints are not cached.
+    :param max_bytes: Upper bound on the total size of all entries.
+    :param refresh: If true, reads always miss but responses are still
+        stored, refreshing the cache for later runs.
+    """
+
+    def __init__(
+        self,
+        directory: str | None = None,
+        *,
+        ttls: Optional[Dict[str, float]] = None,
+        default_ttl: float = 0.0,
+        max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+        refresh: bool = False,
+    ) -> None:
+        self.directory = os.path.expanduser(directory or os.getenv("DNAC_CACHE_DIR") or DEFAULT_CACHE_DIR)
+        self.ttls = dict(DEFAULT_CACHE_TTLS if ttls is None else ttls)
+        self.default_ttl = default_ttl
+        self.max_bytes = max_bytes
+        self.refresh = refresh
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> Optional["ResponseCache"]:
+        """Build a cache from ``DNAC_CACHE``/``DNAC_CACHE_DIR``.
+
+        :returns: ``None`` if ``DNAC_CACHE`` is ``off``, otherwise a
+            cache, in refresh mode if ``DNAC_CACHE`` is ``refresh``.
+        """
+        mode = (os.getenv("DNAC_CACHE") or "on").strip().lower()
+        if mode in {"off", "0", "false", "no"}:
+            return None
+        return cls(refresh=mode == "refresh")
+
+    def ttl_for(self, endpoint: str) -> float:
+        """Return the TTL that applies to ``endpoint``."""
+        path = endpoint.split("?", 1)[0]
+        best = ""
+        for prefix in self.ttls:
+            if path.startswith(prefix) and len(prefix) > len(best):
+                best = prefix
+        return self.ttls[best] if best else self.default_ttl
+
+    @staticmethod
+    def key(base_url: str, endpoint: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Return the cache key for a request."""
+        material = json.dumps([base_url, endpoint, sorted((params or {}).items())], default=str)
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ".json")
+
+    def get(self, base_url: str, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Optional[Any]:
+        """Return the cached response or ``None`` on a miss."""
+        ttl = self.ttl_for(endpoint)
+        if ttl <= 0:
+            return None
+        if self.refresh:
+            self.stats["misses"] += 1
+            return None
+        path = self._path(self.key(base_url, endpoint, params))
+        try:
+            with open(path, "r", encoding="utf-8") as fh:
+                entry = json.load(fh)
+        except (OSError, ValueError):
+            self.stats["misses"] += 1
+            return None
+        if time.time() - float(entry.get("stored_at", 0)) > ttl:
+            self.stats["misses"] += 1
+            return None
+        try:
+            # Mark as recently used for LRU eviction.
+            os.utime(path)
+        except OSError:
+            pass
+        self.stats["hits"] += 1
+        return entry.get("data")
+
+    def put(self, base_url: str, endpoint: str, params: Optional[Dict[str, Any]], data: Any) -> None:
+        """Store ``data`` if ``endpoint`` is cacheable."""
+        if self.ttl_for(endpoint) <= 0:
+            return
+        payload = json.dumps({"stored_at": time.time(), "endpoint": endpoint, "data": data})
+        try:
+            os.makedirs(self.directory, mode=0o700, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".tmp.")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                    fh.write(payload)
+                os.replace(tmp_path, self._path(self.key(base_url, endpoint, params)))
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as exc:
+            print(f"Unable to write response cache entry in {self.directory}: {exc}")
+            return
+        self.stats["stores"] += 1
+        self._evict()
+
+    def _evict(self) -> None:
+        """Remove least recently used entries until under ``max_bytes``."""
+        with self._lock:
+            entries = []
+            total = 0
+            try:
+                with os.scandir(self.directory) as it:
+                    for entry in it:
+                        if not entry.name.endswith(".json"):
+                            continue
+                        try:
+                            st = entry.stat()
+                        except OSError:
+                            continue
+                        entries.append((st.st_mtime, st.st_size, entry.path))
+                        total += st.st_size
+            except OSError:
+                return
+            if total <= self.max_bytes:
+                return
+            entries.sort()
+            for _, size, path in entries:
+                try:
+                    os.unlink(path)
+                except OSError:
+                    continue
+                self.stats["evictions"] += 1
+                total -= size
+                if total <= self.max_bytes:
+                    break
+
+    def clear(self) -> None:
+        """Remove every cache entry."""
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if entry.name.endswith(".json"):
+                        os.unlink(entry.path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,149 @@
+"""Plan configuration removals against a device's archived configuration.
+
+Rollout scripts such as ``dco_config_push.py`` carry one fixed list of
+``no`` commands for the whole fleet.  Sent blindly, every command for a
+feature a router never had costs a prompt round trip and logs a
+``% Invalid input`` error.  :func:`plan_removals` checks each removal
+against the device's last archived running configuration (see
+:class:`~na_utils.config_store.ConfigStore`) and keeps only the
+commands whose target is actually configured:
+
+* ``no X`` is kept if a top-level line equals ``X`` or starts with
+  ``X`` followed by more words, so ``no mgcp`` is kept while any
+  ``mgcp …`` line exists.  Commands are matched as written in the
+  running configuration.
+* The kept commands are put in dependency order: an object is removed
+  before the objects it references (:data:`REMOVAL_ORDER`), e.g.
+  ``flow monitor`` before ``flow exporter``.  Otherwise the order of
+  the removal list is preserved.
+
+A plan without commands means the device needs no change, so callers
+can skip it without opening an SSH session.
+
+Usage example:
+
+    >>> plan = plan_removals(CMD_LIST, store.get_config("rtr01"))
+    >>> if plan:
+    ...     send_config_commands(conn, plan.commands)
+"""
+
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from .ios_config import IOSConfig
+
+# (referrer, referenced) keyword pairs: a configuration line starting
+# with the first keyword may reference an object named by the second,
+# so it has to be removed first.
+REMOVAL_ORDER: Tuple[Tuple[str, str], ...] = (
+    ("flow monitor", "flow exporter"),
+    ("flow monitor", "flow record"),
+    ("policy-map", "class-map"),
+    ("route-map", "ip prefix-list"),
+    ("route-map", "ip access-list"),
+    ("route-map", "access-list"),
+    ("crypto map", "crypto ipsec transform-set"),
+    ("crypto map", "crypto isakmp profile"),
+    ("crypto isakmp profile", "crypto keyring"),
+    ("dial-peer", "voice class"),
+    ("dial-peer", "voice translation-profile"),
+    ("voice translation-profile", "voice translation-rule"),
+    ("voice register pool", "voice register global"),
+    ("call-manager-fallback", "voice register global"),
+)
+
+
+@dataclass
+class ChangePlan:
+    """Commands planned for one device.
+
+    :param commands: Removal commands to send, in dependency order.
+    :param absent: Requested removals whose target is not configured.
+    """
+
+    commands: List[str] = field(default_factory=list)
+    absent: List[str] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.commands)
+
+
+def _target(command: str) -> str:
+    """Return the configuration line a ``no`` command removes."""
+    words = command.split()
+    if not words or words[0] != "no" or len(words) < 2:
+        raise ValueError(f"Not a removal command: '{command}'")
+    return " ".join(words[1:])
+
+
+def _starts_with(text: str, prefix: str) -> bool:
+    return text == prefix or text.startswith(prefix + " ")
+
+
+def is_configured(target: str, config: IOSConfig) -> bool:
+    """Return ``True`` if a top-level line of ``config`` matches ``target``.
+
+    :param target: Configuration line without the ``no`` prefix.
+    :param config: Parsed configuration.
+    """
+    words = target.split()
+    candidates = config.blocks(" ".join(words[:2])) if len(words) > 1 else config.blocks(words[0])
+    return any(_starts_with(" ".join(line.text.split()), target) for line in candidates)
+
+
+def order_removals(commands: Iterable[str]) -> List[str]:
+    """Sort removal commands so referrers come before what they reference.
+
+    A stable topological sort over :data:`REMOVAL_ORDER`; commands
+    without a dependency keep their relative order.
+    """
+    commands = list(commands)
+    targets = [_target(command) for command in commands]
+    successors: Dict[int, List[int]] = {index: [] for index in range(len(commands))}
+    indegree = [0] * len(commands)
+    for first, second in REMOVAL_ORDER:
+        before = [i for i, target in enumerate(targets) if _starts_with(target, first)]
+        after = [i for i, target in enumerate(targets) if _starts_with(target, second)]
+        for i in before:
+            for j in after:
+                if i != j:
+                    successors[i].append(j)
+                    indegree[j] += 1
+    ready = [index for index, degree in enumerate(indegree) if degree == 0]
+    heapq.heapify(ready)
+    ordered: List[str] = []
+    while ready:
+        index = heapq.heappop(ready)
+        ordered.append(commands[index])
+        for successor in successors[index]:
+            indegree[successor] -= 1
+            if indegree[successor] == 0:
+                heapq.heappush(ready, successor)
+    if len(ordered) != len(commands):
+        raise ValueError("REMOVAL_ORDER contains a cycle")
+    return ordered
+
+
+def plan_removals(removals: Iterable[str], config: Optional[Union[str, IOSConfig]]) -> ChangePlan:
+    """Return the removals that apply to a configuration.
+
+    :param removals: ``no`` commands; blank lines and ``!`` are ignored.
+    :param config: The device's running configuration (text or parsed).
+        With ``None`` (nothing archived) every removal is planned.
+    :returns: A :class:`ChangePlan`.
+    :raises ValueError: If a command is not a ``no`` command.
+    """
+    commands = [command.strip() for command in removals if command.strip() and command.strip() != "!"]
+    targets = [_target(command) for command in commands]
+    if config is None:
+        return ChangePlan(order_removals(commands))
+    parse = config if isinstance(config, IOSConfig) else IOSConfig(config)
+    plan = ChangePlan()
+    present: List[str] = []
+    for command, target in zip(commands, targets):
+        (present if is_configured(target, parse) else plan.absent).append(command)
+    plan.commands = order_removals(present)
+    return plan
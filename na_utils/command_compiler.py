@@ -0,0 +1,181 @@
+"""Compile flat configuration command lists into fewer CLI lines.
+
+Scripts build their changes as flat command lists, one
+``interface X`` / subcommands / ``exit`` group per interface.  Pushed
+as is, a 48-port stack needs hundreds of lines, each waiting for its
+prompt.  :func:`compile_commands` rewrites such a list without changing
+its effect:
+
+* Consecutive interface blocks with identical subcommands are merged
+  into ``interface range`` statements, e.g.
+  ``interface range GigabitEthernet1/0/1 - 24 , GigabitEthernet2/0/1 - 24``.
+* ``exit`` lines between interface blocks are dropped; entering the
+  next interface leaves the previous one anyway.  One ``exit`` is kept
+  before any following global command.
+
+Only runs of adjacent interface blocks are merged, so commands are
+never moved across other configuration.  Interfaces that
+``interface range`` cannot address (subinterfaces, names without a
+trailing number) are left as individual blocks.
+
+Usage example:
+
+    >>> compile_commands([
+    ...     "interface Gi1/0/1", "no lldp transmit", "exit",
+    ...     "interface Gi1/0/2", "no lldp transmit", "exit",
+    ... ])
+    ['interface range Gi1/0/1 - 2', 'no lldp transmit']
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# IOS accepts at most this many comma separated ranges per command.
+MAX_RANGES = 5
+
+# Interface name split into the part before the last number and the number.
+_PORT_RE = re.compile(r"^(?P<prefix>\D.*?)(?P<port>\d+)$")
+# One ``start - end`` element of an ``interface range`` command.
+_RANGE_RE = re.compile(r"^(?P<prefix>\D.*?)(?P<first>\d+)\s*-\s*(?P<last>\d+)$")
+
+
+def _is_interface(command: str) -> bool:
+    words = command.split()
+    return len(words) >= 2 and words[0] == "interface" and words[1] != "range"
+
+
+def _split_port(name: str) -> Optional[Tuple[str, int]]:
+    match = _PORT_RE.match(name)
+    if not match or "." in name:
+        return None
+    return match.group("prefix"), int(match.group("port"))
+
+
+def interface_ranges(names: Iterable[str]) -> List[str]:
+    """Return ``interface`` commands covering ``names`` with as few lines as possible.
+
+    Consecutive ports sharing a prefix collapse into ``start - end``
+    ranges; up to :data:`MAX_RANGES` ranges share one ``interface
+    range`` command.  Names that cannot be used in a range get their
+    own ``interface`` command.
+
+    :param names: Interface names in the order they should be configured.
+    :returns: A list of ``interface`` / ``interface range`` commands.
+    """
+    commands: List[str] = []
+    ranges: List[str] = []
+    current: Optional[Tuple[str, int, int]] = None
+    for name in names:
+        split = _split_port(name)
+        if split is None:
+            commands.append(f"interface {name}")
+            continue
+        prefix, port = split
+        if current and current[0] == prefix and current[2] + 1 == port:
+            current = (prefix, current[1], port)
+            continue
+        if current:
+            ranges.append(_format_range(*current))
+        current = (prefix, port, port)
+    if current:
+        ranges.append(_format_range(*current))
+    if len(ranges) == 1 and " - " not in ranges[0]:
+        return commands + [f"interface {ranges[0]}"]
+    for start in range(0, len(ranges), MAX_RANGES):
+        commands.append("interface range " + " , ".join(ranges[start:start + MAX_RANGES]))
+    return commands
+
+
+def expand_interface_range(spec: str) -> List[str]:
+    """Return the interface names covered by an ``interface range`` argument.
+
+    The inverse of :func:`interface_ranges`:
+    ``"Gi1/0/1 - 3 , Gi2/0/1"`` gives ``Gi1/0/1``, ``Gi1/0/2``,
+    ``Gi1/0/3`` and ``Gi2/0/1``.
+
+    :param spec: The text after ``interface range``.
+    """
+    names: List[str] = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        match = _RANGE_RE.match(part)
+        if match:
+            prefix = match.group("prefix").rstrip()
+            names.extend(f"{prefix}{port}" for port in range(int(match.group("first")), int(match.group("last")) + 1))
+        else:
+            names.append(part)
+    return names
+
+
+def _format_range(prefix: str, first: int, last: int) -> str:
+    return f"{prefix}{first}" if first == last else f"{prefix}{first} - {last}"
+
+
+def _compile_run(blocks: List[Tuple[str, Tuple[str, ...]]]) -> List[str]:
+    """Merge a run of adjacent interface blocks with identical bodies."""
+    groups: Dict[Tuple[str, ...], List[str]] = {}
+    for name, body in blocks:
+        groups.setdefault(body, []).append(name)
+    compiled: List[str] = []
+    for body, names in groups.items():
+        for header in interface_ranges(names):
+            compiled.append(header)
+            compiled.extend(body)
+    return compiled
+
+
+def compile_commands(commands: Iterable[str]) -> List[str]:
+    """Collapse per-interface blocks of a flat command list.
+
+    An interface block is an ``interface`` line followed by its
+    subcommands, ending at ``exit``, the next ``interface`` line or the
+    end of the list.  Commands outside interface blocks are kept in
+    place, and a run of blocks is split where an interface repeats so
+    its blocks keep their order.
+
+    :param commands: Configuration commands as sent to the device.
+    :returns: An equivalent, usually much shorter, list of commands.
+    """
+    compiled: List[str] = []
+    run: List[Tuple[str, Tuple[str, ...]]] = []
+    in_run: Set[str] = set()
+    name: Optional[str] = None
+    body: List[str] = []
+
+    def close_block() -> None:
+        nonlocal name, body
+        if name is not None:
+            if name in in_run:
+                compiled.extend(_compile_run(run))
+                run.clear()
+                in_run.clear()
+            run.append((name, tuple(body)))
+            in_run.add(name)
+        name, body = None, []
+
+    for command in commands:
+        stripped = command.strip()
+        if not stripped:
+            continue
+        if _is_interface(stripped):
+            close_block()
+            name = stripped.split(None, 1)[1]
+        elif name is not None and stripped == "exit":
+            close_block()
+        elif name is not None:
+            body.append(stripped)
+        else:
+            # A global command: flush the run and return to global mode.
+            if run:
+                compiled.extend(_compile_run(run))
+                compiled.append("exit")
+                run.clear()
+                in_run.clear()
+            compiled.append(stripped)
+    close_block()
+    compiled.extend(_compile_run(run))
+    return compiled
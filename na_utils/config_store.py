@@ -0,0 +1,367 @@
+"""Content-addressed archive of device configurations with history.
+
+Nightly backups of thousands of devices are overwhelmingly identical
+from one night to the next.  :class:`ConfigStore` keeps every snapshot
+while storing each distinct configuration only once:
+
+* Configurations are normalised first (see :func:`normalize_config`),
+  removing lines that change without a configuration change, such as
+  ``! Last configuration change at …`` and ``ntp clock-period``.
+* The normalised text is hashed with SHA-256 and stored compressed
+  under ``objects/<aa>/<digest>.gz``.  Identical configurations share
+  one object.
+* ``index/<hostname>.jsonl`` records every snapshot as a
+  ``[timestamp, digest]`` line, in time order.  New snapshots are
+  appended; one older than the latest (e.g. an imported backup) is
+  inserted by rewriting the file.
+
+Because the last index line of a host is its latest snapshot,
+:meth:`ConfigStore.latest` reads only the tail of one file, and
+:meth:`ConfigStore.has_changed` compares a digest instead of diffing
+text.  :meth:`ConfigStore.as_of` resolves calendar dates through a
+per-day map and falls back to a binary search for exact times.
+
+Layout::
+
+    <root>/objects/3f/3fa2…e1.gz
+    <root>/index/RTR-HQ-01.jsonl
+
+Usage example:
+
+    >>> store = ConfigStore("/backups/archive")
+    >>> snap = store.put("RTR-HQ-01", running_config)
+    >>> snap.changed
+    False
+    >>> store.get_config("RTR-HQ-01", as_of="2026-01-31")
+"""
+
+from __future__ import annotations
+
+import bisect
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from .config_utils import write_bytes_atomic, write_text_atomic
+
+# Lines that change without the configuration itself changing.
+VOLATILE_PATTERNS = (
+    r"^Building configuration\.\.\.$",
+    r"^Current configuration\s*:\s*\d+ bytes$",
+    r"^! Last configuration change at .*$",
+    r"^! NVRAM config last updated at .*$",
+    r"^! No configuration change since last restart$",
+    r"^ntp clock-period \d+$",
+)
+_VOLATILE_RE = re.compile("|".join(f"(?:{pattern})" for pattern in VOLATILE_PATTERNS))
+
+# Snapshot timestamps are naive local ISO 8601 strings, which sort
+# chronologically as text.
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+When = Union[str, date, datetime]
+
+
+def normalize_config(text: str) -> str:
+    """Return ``text`` without volatile lines or trailing whitespace.
+
+    Line endings are converted to ``\\n``, trailing whitespace is
+    removed from every line, lines matching :data:`VOLATILE_PATTERNS`
+    are dropped and surrounding blank lines are trimmed.
+    """
+    lines = []
+    for line in text.replace("\r\n", "\n").replace("\r", "\n").split("\n"):
+        line = line.rstrip()
+        if _VOLATILE_RE.match(line):
+            continue
+        lines.append(line)
+    return "\n".join(lines).strip("\n") + "\n"
+
+
+def config_digest(text: str, *, normalized: bool = False) -> str:
+    """Return the SHA-256 hex digest of a configuration.
+
+    :param text: Configuration text.
+    :param normalized: Set if ``text`` is already normalised.
+    """
+    if not normalized:
+        text = normalize_config(text)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _timestamp(when: Optional[When]) -> str:
+    if when is None:
+        return datetime.now().strftime(TIMESTAMP_FORMAT)
+    if isinstance(when, datetime):
+        return when.strftime(TIMESTAMP_FORMAT)
+    if isinstance(when, date):
+        return when.isoformat() + "T23:59:59"
+    return when
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """One archived configuration of a device.
+
+    :param hostname: Device hostname.
+    :param timestamp: When the snapshot was taken (ISO 8601).
+    :param digest: SHA-256 of the normalised configuration.
+    :param changed: Whether the digest differs from the previous
+        snapshot.  Only meaningful on results of :meth:`ConfigStore.put`.
+    """
+
+    hostname: str
+    timestamp: str
+    digest: str
+    changed: bool = True
+
+
+class _HostIndex:
+    """In-memory copy of one host's index file."""
+
+    __slots__ = ("timestamps", "digests", "by_day")
+
+    def __init__(self) -> None:
+        self.timestamps: List[str] = []
+        self.digests: List[str] = []
+        # Calendar day -> position of the last snapshot taken that day.
+        self.by_day: Dict[str, int] = {}
+
+    def append(self, timestamp: str, digest: str) -> None:
+        if self.timestamps and timestamp < self.timestamps[-1]:
+            # Out of order (e.g. imported backups): keep the lists sorted.
+            pos = bisect.bisect_right(self.timestamps, timestamp)
+            self.timestamps.insert(pos, timestamp)
+            self.digests.insert(pos, digest)
+            self.by_day = {}
+            for i, ts in enumerate(self.timestamps):
+                self.by_day[ts[:10]] = i
+            return
+        self.timestamps.append(timestamp)
+        self.digests.append(digest)
+        self.by_day[timestamp[:10]] = len(self.timestamps) - 1
+
+
+class ConfigStore:
+    """Deduplicated, compressed configuration archive.
+
+    The store is safe to use from several threads of one process, e.g.
+    from the workers of :func:`na_utils.net_device.run_on_devices`.
+
+    :param root: Archive directory, created if missing.
+    :param compresslevel: gzip level for stored objects.
+    """
+
+    def __init__(self, root: str, *, compresslevel: int = 6) -> None:
+        self.root = os.path.expanduser(root)
+        self.compresslevel = compresslevel
+        self._objects = os.path.join(self.root, "objects")
+        self._index = os.path.join(self.root, "index")
+        os.makedirs(self._objects, mode=0o700, exist_ok=True)
+        os.makedirs(self._index, mode=0o700, exist_ok=True)
+        self._lock = threading.Lock()
+        self._heads: Dict[str, Optional[Tuple[str, str]]] = {}
+        self._hosts: Dict[str, _HostIndex] = {}
+
+    # Paths -----------------------------------------------------------------
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self._objects, digest[:2], digest + ".gz")
+
+    def _index_path(self, hostname: str) -> str:
+        safe = re.sub(r"[^A-Za-z0-9._-]", "_", hostname)
+        return os.path.join(self._index, safe + ".jsonl")
+
+    # Objects -----------------------------------------------------------------
+
+    def has_object(self, digest: str) -> bool:
+        """Return ``True`` if a configuration with ``digest`` is stored."""
+        return os.path.exists(self._object_path(digest))
+
+    def read(self, digest: str) -> str:
+        """Return the normalised configuration stored under ``digest``.
+
+        :raises KeyError: If no such object exists.
+        """
+        try:
+            with open(self._object_path(digest), "rb") as fh:
+                return gzip.decompress(fh.read()).decode("utf-8")
+        except FileNotFoundError:
+            raise KeyError(digest) from None
+
+    def _store_object(self, digest: str, text: str) -> None:
+        path = self._object_path(digest)
+        if os.path.exists(path):
+            return
+        os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+        # mtime=0 keeps identical content byte-identical on disk.
+        write_bytes_atomic(path, gzip.compress(text.encode("utf-8"), self.compresslevel, mtime=0))
+
+    # Index -------------------------------------------------------------------
+
+    def _read_head(self, hostname: str) -> Optional[Tuple[str, str]]:
+        """Read the last index entry of ``hostname`` from the end of its file."""
+        try:
+            with open(self._index_path(hostname), "rb") as fh:
+                fh.seek(0, os.SEEK_END)
+                size = fh.tell()
+                fh.seek(max(0, size - 4096))
+                lines = fh.read().splitlines()
+        except FileNotFoundError:
+            return None
+        for line in reversed(lines):
+            try:
+                timestamp, digest = json.loads(line)
+            except ValueError:
+                continue
+            return timestamp, digest
+        return None
+
+    def _head(self, hostname: str) -> Optional[Tuple[str, str]]:
+        if hostname not in self._heads:
+            self._heads[hostname] = self._read_head(hostname)
+        return self._heads[hostname]
+
+    def _host_index(self, hostname: str) -> _HostIndex:
+        index = self._hosts.get(hostname)
+        if index is None:
+            index = _HostIndex()
+            try:
+                with open(self._index_path(hostname), "r", encoding="utf-8") as fh:
+                    for line in fh:
+                        try:
+                            timestamp, digest = json.loads(line)
+                        except ValueError:
+                            continue
+                        index.append(timestamp, digest)
+            except FileNotFoundError:
+                pass
+            self._hosts[hostname] = index
+        return index
+
+    # Public API ----------------------------------------------------------------
+
+    def put(self, hostname: str, text: str, *, timestamp: Optional[When] = None) -> Snapshot:
+        """Archive a configuration snapshot of ``hostname``.
+
+        The configuration object is written only if no identical
+        configuration is stored yet; the snapshot is always indexed.
+
+        :param hostname: Device hostname.
+        :param text: Raw configuration text.
+        :param timestamp: Time of the snapshot; defaults to now.
+        :returns: The new :class:`Snapshot`; ``changed`` tells whether
+            it differs from the snapshot before it in time.
+        """
+        normalized = normalize_config(text)
+        digest = config_digest(normalized, normalized=True)
+        self._store_object(digest, normalized)
+        ts = _timestamp(timestamp)
+        with self._lock:
+            head = self._head(hostname)
+            if head is None or ts >= head[0]:
+                changed = head is None or head[1] != digest
+                with open(self._index_path(hostname), "a", encoding="utf-8") as fh:
+                    fh.write(json.dumps([ts, digest]) + "\n")
+                self._heads[hostname] = (ts, digest)
+                if hostname in self._hosts:
+                    self._hosts[hostname].append(ts, digest)
+            else:
+                # Older than the head: insert it and rewrite the file so
+                # its last line is still the latest snapshot.
+                index = self._host_index(hostname)
+                pos = bisect.bisect_right(index.timestamps, ts)
+                changed = pos == 0 or index.digests[pos - 1] != digest
+                index.append(ts, digest)
+                write_text_atomic(
+                    self._index_path(hostname),
+                    "".join(json.dumps([t, d]) + "\n" for t, d in zip(index.timestamps, index.digests)),
+                )
+        return Snapshot(hostname, ts, digest, changed)
+
+    def has_changed(self, hostname: str, text: str) -> bool:
+        """Return ``True`` if ``text`` differs from the latest snapshot.
+
+        Only digests are compared; nothing is read from the archive.
+        """
+        with self._lock:
+            head = self._head(hostname)
+        return head is None or head[1] != config_digest(text)
+
+    def latest(self, hostname: str) -> Optional[Snapshot]:
+        """Return the most recent snapshot of ``hostname``, if any."""
+        with self._lock:
+            head = self._head(hostname)
+        return None if head is None else Snapshot(hostname, head[0], head[1])
+
+    def as_of(self, hostname: str, when: When) -> Optional[Snapshot]:
+        """Return the snapshot of ``hostname`` in effect at ``when``.
+
+        ``when`` may be a :class:`~datetime.datetime`, a
+        :class:`~datetime.date` (meaning the end of that day) or an ISO
+        8601 string.  Whole days are resolved through the per-day map.
+
+        :returns: The last snapshot taken at or before ``when``.
+        """
+        if isinstance(when, str) and len(when) == 10:
+            when = date.fromisoformat(when)
+        with self._lock:
+            index = self._host_index(hostname)
+            if isinstance(when, date) and not isinstance(when, datetime):
+                pos = index.by_day.get(when.isoformat())
+                if pos is not None:
+                    return Snapshot(hostname, index.timestamps[pos], index.digests[pos])
+            pos = bisect.bisect_right(index.timestamps, _timestamp(when)) - 1
+            if pos < 0:
+                return None
+            return Snapshot(hostname, index.timestamps[pos], index.digests[pos])
+
+    def history(self, hostname: str, *, changes_only: bool = False) -> List[Snapshot]:
+        """Return the snapshots of ``hostname`` oldest first.
+
+        :param changes_only: Only include snapshots whose digest differs
+            from the preceding one.
+        """
+        with self._lock:
+            index = self._host_index(hostname)
+            pairs = list(zip(index.timestamps, index.digests))
+        snapshots = []
+        previous = None
+        for timestamp, digest in pairs:
+            changed = digest != previous
+            if changed or not changes_only:
+                snapshots.append(Snapshot(hostname, timestamp, digest, changed))
+            previous = digest
+        return snapshots
+
+    def get_config(self, hostname: str, *, as_of: Optional[When] = None) -> Optional[str]:
+        """Return the normalised configuration of ``hostname``.
+
+        :param as_of: Optional point in time; defaults to the latest.
+        """
+        snapshot = self.latest(hostname) if as_of is None else self.as_of(hostname, as_of)
+        return None if snapshot is None else self.read(snapshot.digest)
+
+    def hostnames(self) -> Iterator[str]:
+        """Yield the hostnames that have at least one snapshot."""
+        for name in sorted(os.listdir(self._index)):
+            if name.endswith(".jsonl"):
+                yield name[: -len(".jsonl")]
+
+    def snapshot(self, when: Optional[When] = None) -> Dict[str, Snapshot]:
+        """Return the fleet-wide state at ``when`` (default: latest).
+
+        :returns: Mapping of hostname to the snapshot in effect.
+        """
+        result: Dict[str, Snapshot] = {}
+        for hostname in self.hostnames():
+            snap = self.latest(hostname) if when is None else self.as_of(hostname, when)
+            if snap is not None:
+                result[hostname] = snap
+        return result
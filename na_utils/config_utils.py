@@ -1,20 +1,31 @@
 """Utility functions for working with network configuration files.
 
 This module provides helpers to compute differences between two
-configuration files.  Two different approaches are offered:
+configuration files.  Three approaches are offered:
 
 ``compare_configs``
     Uses Python's built‑in :mod:`difflib` library to produce a unified
     diff of two plain text files.  This is sufficient for simple
-    comparisons where an ordered diff is acceptable.
+    comparisons where an ordered diff is acceptable.  ``fast=True``
+    uses the interned-line Myers diff from :mod:`na_utils.line_diff`
+    instead, which is much faster on large configurations.
 
-``compare_configs_structured``
-    Uses :class:`ciscoconfparse2.Diff` (if available) to produce a
-    structured diff that understands Cisco configuration syntax.  This
-    requires the third‑party ``ciscoconfparse2`` library to be
-    installed and is optional.
+``diff_config_text`` / ``compare_configs_structured``
+    A built-in structure aware diff.  Both configurations are parsed
+    with :class:`na_utils.ios_config.IOSConfig`, blocks are matched by
+    their header line (e.g. ``interface Gi1/0/1``) and children are
+    compared within each block.  The result lists the changes in their
+    parent context and renders remediation commands.  Matching uses
+    dictionaries, so the cost grows linearly with configuration size.
+    ``compare_configs_structured(..., engine="ciscoconfparse2")`` still
+    delegates to :class:`ciscoconfparse2.Diff` when that optional
+    library is installed.
 
-Every function accepts file paths and optionally an output file.  If
+``write_text_atomic`` / ``write_bytes_atomic``
+    Write a configuration file via a temporary file and rename so
+    readers never observe a partially written file.
+
+Every diff function accepts file paths and optionally an output file.  If
 an output path is provided the diff will be written there; otherwise
 the diff is returned as a string.  Error handling ensures that
 missing files or other exceptions do not crash the caller.
@@ -24,14 +35,50 @@ from __future__ import annotations
 
 import difflib
 import os
-from typing import Optional, List
+import tempfile
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Optional, List, Tuple
+
+from .ios_config import ConfigLine, IOSConfig
+from .line_diff import unified_diff
 
+# Commands that take a single value: a changed value overwrites the old
+# one, so remediation does not need to remove it first.  Multi-valued
+# commands such as ``ipv6 address`` are not listed, and ``secondary``
+# addresses never overwrite (see :func:`overwrite_prefix`).
+OVERWRITE_COMMANDS = (
+    "hostname",
+    "description",
+    "ip address",
+    "switchport access vlan",
+    "switchport voice vlan",
+    "switchport mode",
+    "switchport trunk native vlan",
+    "speed",
+    "duplex",
+    "mtu",
+    "bandwidth",
+    "ip domain name",
+    "ip domain-name",
+    "logging buffered",
+    "snmp-server location",
+    "snmp-server contact",
+    "exec-timeout",
+    "transport input",
+)
 
-def compare_configs(file1: str, file2: str, output_file: Optional[str] = None) -> Optional[str]:
+
+def compare_configs(
+    file1: str, file2: str, output_file: Optional[str] = None, *, fast: bool = False
+) -> Optional[str]:
     """Compare two configuration files using a unified diff.
 
     Reads both files line by line and generates a unified diff using
-    :func:`difflib.unified_diff`.  The filenames are included in the
+    :func:`difflib.unified_diff`.  With ``fast`` the diff is computed by
+    :func:`na_utils.line_diff.unified_diff`, which stays fast on long
+    configurations with many repeated lines; its output has the same
+    format, but on ambiguous edits it may choose different (minimal)
+    hunks than :mod:`difflib`.  The filenames are included in the
     diff header.  If ``output_file`` is specified the diff will be
     written to that file and the function returns ``None``.  If
     ``output_file`` is not provided the diff is returned as a single
@@ -40,6 +87,7 @@ def compare_configs(file1: str, file2: str, output_file: Optional[str] = None) -
     :param file1: Path to the first configuration file.
     :param file2: Path to the second configuration file.
     :param output_file: Optional path to write the diff to.
+    :param fast: Use :func:`na_utils.line_diff.unified_diff`.
     :returns: A unified diff as a single string or ``None`` if written
         to ``output_file``.
     """
@@ -47,7 +95,7 @@ def compare_configs(file1: str, file2: str, output_file: Optional[str] = None) -
         with open(file1, "r") as f1, open(file2, "r") as f2:
             config1 = f1.readlines()
             config2 = f2.readlines()
-        diff_iter = difflib.unified_diff(
+        diff_iter = (unified_diff if fast else difflib.unified_diff)(
             config1,
             config2,
             fromfile=file1,
@@ -67,22 +115,208 @@ def compare_configs(file1: str, file2: str, output_file: Optional[str] = None) -
         raise RuntimeError(f"Unexpected error while comparing configs: {exc}")
 
 
-def compare_configs_structured(file1: str, file2: str, output_file: Optional[str] = None) -> Optional[str]:
+@dataclass
+class ConfigChange:
+    """One added or removed line (with its children) in a structured diff.
+
+    :param action: ``add`` or ``remove``.
+    :param parents: Header lines of the enclosing blocks, outermost first.
+    :param lines: The changed line followed by its descendants, with
+        their original indentation.
+    :param replaced: For removals, ``True`` if an added line overwrites
+        the value (see :data:`OVERWRITE_COMMANDS`), so no ``no`` command
+        is needed.
+    """
+
+    action: str
+    parents: Tuple[str, ...]
+    lines: List[str]
+    replaced: bool = False
+
+    @property
+    def text(self) -> str:
+        """The changed line itself, without indentation."""
+        return self.lines[0].strip()
+
+
+@dataclass
+class StructuredDiff:
+    """Result of :func:`diff_config_text`."""
+
+    changes: List[ConfigChange] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.changes)
+
+    @property
+    def added(self) -> List[ConfigChange]:
+        """Changes that add configuration."""
+        return [change for change in self.changes if change.action == "add"]
+
+    @property
+    def removed(self) -> List[ConfigChange]:
+        """Changes that remove configuration."""
+        return [change for change in self.changes if change.action == "remove"]
+
+    def format(self) -> str:
+        """Render the diff with ``-``/``+`` markers under each parent block."""
+        out: List[str] = []
+        current: Optional[Tuple[str, ...]] = None
+        for change in self.changes:
+            if change.parents != current:
+                out.extend("  " + " " * depth + parent for depth, parent in enumerate(change.parents))
+                current = change.parents
+            marker = "+" if change.action == "add" else "-"
+            out.extend(f"{marker} {line}" for line in change.lines)
+        return "\n".join(out)
+
+    def remediation(self) -> List[str]:
+        """Return configuration commands that turn the old config into the new.
+
+        Removed lines are negated (``no …``, or the ``no`` is dropped
+        from lines that were themselves negations) inside their parent
+        blocks; removed blocks are negated by their header alone.
+        Added lines and blocks are emitted in their parent context.
+        Parent headers are repeated only when the context changes.
+        """
+        commands: List[str] = []
+        current: Optional[Tuple[str, ...]] = None
+        for change in self.changes:
+            if change.action == "remove" and change.replaced:
+                continue
+            if change.parents != current:
+                commands.extend(" " * depth + parent for depth, parent in enumerate(change.parents))
+                current = change.parents
+            depth = len(change.parents)
+            if change.action == "remove":
+                commands.append(" " * depth + negate_command(change.text))
+            else:
+                base = len(change.lines[0]) - len(change.lines[0].lstrip())
+                commands.extend(" " * depth + line[base:] for line in change.lines)
+        return commands
+
+
+def negate_command(line: str) -> str:
+    """Return the command that removes ``line``."""
+    line = line.strip()
+    return line[3:] if line.startswith("no ") else "no " + line
+
+
+def overwrite_prefix(text: str) -> Optional[str]:
+    """Return the :data:`OVERWRITE_COMMANDS` entry whose value ``text`` sets.
+
+    ``ip address … secondary`` adds an address next to the primary one,
+    so it returns ``None`` like any other multi-valued command.
+    """
+    if text.endswith(" secondary"):
+        return None
+    for prefix in OVERWRITE_COMMANDS:
+        if text == prefix or text.startswith(prefix + " "):
+            return prefix
+    return None
+
+
+def _block_lines(line: ConfigLine) -> List[str]:
+    return [line.text] + [child.text for child in line.all_children()]
+
+
+def _group(lines: Iterable[ConfigLine]) -> Dict[str, List[ConfigLine]]:
+    groups: Dict[str, List[ConfigLine]] = {}
+    for line in lines:
+        groups.setdefault(" ".join(line.text.split()), []).append(line)
+    return groups
+
+
+def _diff_level(
+    old: List[ConfigLine], new: List[ConfigLine], parents: Tuple[str, ...], changes: List[ConfigChange]
+) -> None:
+    """Append the changes between two sibling lists to ``changes``."""
+    old_groups, new_groups = _group(old), _group(new)
+    removed: List[ConfigLine] = []
+    added: List[ConfigLine] = []
+    matched: List[Tuple[ConfigLine, ConfigLine]] = []
+    for key, lines in old_groups.items():
+        others = new_groups.get(key, [])
+        matched.extend(zip(lines, others))
+        removed.extend(lines[len(others):])
+    for key, lines in new_groups.items():
+        added.extend(lines[len(old_groups.get(key, [])):])
+    removed.sort(key=lambda line: line.linenum)
+    added.sort(key=lambda line: line.linenum)
+
+    overwritten = {overwrite_prefix(line.text.strip()) for line in added} - {None}
+    for line in removed:
+        prefix = overwrite_prefix(line.text.strip())
+        changes.append(ConfigChange("remove", parents, _block_lines(line), prefix in overwritten))
+    for line in added:
+        changes.append(ConfigChange("add", parents, _block_lines(line)))
+    matched.sort(key=lambda pair: pair[1].linenum)
+    for before, after in matched:
+        if before.children or after.children:
+            _diff_level(before.children, after.children, parents + (after.text.strip(),), changes)
+
+
+def diff_config_text(old: str, new: str) -> StructuredDiff:
+    """Compute a structure aware diff of two configurations.
+
+    Both texts are normalised with
+    :func:`na_utils.config_store.normalize_config` first, so volatile
+    lines never appear as changes.  Blocks are matched by their header
+    line and children are compared within matching blocks, so moving a
+    block or reordering siblings is not reported as a change.
+
+    :param old: The current (running) configuration.
+    :param new: The intended configuration.
+    :returns: A :class:`StructuredDiff`.
+    """
+    from .config_store import normalize_config  # config_store imports this module
+
+    changes: List[ConfigChange] = []
+    _diff_level(IOSConfig(normalize_config(old)).top, IOSConfig(normalize_config(new)).top, (), changes)
+    return StructuredDiff(changes)
+
+
+def compare_configs_structured(
+    file1: str,
+    file2: str,
+    output_file: Optional[str] = None,
+    *,
+    engine: str = "builtin",
+    remediation: bool = False,
+) -> Optional[str]:
     """Compare two configuration files using a structure aware diff.
 
-    This function attempts to import :class:`ciscoconfparse2.Diff` to
-    generate a structured diff.  If the library is unavailable a
-    :class:`RuntimeError` is raised.  The returned value or behaviour
-    mirrors :func:`compare_configs`.
+    The built-in engine uses :func:`diff_config_text`.  With
+    ``engine="ciscoconfparse2"`` the comparison is delegated to
+    :class:`ciscoconfparse2.Diff`, which must be installed.  The
+    returned value or behaviour mirrors :func:`compare_configs`.
 
     :param file1: Path to the first configuration file.
     :param file2: Path to the second configuration file.
     :param output_file: Optional path to write the diff to.
+    :param engine: ``builtin`` (default) or ``ciscoconfparse2``.
+    :param remediation: With the built-in engine, return the commands
+        that turn ``file1`` into ``file2`` instead of the diff.
     :returns: The diff as a single string or ``None`` if written to
         ``output_file``.
-    :raises RuntimeError: If the ``ciscoconfparse2`` library is not
-        installed.
+    :raises RuntimeError: If ``engine`` is ``ciscoconfparse2`` and the
+        library is not installed.
+    :raises ValueError: If ``engine`` is unknown.
     """
+    if engine == "builtin":
+        try:
+            with open(file1, "r") as f1, open(file2, "r") as f2:
+                result = diff_config_text(f1.read(), f2.read())
+        except FileNotFoundError as exc:
+            raise FileNotFoundError(f"Error opening configuration file: {exc}")
+        diff_str = "\n".join(result.remediation()) if remediation else result.format()
+        if output_file:
+            with open(output_file, "w") as out:
+                out.write(diff_str + "\n")
+            return None
+        return diff_str
+    if engine != "ciscoconfparse2":
+        raise ValueError(f"Unknown diff engine '{engine}'; expected 'builtin' or 'ciscoconfparse2'")
     try:
         from ciscoconfparse2 import Diff  # type: ignore
     except ImportError as exc:
@@ -101,4 +335,46 @@ def compare_configs_structured(file1: str, file2: str, output_file: Optional[str
     except FileNotFoundError as exc:
         raise FileNotFoundError(f"Error opening configuration file: {exc}")
     except Exception as exc:  # pragma: no cover
-        raise RuntimeError(f"Unexpected error while performing structured diff: {exc}")
\ No newline at end of file
+        raise RuntimeError(f"Unexpected error while performing structured diff: {exc}")
+
+
+def write_text_atomic(path: str, text: str, *, encoding: str = "utf-8") -> None:
+    """Write ``text`` to ``path`` atomically.
+
+    See :func:`write_bytes_atomic`.
+
+    :param path: Destination file.
+    :param text: Content to write.
+    :param encoding: Text encoding.
+    :raises OSError: If the file cannot be written.
+    """
+    write_bytes_atomic(path, text.encode(encoding))
+
+
+def write_bytes_atomic(path: str, data: bytes) -> None:
+    """Write ``data`` to ``path`` atomically.
+
+    The content is written and flushed to a temporary file in the same
+    directory, which is then renamed over ``path`` with
+    :func:`os.replace`.  An interrupted write leaves either the previous
+    file or no file, never a truncated one.  The file is created with
+    ``0600`` permissions since device configurations contain secrets.
+
+    :param path: Destination file.
+    :param data: Content to write.
+    :raises OSError: If the file cannot be written.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp.", suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
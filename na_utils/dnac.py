@@ -27,24 +27,89 @@ Usage example:
 Functions return dictionaries parsed from JSON responses.  If an
 unexpected status code is returned, an exception is raised.
 
+Authentication tokens are cached by a process wide
+:class:`TokenManager` (see :func:`get_token_manager`) so that repeated
+calls to :func:`get_api_response` reuse a single token for its
+validity window instead of logging in for every request.  Setting
+``DNAC_TOKEN_CACHE`` to a file path additionally persists the token on
+disk (readable only by the current user) so that back to back script
+runs can share it.
+
+All HTTP traffic goes through :class:`DnacClient`, which keeps a pooled
+keep-alive :class:`requests.Session`.  The module level functions are
+thin wrappers over a shared default client (:func:`get_default_client`);
+set ``DNAC_CA_BUNDLE`` to a CA bundle path to enable TLS verification.
 """
 
 from __future__ import annotations
 
+import asyncio
+import email.utils
+import json
 import os
-from typing import Dict, Any
+import random
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import timezone
+from typing import Dict, Any, Callable, Iterator, Optional, Sequence
 
 import requests
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
 from dotenv import load_dotenv
 
+from .cache import ResponseCache
+from .jsonstream import iter_json_array, project_all
+from .models import NetworkDevice
+
+
 # Load environment variables from a .env file in the project root if present.
 load_dotenv()
 
+# Endpoint used for inventory pulls.  The intent API supports
+# ``offset``/``limit`` paging with at most 500 records per page.
+DEVICE_ENDPOINT = "/dna/intent/api/v1/network-device"
+DEVICE_COUNT_ENDPOINT = "/dna/intent/api/v1/network-device/count"
+DEVICE_PAGE_SIZE = 500
+
+# Device attributes the intent network-device API can filter on
+# server-side.  Each accepts a single value or a list of alternatives.
+SERVER_DEVICE_FILTERS = frozenset({
+    "family",
+    "hostname",
+    "managementIpAddress",
+    "platformId",
+    "reachabilityStatus",
+    "role",
+    "serialNumber",
+    "series",
+    "softwareType",
+    "softwareVersion",
+    "type",
+    "id",
+})
+
+# Canonical spelling of device families; the server matches exactly.
+_FAMILY_NAMES = {
+    name.lower(): name
+    for name in ("Routers", "Switches and Hubs", "Unified AP", "Wireless Controller", "Wireless Sensor")
+}
+
+# Audit logs are returned as a bare JSON list, 25 records at most per page.
+AUDIT_LOG_ENDPOINT = "/dna/data/api/v1/event/event-series/audit-logs"
+AUDIT_LOG_PAGE_SIZE = 25
+
+# Bytes read from the socket at a time when streaming a response.
+STREAM_CHUNK_SIZE = 64 * 1024
+
 # Disable warnings for self‑signed certificates.  In production
-# environments you should provide a proper CA bundle instead of
-# disabling verification entirely.  See the requests documentation
-# for details.
+# environments you should provide a proper CA bundle (``DNAC_CA_BUNDLE``)
+# instead of disabling verification entirely.  See the requests
+# documentation for details.
 requests.packages.urllib3.disable_warnings(
     requests.packages.urllib3.exceptions.InsecureRequestWarning
 )
@@ -80,7 +145,9 @@ def get_auth_token(base_url: str | None = None, user: str | None = None, passwor
     Catalyst Center uses a token based authentication mechanism.  The
     token is valid for a limited time and should be reused across
     multiple API calls until it expires.  This helper obtains a new
-    token by sending a POST request to ``/dna/system/api/v1/auth/token``.
+    token by sending a POST request to ``/dna/system/api/v1/auth/token``
+    over the default :class:`DnacClient` session.  Most callers should
+    use :func:`get_token_manager` instead, which caches the token.
 
     :param base_url: Optional base URL of the Catalyst Center API.  If
         omitted the value from the environment will be used.
@@ -92,17 +159,768 @@ def get_auth_token(base_url: str | None = None, user: str | None = None, passwor
     :raises RuntimeError: If credentials are not available.
     :raises requests.HTTPError: If the HTTP request fails.
     """
-    creds = _get_base_credentials()
-    url = (base_url or creds["base_url"]) + "/dna/system/api/v1/auth/token"
-    auth = HTTPBasicAuth(user or creds["user"], password or creds["password"])
-    response = requests.post(url, auth=auth, verify=False)
-    response.raise_for_status()
-    data: Dict[str, Any] = response.json()
-    # The API returns a JSON object with the field 'Token'.  Raise if not present.
-    token = data.get("Token")
-    if not token:
-        raise RuntimeError("Authentication token not found in response. Check credentials and base URL.")
-    return token
+    return get_default_client().fetch_token(base_url=base_url, user=user, password=password)
+
+
+class TokenManager:
+    """Cache a Catalyst Center token for its validity window.
+
+    Catalyst Center tokens are valid for 60 minutes.  The manager hands
+    out the cached token until it is within ``refresh_margin`` seconds
+    of expiry, at which point the next caller refreshes it while
+    holding a lock; concurrent callers wait for that single refresh
+    rather than each logging in.  If ``cache_file`` is given the token
+    is also written to disk with ``0600`` permissions and reused by
+    later processes for the same base URL and user.
+
+    The ``stats`` attribute counts token ``hits`` (cached token
+    returned), ``misses`` (no usable token, a login was required) and
+    ``refreshes`` (an existing token was replaced because it was about
+    to expire or was rejected by the server).
+
+    :param base_url: Optional base URL.  Defaults to ``DNAC_BURL``.
+    :param user: Optional username.  Defaults to ``DNAC_USER``.
+    :param password: Optional password.  Defaults to ``DNAC_PASS``.
+    :param ttl: Token lifetime in seconds assumed after a login.
+    :param refresh_margin: Refresh this many seconds before expiry.
+    :param cache_file: Optional path used to persist the token.
+    :param login: Callable ``(base_url, user, password) -> token`` used
+        to obtain a new token.  Defaults to :func:`get_auth_token`.
+    """
+
+    def __init__(
+        self,
+        base_url: str | None = None,
+        user: str | None = None,
+        password: str | None = None,
+        *,
+        ttl: float = 3600.0,
+        refresh_margin: float = 300.0,
+        cache_file: str | None = None,
+        login: Optional[Callable[[str, str, str], str]] = None,
+    ) -> None:
+        self._base_url = base_url
+        self._user = user
+        self._password = password
+        self.ttl = ttl
+        self.refresh_margin = refresh_margin
+        self.cache_file = cache_file
+        self._login = login
+        self._token: Optional[str] = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "refreshes": 0}
+
+    def _credentials(self) -> Dict[str, str]:
+        """Return the credentials this manager logs in with."""
+        creds = _get_base_credentials()
+        return {
+            "base_url": (self._base_url or creds["base_url"]).rstrip("/"),
+            "user": self._user or creds["user"],
+            "password": self._password or creds["password"],
+        }
+
+    def _is_fresh(self) -> bool:
+        return self._token is not None and time.time() < self._expires_at - self.refresh_margin
+
+    def _load_from_disk(self, creds: Dict[str, str]) -> bool:
+        """Populate the in-memory token from ``cache_file`` if usable."""
+        if not self.cache_file:
+            return False
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as fh:
+                data = json.load(fh)
+        except (OSError, ValueError):
+            return False
+        if data.get("base_url") != creds["base_url"] or data.get("user") != creds["user"]:
+            return False
+        self._token = data.get("token")
+        self._expires_at = float(data.get("expires_at", 0))
+        return self._is_fresh()
+
+    def _save_to_disk(self, creds: Dict[str, str]) -> None:
+        """Atomically write the current token to ``cache_file``."""
+        if not self.cache_file:
+            return
+        directory = os.path.dirname(os.path.abspath(self.cache_file))
+        payload = {
+            "base_url": creds["base_url"],
+            "user": creds["user"],
+            "token": self._token,
+            "expires_at": self._expires_at,
+        }
+        try:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".dnac_token.")
+            try:
+                os.chmod(tmp_path, 0o600)
+                with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                    json.dump(payload, fh)
+                os.replace(tmp_path, self.cache_file)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as exc:
+            # A read-only home directory should not break API access.
+            print(f"Unable to write token cache {self.cache_file}: {exc}")
+
+    def get_token(self, *, force_refresh: bool = False) -> str:
+        """Return a valid token, logging in only when necessary.
+
+        :param force_refresh: Discard the cached token and log in again,
+            e.g. after the server rejected it with ``401``.
+        :returns: A bearer token string.
+        """
+        if not force_refresh and self._is_fresh():
+            self.stats["hits"] += 1
+            return self._token  # type: ignore[return-value]
+        stale_token = self._token
+        with self._lock:
+            # Another thread may have refreshed while we waited.
+            if self._token != stale_token and self._is_fresh():
+                self.stats["hits"] += 1
+                return self._token  # type: ignore[return-value]
+            creds = self._credentials()
+            if not force_refresh and self._load_from_disk(creds):
+                self.stats["hits"] += 1
+                return self._token  # type: ignore[return-value]
+            had_token = self._token is not None
+            login = self._login or get_auth_token
+            token = login(creds["base_url"], creds["user"], creds["password"])
+            self._token = token
+            self._expires_at = time.time() + self.ttl
+            self.stats["refreshes" if had_token else "misses"] += 1
+            self._save_to_disk(creds)
+            return token
+
+    def invalidate(self) -> None:
+        """Forget the cached token so the next call logs in again."""
+        with self._lock:
+            self._token = None
+            self._expires_at = 0.0
+
+
+# Default request rates (requests per second) and burst sizes per API
+# family.  Override with ``DNAC_RATE_LIMITS``, e.g. ``intent=2,data=1``.
+DEFAULT_RATE_LIMITS: Dict[str, float] = {"intent": 5.0, "data": 5.0, "system": 2.0}
+DEFAULT_BURST = 10
+
+# Status codes that are retried with backoff.
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+def endpoint_family(endpoint: str) -> str:
+    """Classify an API path as ``intent``, ``data`` or ``system``.
+
+    Legacy ``/api/v1`` paths are throttled with the intent APIs.
+    """
+    if endpoint.startswith("/dna/data/"):
+        return "data"
+    if endpoint.startswith("/dna/system/"):
+        return "system"
+    return "intent"
+
+
+def parse_rate_limits(spec: str | None) -> Dict[str, float]:
+    """Parse a ``family=rate,...`` string into a rate mapping.
+
+    Families missing from ``spec`` keep their default rate.
+
+    :raises ValueError: If an entry is malformed.
+    """
+    rates = dict(DEFAULT_RATE_LIMITS)
+    for item in (spec or "").split(","):
+        if not item.strip():
+            continue
+        family, sep, value = item.partition("=")
+        if not sep:
+            raise ValueError(f"Invalid rate limit entry '{item}'; expected family=rate")
+        rates[family.strip()] = float(value)
+    return rates
+
+
+@dataclass
+class _Bucket:
+    rate: float
+    capacity: float
+    tokens: float
+    updated: float
+    blocked_until: float = 0.0
+
+
+class RateLimiter:
+    """Thread safe token bucket scheduler keyed by API family.
+
+    Each family (see :func:`endpoint_family`) has its own bucket that
+    refills at ``rates[family]`` requests per second up to ``burst``
+    requests.  :meth:`acquire` reserves a slot and sleeps until it is
+    due, so callers are served in arrival order; coroutines use
+    :meth:`acquire_async` and share the same buckets.  :meth:`pause` blocks
+    a whole family, which is how a ``Retry-After`` from one request
+    slows down every thread talking to that family.
+
+    ``stats`` maps each family to counters: ``requests``, ``queued``
+    (requests that had to wait), ``queued_seconds``, ``max_queued_seconds``
+    and ``retries``.
+
+    :param rates: Requests per second per family.
+    :param burst: Maximum number of requests issued back to back.
+    """
+
+    def __init__(self, rates: Optional[Dict[str, float]] = None, *, burst: int = DEFAULT_BURST) -> None:
+        self.rates = dict(DEFAULT_RATE_LIMITS if rates is None else rates)
+        self.burst = burst
+        self._buckets: Dict[str, _Bucket] = {}
+        self._lock = threading.Lock()
+        self.stats: Dict[str, Dict[str, float]] = {}
+
+    def _bucket(self, family: str, now: float) -> _Bucket:
+        bucket = self._buckets.get(family)
+        if bucket is None:
+            rate = self.rates.get(family, self.rates.get("intent", 5.0))
+            bucket = _Bucket(rate=rate, capacity=float(self.burst), tokens=float(self.burst), updated=now)
+            self._buckets[family] = bucket
+            self.stats[family] = {
+                "requests": 0, "queued": 0, "queued_seconds": 0.0, "max_queued_seconds": 0.0, "retries": 0,
+            }
+        return bucket
+
+    def reserve(self, family: str) -> float:
+        """Reserve a request slot in ``family`` without waiting for it.
+
+        :returns: The number of seconds until the slot is due.
+        """
+        with self._lock:
+            now = time.monotonic()
+            bucket = self._bucket(family, now)
+            bucket.tokens = min(bucket.capacity, bucket.tokens + (now - bucket.updated) * bucket.rate)
+            bucket.updated = now
+            bucket.tokens -= 1
+            wait = max(0.0, -bucket.tokens / bucket.rate, bucket.blocked_until - now)
+            stats = self.stats[family]
+            stats["requests"] += 1
+            if wait > 0:
+                stats["queued"] += 1
+                stats["queued_seconds"] += wait
+                stats["max_queued_seconds"] = max(stats["max_queued_seconds"], wait)
+        return wait
+
+    def acquire(self, family: str) -> float:
+        """Wait for a request slot in ``family``.
+
+        :returns: The number of seconds the caller was queued.
+        """
+        wait = self.reserve(family)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, family: str) -> float:
+        """Coroutine version of :meth:`acquire` that yields to the event loop."""
+        wait = self.reserve(family)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def pause(self, family: str, seconds: float) -> None:
+        """Hold back every request in ``family`` for ``seconds``."""
+        with self._lock:
+            now = time.monotonic()
+            bucket = self._bucket(family, now)
+            bucket.blocked_until = max(bucket.blocked_until, now + seconds)
+            self.stats[family]["retries"] += 1
+
+
+def retry_delay(response: Any, attempt: int, *, base: float = 1.0, cap: float = 60.0) -> float:
+    """Return how long to wait before retrying a throttled request.
+
+    A ``Retry-After`` header (seconds or an HTTP date, UTC unless it
+    names a zone) is honoured when present and valid.  Otherwise the
+    delay grows exponentially with ``attempt`` and is jittered by ±50%
+    so that parallel workers do not retry in lock step.
+    """
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after:
+        try:
+            return min(cap, max(0.0, float(retry_after)))
+        except ValueError:
+            try:
+                parsed = email.utils.parsedate_to_datetime(retry_after)
+            except (TypeError, ValueError):
+                # Neither seconds nor an HTTP date: fall back to backoff.
+                parsed = None
+            if parsed is not None:
+                if parsed.tzinfo is None:
+                    parsed = parsed.replace(tzinfo=timezone.utc)
+                return min(cap, max(0.0, parsed.timestamp() - time.time()))
+    return min(cap, base * (2 ** attempt)) * random.uniform(0.5, 1.5)
+
+
+class DnacClient:
+    """Pooled, keep-alive HTTP client for the Catalyst Center API.
+
+    Every request made through a client reuses a single
+    :class:`requests.Session`, so the TCP and TLS handshakes are paid
+    once per pooled connection rather than once per call.  The client
+    also owns a :class:`TokenManager` so tokens are cached per client.
+    The module level helpers (:func:`get_api_response`,
+    :func:`get_device_list` and friends) delegate to a shared default
+    client returned by :func:`get_default_client`.
+
+    :param base_url: Optional base URL.  Defaults to ``DNAC_BURL``.
+    :param user: Optional username.  Defaults to ``DNAC_USER``.
+    :param password: Optional password.  Defaults to ``DNAC_PASS``.
+    :param verify: TLS verification setting passed to requests; either
+        a boolean or a path to a CA bundle.  Defaults to the
+        ``DNAC_CA_BUNDLE`` environment variable if set, otherwise
+        verification is disabled as in earlier versions of this module.
+    :param pool_size: Maximum number of pooled connections kept alive
+        to the controller.  Size it to the number of worker threads.
+    :param timeout: Timeout in seconds applied to every request.
+    :param token_manager: Optional token manager to share between
+        clients.  A new one is created if omitted.
+    :param rate_limiter: Optional :class:`RateLimiter` that schedules
+        requests.  By default one is built from ``DNAC_RATE_LIMITS``.
+    :param max_retries: How many times a ``429`` or ``5xx`` response is
+        retried with backoff before the error is raised.
+    :param cache: Optional :class:`~na_utils.cache.ResponseCache` that
+        serves repeated ``GET`` requests from disk.
+    """
+
+    def __init__(
+        self,
+        base_url: str | None = None,
+        user: str | None = None,
+        password: str | None = None,
+        *,
+        verify: bool | str | None = None,
+        pool_size: int = 10,
+        timeout: float | None = 60.0,
+        token_manager: Optional[TokenManager] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        max_retries: int = 5,
+        cache: Optional[ResponseCache] = None,
+    ) -> None:
+        self._base_url = base_url
+        self._user = user
+        self._password = password
+        if verify is None:
+            verify = os.getenv("DNAC_CA_BUNDLE") or False
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter or RateLimiter(parse_rate_limits(os.getenv("DNAC_RATE_LIMITS")))
+        self.max_retries = max_retries
+        self.cache = cache
+        self.session = requests.Session()
+        self.session.verify = verify
+        self.session.headers.update({
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+            "Connection": "keep-alive",
+        })
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.token_manager = token_manager or TokenManager(
+            base_url, user, password, login=self.fetch_token
+        )
+
+    @property
+    def base_url(self) -> str:
+        """The Catalyst Center base URL without a trailing slash."""
+        return (self._base_url or _get_base_credentials()["base_url"]).rstrip("/")
+
+    def fetch_token(self, base_url: str | None = None, user: str | None = None, password: str | None = None) -> str:
+        """Log in and return a new token, bypassing the token cache.
+
+        :param base_url: Optional base URL.  Defaults to the client's.
+        :param user: Optional username.  Defaults to the client's.
+        :param password: Optional password.  Defaults to the client's.
+        :returns: A bearer token string.
+        :raises RuntimeError: If no token is present in the response.
+        :raises requests.HTTPError: If the HTTP request fails.
+        """
+        creds = _get_base_credentials()
+        url = (base_url or self._base_url or creds["base_url"]).rstrip("/") + "/dna/system/api/v1/auth/token"
+        auth = HTTPBasicAuth(user or self._user or creds["user"], password or self._password or creds["password"])
+        response = self._send("POST", url, "system", auth=auth, timeout=self.timeout)
+        response.raise_for_status()
+        data: Dict[str, Any] = response.json()
+        # The API returns a JSON object with the field 'Token'.  Raise if not present.
+        token = data.get("Token")
+        if not token:
+            raise RuntimeError("Authentication token not found in response. Check credentials and base URL.")
+        return token
+
+    def _send(self, method: str, url: str, family: str, **kwargs: Any) -> requests.Response:
+        """Send one request through the rate limiter, retrying throttling.
+
+        ``429`` and ``5xx`` responses are retried up to ``max_retries``
+        times.  The retry delay is applied to the whole API family so
+        that other threads back off as well.  The last response is
+        returned whatever its status.
+        """
+        attempt = 0
+        while True:
+            self.rate_limiter.acquire(family)
+            response = self.session.request(method, url, **kwargs)
+            if response.status_code not in RETRY_STATUS_CODES or attempt >= self.max_retries:
+                return response
+            delay = retry_delay(response, attempt)
+            response.close()
+            print(f"Catalyst Center returned {response.status_code} for {url}; retrying in {delay:.1f}s")
+            self.rate_limiter.pause(family, delay)
+            attempt += 1
+
+    def request(
+        self,
+        method: str,
+        endpoint: str,
+        *,
+        base_url: str | None = None,
+        token: str | None = None,
+        **kwargs: Any,
+    ) -> requests.Response:
+        """Send an authenticated request and return the response.
+
+        If ``token`` is omitted the cached token is used and a ``401``
+        response triggers exactly one retry with a fresh token.  Requests
+        are paced by :attr:`rate_limiter`, and ``429``/``5xx`` responses
+        are retried with ``Retry-After`` aware, jittered exponential
+        backoff.
+
+        :param method: HTTP method, e.g. ``GET``.
+        :param endpoint: Path after the base URL.
+        :param base_url: Optional base URL override.
+        :param token: Optional pre‑obtained token.
+        :param kwargs: Extra arguments for :meth:`requests.Session.request`.
+        :returns: The :class:`requests.Response` object.
+        :raises requests.HTTPError: If the final response is an error.
+        """
+        full_url = (base_url or self.base_url) + endpoint
+        managed = not token
+        if managed:
+            token = self.token_manager.get_token()
+        kwargs.setdefault("timeout", self.timeout)
+        headers = dict(kwargs.pop("headers", None) or {})
+        headers["x-auth-token"] = token
+        family = endpoint_family(endpoint)
+        response = self._send(method, full_url, family, headers=headers, **kwargs)
+        if response.status_code == 401 and managed:
+            response.close()
+            headers["x-auth-token"] = self.token_manager.get_token(force_refresh=True)
+            response = self._send(method, full_url, family, headers=headers, **kwargs)
+        response.raise_for_status()
+        return response
+
+    def get(
+        self,
+        endpoint: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        base_url: str | None = None,
+        token: str | None = None,
+    ) -> Dict[str, Any]:
+        """GET ``endpoint`` and return the parsed JSON body.
+
+        Responses for endpoints with a TTL in :attr:`cache` are served
+        from and stored to disk.
+        """
+        if self.cache is None:
+            return self.request("GET", endpoint, params=params, base_url=base_url, token=token).json()
+        root = base_url or self.base_url
+        data = self.cache.get(root, endpoint, params)
+        if data is None:
+            data = self.request("GET", endpoint, params=params, base_url=base_url, token=token).json()
+            self.cache.put(root, endpoint, params, data)
+        return data
+
+    def iter_paginated(
+        self,
+        endpoint: str,
+        *,
+        page_size: int = 500,
+        params: Optional[Dict[str, Any]] = None,
+        offset_start: int = 1,
+        stream: bool = False,
+        fields: Optional[Sequence[str]] = None,
+        base_url: str | None = None,
+        token: str | None = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield records from an ``offset``/``limit`` paginated endpoint.
+
+        Pages are requested lazily, so records become available as soon
+        as the first page arrives and the caller never has to hold the
+        whole result set in memory.  Iteration stops at the first short
+        or empty page.  Both ``{"response": [...]}`` envelopes and bare
+        JSON lists (as returned by the audit log API) are understood.
+
+        With ``stream`` each page is decoded incrementally from the
+        socket by :mod:`na_utils.jsonstream`, so even a single large page
+        is never held in memory as a whole.  Streamed pages bypass the
+        response cache.  ``fields`` limits each record to the given keys.
+
+        :param endpoint: Path after the base URL.  It may already carry
+            a query string; paging parameters are appended to it.
+        :param page_size: Records requested per page.  Keep it at or
+            below the endpoint's documented maximum.
+        :param params: Extra query parameters sent with every page.
+        :param offset_start: Offset of the first record.  Catalyst
+            Center endpoints count from ``1``.
+        :param stream: Decode each page incrementally.
+        :param fields: Optional keys to keep from each record.
+        :param base_url: Optional base URL override.
+        :param token: Optional pre‑obtained token.
+        :returns: An iterator over the individual records.
+        """
+        offset = offset_start
+        while True:
+            page_params = dict(params or {})
+            page_params.update({"offset": offset, "limit": page_size})
+            count = 0
+            if stream:
+                response = self.request(
+                    "GET", endpoint, params=page_params, base_url=base_url, token=token, stream=True
+                )
+                try:
+                    for record in iter_json_array(response.iter_content(STREAM_CHUNK_SIZE), fields=fields):
+                        count += 1
+                        yield record
+                finally:
+                    response.close()
+            else:
+                data = self.get(endpoint, params=page_params, base_url=base_url, token=token)
+                records = data.get("response", []) if isinstance(data, dict) else data
+                count = len(records)
+                yield from project_all(records, fields)
+            if count < page_size:
+                return
+            offset += count
+
+    def iter_pages_concurrently(
+        self,
+        endpoint: str,
+        total: int,
+        *,
+        page_size: int = 500,
+        max_in_flight: int = 4,
+        params: Optional[Dict[str, Any]] = None,
+        offset_start: int = 1,
+        base_url: str | None = None,
+        token: str | None = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield ``total`` records, fetching several pages in parallel.
+
+        Page requests are issued from a thread pool with at most
+        ``max_in_flight`` outstanding at any time.  Records are yielded
+        strictly in page order, so the result is identical to
+        :meth:`iter_paginated`; a page that finishes early simply waits
+        until the pages before it have been consumed.
+
+        :param endpoint: Path after the base URL.
+        :param total: Number of records to fetch, typically obtained
+            from the endpoint's ``/count`` sibling.
+        :param page_size: Records requested per page.
+        :param max_in_flight: Maximum number of concurrent page requests.
+            Keep it at or below the client's ``pool_size``.
+        :param params: Extra query parameters sent with every page.
+        :param offset_start: Offset of the first record.
+        :param base_url: Optional base URL override.
+        :param token: Optional pre‑obtained token.
+        :returns: An iterator over the individual records.
+        """
+        if total <= 0:
+            return
+        if not token:
+            # Log in once up front instead of racing from the workers.
+            self.token_manager.get_token()
+        offsets = iter(range(offset_start, offset_start + total, page_size))
+
+        def fetch(offset: int) -> list:
+            page_params = dict(params or {})
+            page_params.update({"offset": offset, "limit": page_size})
+            data = self.get(endpoint, params=page_params, base_url=base_url, token=token)
+            return data.get("response", []) if isinstance(data, dict) else data
+
+        pending: deque[Future] = deque()
+        with ThreadPoolExecutor(max_workers=max(1, max_in_flight)) as pool:
+            try:
+                for offset in offsets:
+                    pending.append(pool.submit(fetch, offset))
+                    if len(pending) >= max_in_flight:
+                        break
+                while pending:
+                    records = pending.popleft().result()
+                    next_offset = next(offsets, None)
+                    if next_offset is not None:
+                        pending.append(pool.submit(fetch, next_offset))
+                    yield from records
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def count_devices(self, *, token: str | None = None, base_url: str | None = None) -> int:
+        """Return the number of devices known to Catalyst Center."""
+        data = self.get(DEVICE_COUNT_ENDPOINT, base_url=base_url, token=token)
+        return int(data.get("response", 0))
+
+    def iter_devices(
+        self,
+        family: str | None = None,
+        *,
+        filters: Optional[Dict[str, Any]] = None,
+        where: Optional[Callable[[Dict[str, Any]], bool]] = None,
+        page_size: int = DEVICE_PAGE_SIZE,
+        max_in_flight: int = 1,
+        as_models: bool = False,
+        keep_raw: bool = False,
+        token: str | None = None,
+        base_url: str | None = None,
+    ) -> Iterator[Any]:
+        """Yield device records page by page, optionally filtered.
+
+        ``family`` and ``filters`` are pushed down to the server as query
+        parameters where :func:`build_device_query` allows it, so only
+        matching devices are transferred.  Only the filters the server
+        cannot evaluate are checked locally (case-insensitively), and
+        ``where`` is applied last for predicates the API cannot express.
+
+        With ``max_in_flight`` greater than one the device count is read
+        first and pages are prefetched concurrently via
+        :meth:`iter_pages_concurrently`.  The count endpoint ignores
+        filters, so concurrent mode is only used for unfiltered pulls.
+        With ``as_models`` each record is converted to a compact
+        :class:`~na_utils.models.NetworkDevice` as soon as it is read;
+        ``keep_raw`` retains the full record in compressed form.
+        """
+        all_filters = dict(filters or {})
+        if family:
+            all_filters["family"] = family
+        params, local = build_device_query(all_filters)
+        if max_in_flight > 1 and not params:
+            total = self.count_devices(token=token, base_url=base_url)
+            records = self.iter_pages_concurrently(
+                DEVICE_ENDPOINT,
+                total,
+                page_size=page_size,
+                max_in_flight=max_in_flight,
+                base_url=base_url,
+                token=token,
+            )
+        else:
+            records = self.iter_paginated(
+                DEVICE_ENDPOINT, page_size=page_size, params=params, base_url=base_url, token=token
+            )
+        for dev in records:
+            if local and not _matches_filters(dev, local):
+                continue
+            if where is not None and not where(dev):
+                continue
+            yield NetworkDevice.from_dict(dev, keep_raw=keep_raw) if as_models else dev
+
+    def get_device_list(
+        self,
+        family: str | None = None,
+        *,
+        filters: Optional[Dict[str, Any]] = None,
+        where: Optional[Callable[[Dict[str, Any]], bool]] = None,
+        page_size: int = DEVICE_PAGE_SIZE,
+        max_in_flight: int = 1,
+        as_models: bool = False,
+        keep_raw: bool = False,
+        token: str | None = None,
+        base_url: str | None = None,
+    ) -> Dict[str, Any]:
+        """Return the device list; see :func:`get_device_list`."""
+        devices = list(self.iter_devices(
+            family,
+            filters=filters,
+            where=where,
+            page_size=page_size,
+            max_in_flight=max_in_flight,
+            as_models=as_models,
+            keep_raw=keep_raw,
+            token=token,
+            base_url=base_url,
+        ))
+        return {"response": devices}
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        self.session.close()
+
+    def __enter__(self) -> "DnacClient":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+_default_client: Optional[DnacClient] = None
+_default_client_lock = threading.Lock()
+
+
+def get_default_client() -> DnacClient:
+    """Return the shared :class:`DnacClient` used by module functions.
+
+    The client is created on first use with settings taken from the
+    environment.  If ``DNAC_TOKEN_CACHE`` is set, its value is used as
+    the on-disk token cache path.  Read-only responses are cached on
+    disk as described in :mod:`na_utils.cache` unless ``DNAC_CACHE`` is
+    ``off``.
+    """
+    global _default_client
+    if _default_client is None:
+        with _default_client_lock:
+            if _default_client is None:
+                cache_file = os.getenv("DNAC_TOKEN_CACHE")
+                manager = TokenManager(cache_file=os.path.expanduser(cache_file) if cache_file else None)
+                _default_client = DnacClient(token_manager=manager, cache=ResponseCache.from_env())
+    return _default_client
+
+
+def set_default_client(client: DnacClient) -> None:
+    """Replace the shared client, e.g. to use a custom CA bundle."""
+    global _default_client
+    with _default_client_lock:
+        _default_client = client
+
+
+def configure_cache(*, no_cache: bool = False, refresh: bool = False) -> None:
+    """Adjust response caching on the default client.
+
+    :param no_cache: Disable the response cache entirely.
+    :param refresh: Ignore cached entries but store fresh responses.
+    """
+    client = get_default_client()
+    if no_cache:
+        client.cache = None
+    elif refresh:
+        if client.cache is None:
+            client.cache = ResponseCache(refresh=True)
+        else:
+            client.cache.refresh = True
+
+
+def add_cache_arguments(parser: Any) -> None:
+    """Add ``--no-cache`` and ``--refresh`` options to an argument parser.
+
+    Call :func:`apply_cache_arguments` with the parsed namespace.
+    """
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--no-cache", action="store_true",
+                       help="Do not read or write the Catalyst Center response cache")
+    group.add_argument("--refresh", action="store_true",
+                       help="Ignore cached Catalyst Center responses and store fresh ones")
+
+
+def apply_cache_arguments(args: Any) -> None:
+    """Apply the options added by :func:`add_cache_arguments`."""
+    configure_cache(no_cache=getattr(args, "no_cache", False), refresh=getattr(args, "refresh", False))
+
+
+def get_token_manager() -> TokenManager:
+    """Return the :class:`TokenManager` of the default client."""
+    return get_default_client().token_manager
 
 
 def get_api_response(endpoint: str, base_url: str | None = None, token: str | None = None) -> Dict[str, Any]:
@@ -110,51 +928,185 @@ def get_api_response(endpoint: str, base_url: str | None = None, token: str | No
 
     This function constructs the full URL from the base URL and the
     provided endpoint, attaches the authentication token as a header
-    and returns the parsed JSON.  If a token is not provided, a new
-    one will be retrieved using :func:`get_auth_token`.
+    and returns the parsed JSON.  If a token is not provided, the
+    cached token from :func:`get_token_manager` is used.  Should the
+    server reject that token with ``401`` the request is retried once
+    with a freshly issued token.  The request is sent over the pooled
+    session of :func:`get_default_client`.
 
     :param endpoint: The path portion of the API after the base URL,
         e.g. ``/api/v1/network-device``.
     :param base_url: Optional base URL.  Defaults to the environment
         variable ``DNAC_BURL``.
-    :param token: Optional authentication token.  If omitted, one
-        will be fetched via :func:`get_auth_token`.
+    :param token: Optional authentication token.  If omitted, the
+        process wide cached token is used.
     :returns: Parsed JSON response as a dictionary.
     :raises requests.HTTPError: If the HTTP request fails.
     """
-    creds = _get_base_credentials()
-    full_url = (base_url or creds["base_url"]) + endpoint
-    if not token:
-        token = get_auth_token(base_url=creds["base_url"], user=creds["user"], password=creds["password"])
-    headers = {"x-auth-token": token, "Content-Type": "application/json"}
-    response = requests.get(full_url, headers=headers, verify=False)
-    response.raise_for_status()
-    return response.json()
+    return get_default_client().get(endpoint, base_url=base_url, token=token)
+
+
+def iter_paginated(
+    endpoint: str,
+    page_size: int = 500,
+    *,
+    params: Optional[Dict[str, Any]] = None,
+    offset_start: int = 1,
+    stream: bool = False,
+    fields: Optional[Sequence[str]] = None,
+    base_url: str | None = None,
+    token: str | None = None,
+) -> Iterator[Dict[str, Any]]:
+    """Yield every record of a paginated Catalyst Center endpoint.
+
+    Walks ``offset``/``limit`` pages using the default client; see
+    :meth:`DnacClient.iter_paginated` for details.
+
+    Usage example:
+
+        >>> for client in iter_paginated("/dna/data/api/v1/clients", page_size=100):
+        ...     print(client["macAddress"])
+
+    :param endpoint: The path portion of the API after the base URL.
+    :param page_size: Records requested per page.
+    :param params: Extra query parameters sent with every page.
+    :param offset_start: Offset of the first record (``1`` by default).
+    :param stream: Decode each page incrementally from the socket.
+    :param fields: Optional keys to keep from each record.
+    :param base_url: Optional base URL.
+    :param token: Optional pre‑obtained token.
+    :returns: An iterator over the individual records.
+    """
+    return get_default_client().iter_paginated(
+        endpoint,
+        page_size=page_size,
+        params=params,
+        offset_start=offset_start,
+        stream=stream,
+        fields=fields,
+        base_url=base_url,
+        token=token,
+    )
+
 
+def iter_audit_logs(**params: Any) -> Iterator[Dict[str, Any]]:
+    """Yield Catalyst Center audit log records page by page.
 
-def get_device_list(family: str | None = None, *, token: str | None = None, base_url: str | None = None) -> Dict[str, Any]:
+    :param params: Optional filters accepted by the audit log API,
+        e.g. ``startTime`` and ``endTime`` in epoch milliseconds.
+    :returns: An iterator over audit log records.
+    """
+    return iter_paginated(AUDIT_LOG_ENDPOINT, AUDIT_LOG_PAGE_SIZE, params=params)
+
+
+def build_device_query(
+    filters: Optional[Dict[str, Any]] = None,
+) -> tuple[Dict[str, Any], Dict[str, Any]]:
+    """Split device filters into server query parameters and local ones.
+
+    Equality filters on attributes listed in :data:`SERVER_DEVICE_FILTERS`
+    become query parameters.  Anything else must be evaluated locally.
+    Family names are normalised to the spelling Catalyst Center expects.
+
+    :param filters: Mapping of device attribute to a value or a list or
+        tuple of accepted values.
+    :returns: A ``(params, local_filters)`` tuple.
+    """
+    params: Dict[str, Any] = {}
+    local: Dict[str, Any] = {}
+    for key, value in (filters or {}).items():
+        if value is None:
+            continue
+        values = list(value) if isinstance(value, (list, tuple, set, frozenset)) else [value]
+        if key == "family":
+            values = [_FAMILY_NAMES.get(str(v).lower(), v) for v in values]
+        if key in SERVER_DEVICE_FILTERS and all(isinstance(v, (str, int)) for v in values):
+            params[key] = values[0] if len(values) == 1 else values
+        else:
+            local[key] = values
+    return params, local
+
+
+def _matches_filters(dev: Dict[str, Any], filters: Dict[str, Any]) -> bool:
+    """Case-insensitively check ``dev`` against ``filters``.
+
+    Values are read like :func:`build_device_query` does: a list, tuple
+    or set holds alternatives and ``None`` means no filter.
+    """
+    for key, value in filters.items():
+        if value is None:
+            continue
+        accepted = list(value) if isinstance(value, (list, tuple, set, frozenset)) else [value]
+        actual = str(dev.get(key, "")).lower()
+        if not any(actual == str(v).lower() for v in accepted):
+            return False
+    return True
+
+
+def get_device_list(
+    family: str | None = None,
+    *,
+    filters: Optional[Dict[str, Any]] = None,
+    where: Optional[Callable[[Dict[str, Any]], bool]] = None,
+    page_size: int = DEVICE_PAGE_SIZE,
+    max_in_flight: int = 1,
+    as_models: bool = False,
+    keep_raw: bool = False,
+    token: str | None = None,
+    base_url: str | None = None,
+) -> Dict[str, Any]:
     """Return the dictionary of network devices from Catalyst Center.
 
-    The ``/api/v1/network-device`` endpoint returns a list of devices
-    across all families.  If ``family`` is provided the list will be
-    filtered to only include devices where the ``family`` field
-    matches (case insensitive).  The returned dictionary is the
-    unmodified JSON from the API except for filtering.
+    Devices are read from the intent ``network-device`` endpoint one
+    page at a time (see :func:`iter_paginated`) so that large fleets
+    are not truncated by the controller.  If ``family`` is provided the
+    list will be filtered to only include devices where the ``family``
+    field matches (case insensitive).  The returned dictionary mirrors
+    the API envelope, i.e. the devices are found under ``response``.
+
+    Filtering happens on the server whenever possible: ``family`` and
+    equality ``filters`` on attributes such as ``hostname``,
+    ``reachabilityStatus``, ``managementIpAddress`` or ``platformId``
+    are sent as query parameters, so non-matching devices are never
+    transferred.  Filters the API cannot express, and the ``where``
+    predicate, are evaluated locally.
+
+        >>> get_device_list("Routers", filters={"reachabilityStatus": "Reachable"})
+
+    Setting ``max_in_flight`` above one switches to concurrent mode:
+    the total is read from ``/dna/intent/api/v1/network-device/count``
+    and up to ``max_in_flight`` pages are fetched in parallel, then
+    reassembled in order.
+
+    Pass ``as_models=True`` to receive :class:`~na_utils.models.NetworkDevice`
+    objects instead of raw dictionaries.  They hold only the commonly
+    used fields and need a fraction of the memory; ``keep_raw=True``
+    keeps the full record available through ``device.raw``.
 
     :param family: Optional device family to filter on, e.g. ``Routers``
         or ``Switches and Hubs``.  If omitted no filtering occurs.
+    :param filters: Optional mapping of device attribute to a value or
+        list of accepted values.
+    :param where: Optional predicate applied to each raw device record.
+    :param page_size: Devices requested per page (at most 500).
+    :param max_in_flight: Maximum number of page requests in flight.
+    :param as_models: Return :class:`~na_utils.models.NetworkDevice` objects.
+    :param keep_raw: With ``as_models``, retain the full compressed record.
     :param token: Optional pre‑obtained token.
     :param base_url: Optional base URL.
-    :returns: The JSON response from Catalyst Center, potentially with
-        the ``response`` list filtered.
+    :returns: A dictionary whose ``response`` key holds the devices.
     """
-    data = get_api_response("/api/v1/network-device", base_url=base_url, token=token)
-    if family:
-        devices = data.get("response", [])
-        family_lower = family.lower()
-        filtered = [d for d in devices if str(d.get("family", "")).lower() == family_lower]
-        data["response"] = filtered
-    return data
+    return get_default_client().get_device_list(
+        family,
+        filters=filters,
+        where=where,
+        page_size=page_size,
+        max_in_flight=max_in_flight,
+        as_models=as_models,
+        keep_raw=keep_raw,
+        token=token,
+        base_url=base_url,
+    )
 
 
 def to_ansible_inventory(device_json: Dict[str, Any], *, group_by_family: bool = True) -> Dict[str, Any]:
@@ -168,7 +1120,8 @@ def to_ansible_inventory(device_json: Dict[str, Any], *, group_by_family: bool =
     ``ansible_host`` and the credentials loaded from the environment.
 
     :param device_json: A dictionary returned from
-        :func:`get_device_list`.
+        :func:`get_device_list`; the devices may be raw dictionaries or
+        :class:`~na_utils.models.NetworkDevice` objects.
     :param group_by_family: If true, hosts are grouped by their
         ``family`` attribute.  If false, all hosts are placed under
         ``ungrouped``.
@@ -220,7 +1173,8 @@ def to_pyats_testbed(device_json: Dict[str, Any], *, testbed_name: str = "genera
     repository.  See `networkjourney blog`_ for guidance on securing
     testbed files.
 
-    :param device_json: Device list returned from Catalyst Center.
+    :param device_json: Device list returned from Catalyst Center, as
+        raw dictionaries or :class:`~na_utils.models.NetworkDevice` objects.
     :param testbed_name: Name assigned to the testbed.
     :returns: A dictionary representing the pyATS testbed.
 
@@ -236,8 +1190,8 @@ def to_pyats_testbed(device_json: Dict[str, Any], *, testbed_name: str = "genera
     for dev in device_json.get("response", []):
         hostname = dev.get("hostname") or dev.get("id")
         mgmt_ip = dev.get("managementIpAddress")
-        os_type = dev.get("softwareType", "iosxe").replace("-", "").lower()
-        dev_type = dev.get("family", "router").lower()
+        os_type = (dev.get("softwareType") or "iosxe").replace("-", "").lower()
+        dev_type = (dev.get("family") or "router").lower()
         testbed["devices"][hostname] = {
             "os": os_type,
             "type": dev_type,
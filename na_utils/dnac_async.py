@@ -0,0 +1,436 @@
+"""Asynchronous helpers for interacting with Cisco Catalyst Center.
+
+This module is the :mod:`asyncio` sibling of :mod:`na_utils.dnac`.
+It offers the same building blocks — token retrieval, generic GET
+requests, device listing and ``offset``/``limit`` pagination — as
+coroutines built on :mod:`aiohttp`.  All requests made through an
+:class:`AsyncDnacClient` share one connection pool, so a single
+process can keep hundreds of Catalyst Center queries in flight.
+
+Credentials and the base URL are read from the same environment
+variables as :mod:`na_utils.dnac` (``DNAC_BURL``, ``DNAC_USER``,
+``DNAC_PASS`` and optionally ``DNAC_CA_BUNDLE``).
+
+Usage example:
+
+    >>> import asyncio
+    >>> from na_utils.dnac_async import AsyncDnacClient
+    >>> async def main():
+    ...     async with AsyncDnacClient() as client:
+    ...         devices = await client.get_device_list(family="Routers")
+    ...         sites = await client.gather_endpoints(
+    ...             [f"/dna/intent/api/v1/site/{s}" for s in ("a", "b")], concurrency=20
+    ...         )
+    >>> asyncio.run(main())
+
+The module level coroutines (:func:`get_auth_token`,
+:func:`get_api_response`, :func:`get_device_list` and
+:func:`iter_paginated`) use a shared default client that is bound to
+the event loop it is first used on; call :func:`close_default_client`
+before that loop finishes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import ssl
+import time
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import aiohttp
+
+from .dnac import (
+    DEVICE_ENDPOINT,
+    DEVICE_PAGE_SIZE,
+    RETRY_STATUS_CODES,
+    STREAM_CHUNK_SIZE,
+    RateLimiter,
+    _get_base_credentials,
+    endpoint_family,
+    parse_rate_limits,
+    retry_delay,
+)
+from .jsonstream import JsonArrayDecoder, project
+
+# An endpoint for :meth:`AsyncDnacClient.gather_endpoints` is either a
+# path or a ``(path, params)`` pair.
+EndpointSpec = Union[str, Tuple[str, Optional[Dict[str, Any]]]]
+
+
+class AsyncDnacClient:
+    """Catalyst Center client whose requests are coroutines.
+
+    The underlying :class:`aiohttp.ClientSession` is created lazily on
+    first use and should be closed with :meth:`close` or by using the
+    client as an ``async with`` context manager.  Tokens are cached for
+    ``token_ttl`` seconds and refreshed ``refresh_margin`` seconds ahead
+    of expiry; concurrent coroutines share one refresh.  Token activity
+    is counted in ``stats`` using the same keys as
+    :class:`na_utils.dnac.TokenManager`.
+
+    Requests are paced by a :class:`~na_utils.dnac.RateLimiter` and
+    ``429``/``5xx`` responses are retried exactly as in
+    :class:`na_utils.dnac.DnacClient`.  Pass the synchronous client's
+    ``rate_limiter`` to share its per-family buckets and statistics.
+
+    :param base_url: Optional base URL.  Defaults to ``DNAC_BURL``.
+    :param user: Optional username.  Defaults to ``DNAC_USER``.
+    :param password: Optional password.  Defaults to ``DNAC_PASS``.
+    :param verify: ``False`` to skip TLS verification, ``True`` for the
+        system trust store or a path to a CA bundle.  Defaults to
+        ``DNAC_CA_BUNDLE`` if set, otherwise verification is disabled.
+    :param limit: Maximum number of simultaneous connections.
+    :param timeout: Total timeout in seconds for each request.
+    :param token_ttl: Token lifetime in seconds assumed after a login.
+    :param refresh_margin: Refresh this many seconds before expiry.
+    :param rate_limiter: Optional :class:`~na_utils.dnac.RateLimiter`
+        that schedules requests.  By default one is built from
+        ``DNAC_RATE_LIMITS``.
+    :param max_retries: How many times a ``429`` or ``5xx`` response is
+        retried with backoff before the error is raised.
+    """
+
+    def __init__(
+        self,
+        base_url: str | None = None,
+        user: str | None = None,
+        password: str | None = None,
+        *,
+        verify: bool | str | None = None,
+        limit: int = 100,
+        timeout: float = 60.0,
+        token_ttl: float = 3600.0,
+        refresh_margin: float = 300.0,
+        rate_limiter: Optional[RateLimiter] = None,
+        max_retries: int = 5,
+    ) -> None:
+        self._base_url = base_url
+        self._user = user
+        self._password = password
+        if verify is None:
+            verify = os.getenv("DNAC_CA_BUNDLE") or False
+        self._verify = verify
+        self.limit = limit
+        self.timeout = timeout
+        self.token_ttl = token_ttl
+        self.refresh_margin = refresh_margin
+        self.rate_limiter = rate_limiter or RateLimiter(parse_rate_limits(os.getenv("DNAC_RATE_LIMITS")))
+        self.max_retries = max_retries
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._token: Optional[str] = None
+        self._expires_at = 0.0
+        self._token_lock: Optional[asyncio.Lock] = None
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "refreshes": 0}
+
+    @property
+    def base_url(self) -> str:
+        """The Catalyst Center base URL without a trailing slash."""
+        return (self._base_url or _get_base_credentials()["base_url"]).rstrip("/")
+
+    def _ssl_context(self) -> Union[bool, ssl.SSLContext]:
+        if isinstance(self._verify, str):
+            return ssl.create_default_context(cafile=self._verify)
+        return True if self._verify else False
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.limit, ssl=self._ssl_context())
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={"Content-Type": "application/json", "Accept": "application/json"},
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """Close the connection pool."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def __aenter__(self) -> "AsyncDnacClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def fetch_token(self, base_url: str | None = None, user: str | None = None, password: str | None = None) -> str:
+        """Log in and return a new token, bypassing the token cache.
+
+        :raises RuntimeError: If no token is present in the response.
+        :raises aiohttp.ClientResponseError: If the HTTP request fails.
+        """
+        creds = _get_base_credentials()
+        url = (base_url or self._base_url or creds["base_url"]).rstrip("/") + "/dna/system/api/v1/auth/token"
+        auth = aiohttp.BasicAuth(user or self._user or creds["user"], password or self._password or creds["password"])
+        async with self._get_session().post(url, auth=auth) as response:
+            response.raise_for_status()
+            data: Dict[str, Any] = await response.json(content_type=None)
+        token = data.get("Token")
+        if not token:
+            raise RuntimeError("Authentication token not found in response. Check credentials and base URL.")
+        return token
+
+    def _is_fresh(self) -> bool:
+        return self._token is not None and time.time() < self._expires_at - self.refresh_margin
+
+    async def get_token(self, *, force_refresh: bool = False) -> str:
+        """Return a cached token, logging in only when necessary."""
+        if not force_refresh and self._is_fresh():
+            self.stats["hits"] += 1
+            return self._token  # type: ignore[return-value]
+        if self._token_lock is None:
+            self._token_lock = asyncio.Lock()
+        stale_token = self._token
+        async with self._token_lock:
+            if self._token != stale_token and self._is_fresh():
+                self.stats["hits"] += 1
+                return self._token  # type: ignore[return-value]
+            had_token = self._token is not None
+            self._token = await self.fetch_token()
+            self._expires_at = time.time() + self.token_ttl
+            self.stats["refreshes" if had_token else "misses"] += 1
+            return self._token
+
+    async def _send(self, url: str, family: str, **kwargs: Any) -> aiohttp.ClientResponse:
+        """GET ``url`` through the rate limiter, retrying throttling.
+
+        See :meth:`na_utils.dnac.DnacClient._send`.  The last response
+        is returned unread whatever its status; the caller releases it.
+        """
+        session = self._get_session()
+        attempt = 0
+        while True:
+            await self.rate_limiter.acquire_async(family)
+            response = await session.get(url, **kwargs)
+            if response.status not in RETRY_STATUS_CODES or attempt >= self.max_retries:
+                return response
+            delay = retry_delay(response, attempt)
+            response.release()
+            print(f"Catalyst Center returned {response.status} for {url}; retrying in {delay:.1f}s")
+            self.rate_limiter.pause(family, delay)
+            attempt += 1
+
+    async def get(
+        self,
+        endpoint: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        base_url: str | None = None,
+        token: str | None = None,
+    ) -> Any:
+        """GET ``endpoint`` and return the parsed JSON body.
+
+        If ``token`` is omitted the cached token is used and a ``401``
+        response triggers exactly one retry with a fresh token.
+        Requests are paced and throttling is retried as described on
+        :class:`AsyncDnacClient`.
+
+        :raises aiohttp.ClientResponseError: If the final response is
+            an error.
+        """
+        url = (base_url or self.base_url) + endpoint
+        managed = not token
+        if managed:
+            token = await self.get_token()
+        query = {k: str(v) for k, v in (params or {}).items()}
+        family = endpoint_family(endpoint)
+        for attempt in range(2):
+            response = await self._send(url, family, params=query, headers={"x-auth-token": token})
+            async with response:
+                if not (response.status == 401 and managed and attempt == 0):
+                    response.raise_for_status()
+                    return await response.json(content_type=None)
+            token = await self.get_token(force_refresh=True)
+
+    async def iter_stream(
+        self,
+        endpoint: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        fields: Optional[Sequence[str]] = None,
+        base_url: str | None = None,
+        token: str | None = None,
+    ) -> AsyncIterator[Any]:
+        """GET ``endpoint`` and yield its ``response`` records as they arrive.
+
+        The body is decoded incrementally with
+        :class:`~na_utils.jsonstream.JsonArrayDecoder`; ``fields`` limits
+        each record to the given keys.
+        """
+        url = (base_url or self.base_url) + endpoint
+        managed = not token
+        if managed:
+            token = await self.get_token()
+        query = {k: str(v) for k, v in (params or {}).items()}
+        family = endpoint_family(endpoint)
+        for attempt in range(2):
+            response = await self._send(url, family, params=query, headers={"x-auth-token": token})
+            async with response:
+                if not (response.status == 401 and managed and attempt == 0):
+                    response.raise_for_status()
+                    decoder = JsonArrayDecoder(fields=fields)
+                    async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                        for record in decoder.feed(chunk):
+                            yield record
+                    for record in decoder.close():
+                        yield record
+                    return
+            token = await self.get_token(force_refresh=True)
+
+    async def iter_paginated(
+        self,
+        endpoint: str,
+        *,
+        page_size: int = 500,
+        params: Optional[Dict[str, Any]] = None,
+        offset_start: int = 1,
+        stream: bool = False,
+        fields: Optional[Sequence[str]] = None,
+        base_url: str | None = None,
+        token: str | None = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Asynchronously yield records from a paginated endpoint.
+
+        Behaves like :meth:`na_utils.dnac.DnacClient.iter_paginated`,
+        including the ``stream`` and ``fields`` options.
+        """
+        offset = offset_start
+        while True:
+            page_params = dict(params or {})
+            page_params.update({"offset": offset, "limit": page_size})
+            count = 0
+            if stream:
+                async for record in self.iter_stream(
+                    endpoint, params=page_params, fields=fields, base_url=base_url, token=token
+                ):
+                    count += 1
+                    yield record
+            else:
+                data = await self.get(endpoint, params=page_params, base_url=base_url, token=token)
+                records = data.get("response", []) if isinstance(data, dict) else data
+                count = len(records)
+                for record in records:
+                    yield project(record, fields)
+            if count < page_size:
+                return
+            offset += count
+
+    async def get_device_list(
+        self,
+        family: str | None = None,
+        *,
+        page_size: int = DEVICE_PAGE_SIZE,
+        token: str | None = None,
+        base_url: str | None = None,
+    ) -> Dict[str, Any]:
+        """Return the device list; see :func:`na_utils.dnac.get_device_list`."""
+        family_lower = family.lower() if family else None
+        devices: List[Dict[str, Any]] = []
+        async for dev in self.iter_paginated(DEVICE_ENDPOINT, page_size=page_size, base_url=base_url, token=token):
+            if family_lower is None or str(dev.get("family", "")).lower() == family_lower:
+                devices.append(dev)
+        return {"response": devices}
+
+    async def gather_endpoints(
+        self,
+        endpoints: Iterable[EndpointSpec],
+        *,
+        concurrency: int = 50,
+        paginate: bool = False,
+        page_size: int = 500,
+        stream: bool = False,
+        fields: Optional[Sequence[str]] = None,
+        return_exceptions: bool = False,
+    ) -> List[Any]:
+        """Fetch many endpoints concurrently and return results in order.
+
+        A semaphore caps the number of endpoints being fetched at once
+        to ``concurrency``; the remainder wait their turn.  When
+        ``paginate`` is true each endpoint is walked to the end and its
+        result is the list of all records.
+
+        :param endpoints: Paths or ``(path, params)`` pairs.
+        :param concurrency: Maximum number of endpoints in flight.
+        :param paginate: Walk each endpoint with :meth:`iter_paginated`.
+        :param page_size: Page size used when ``paginate`` is true.
+        :param stream: Decode paginated responses incrementally.
+        :param fields: Optional keys to keep from each paginated record.
+        :param return_exceptions: Return exceptions in place of results
+            instead of raising the first one, as with
+            :func:`asyncio.gather`.
+        :returns: One result per endpoint, in input order.
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        # Log in once before fanning out so workers do not queue on the lock.
+        await self.get_token()
+
+        async def fetch(spec: EndpointSpec) -> Any:
+            endpoint, params = (spec, None) if isinstance(spec, str) else spec
+            async with semaphore:
+                if paginate:
+                    return [
+                        rec
+                        async for rec in self.iter_paginated(
+                            endpoint, page_size=page_size, params=params, stream=stream, fields=fields
+                        )
+                    ]
+                return await self.get(endpoint, params=params)
+
+        return await asyncio.gather(*(fetch(spec) for spec in endpoints), return_exceptions=return_exceptions)
+
+
+_default_client: Optional[AsyncDnacClient] = None
+
+
+def get_default_client() -> AsyncDnacClient:
+    """Return the shared :class:`AsyncDnacClient` used by module functions."""
+    global _default_client
+    if _default_client is None:
+        _default_client = AsyncDnacClient()
+    return _default_client
+
+
+async def close_default_client() -> None:
+    """Close and forget the shared client."""
+    global _default_client
+    if _default_client is not None:
+        await _default_client.close()
+        _default_client = None
+
+
+async def get_auth_token(base_url: str | None = None, user: str | None = None, password: str | None = None) -> str:
+    """Coroutine version of :func:`na_utils.dnac.get_auth_token`."""
+    return await get_default_client().fetch_token(base_url=base_url, user=user, password=password)
+
+
+async def get_api_response(endpoint: str, base_url: str | None = None, token: str | None = None) -> Any:
+    """Coroutine version of :func:`na_utils.dnac.get_api_response`."""
+    return await get_default_client().get(endpoint, base_url=base_url, token=token)
+
+
+async def get_device_list(family: str | None = None, *, token: str | None = None, base_url: str | None = None) -> Dict[str, Any]:
+    """Coroutine version of :func:`na_utils.dnac.get_device_list`."""
+    return await get_default_client().get_device_list(family, token=token, base_url=base_url)
+
+
+def iter_paginated(
+    endpoint: str,
+    page_size: int = 500,
+    *,
+    params: Optional[Dict[str, Any]] = None,
+    offset_start: int = 1,
+    stream: bool = False,
+    fields: Optional[Sequence[str]] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Async generator version of :func:`na_utils.dnac.iter_paginated`."""
+    return get_default_client().iter_paginated(
+        endpoint, page_size=page_size, params=params, offset_start=offset_start, stream=stream, fields=fields
+    )
+
+
+async def gather_endpoints(endpoints: Iterable[EndpointSpec], **kwargs: Any) -> List[Any]:
+    """Fetch many endpoints with the shared client; see
+    :meth:`AsyncDnacClient.gather_endpoints`."""
+    return await get_default_client().gather_endpoints(endpoints, **kwargs)
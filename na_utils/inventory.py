@@ -0,0 +1,248 @@
+"""Indexed in-memory view of the Catalyst Center device inventory.
+
+Scripts frequently filter the device list by family, reachability or a
+hostname substring.  Doing so with list comprehensions rescans the
+whole fleet for every question.  :class:`DeviceInventory` builds hash
+indexes once so that exact lookups are constant time, and a trigram
+index on hostnames so that substring and glob matches only inspect a
+small candidate set.
+
+Devices may be raw dictionaries from :func:`na_utils.dnac.get_device_list`
+or :class:`~na_utils.models.NetworkDevice` objects; only ``get`` is
+used to read fields.
+
+Usage example:
+
+    >>> from na_utils.dnac import get_device_list
+    >>> from na_utils.inventory import DeviceInventory
+    >>> inv = DeviceInventory(get_device_list()["response"])
+    >>> inv.by_serial("FOC254001MG")
+    >>> for dev in inv.search("ERT").filter(family="Routers"):
+    ...     print(dev["hostname"])
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+
+# Unique keys: field name -> index name.
+_UNIQUE_FIELDS = {
+    "hostname": "hostname",
+    "managementIpAddress": "ip",
+    "serialNumber": "serial",
+    "id": "id",
+}
+
+# Grouping keys: index name -> field names tried in order.
+_GROUP_FIELDS = {
+    "family": ("family",),
+    "reachability": ("reachabilityStatus",),
+    "site": ("siteId", "location", "locationName"),
+}
+
+
+def _norm(value: Any) -> Optional[str]:
+    """Normalise an index key; keys are case-insensitive."""
+    if value is None:
+        return None
+    text = str(value).strip().lower()
+    return text or None
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class DeviceView:
+    """Lazy, chainable selection of devices from a :class:`DeviceInventory`.
+
+    A view holds only positions into the inventory.  Devices are
+    materialised when the view is iterated, in inventory order.
+    :meth:`filter` and :meth:`exclude` narrow a view using the
+    inventory's indexes without touching the devices themselves.
+    """
+
+    __slots__ = ("_inventory", "_positions")
+
+    def __init__(self, inventory: "DeviceInventory", positions: Iterable[int]) -> None:
+        self._inventory = inventory
+        self._positions = positions if isinstance(positions, (set, frozenset)) else set(positions)
+
+    def __iter__(self) -> Iterator[Any]:
+        devices = self._inventory.devices
+        for pos in sorted(self._positions):
+            yield devices[pos]
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __bool__(self) -> bool:
+        return bool(self._positions)
+
+    def first(self) -> Optional[Any]:
+        """Return the first matching device or ``None``."""
+        return next(iter(self), None)
+
+    def filter(self, **criteria: Any) -> "DeviceView":
+        """Keep devices matching every ``index=value`` criterion.
+
+        Supported indexes are ``family``, ``reachability`` and ``site``
+        (case-insensitive).  A value may also be a collection of
+        alternatives.
+        """
+        positions = set(self._positions)
+        for index, value in criteria.items():
+            positions &= self._inventory._group_positions(index, value)
+        return DeviceView(self._inventory, positions)
+
+    def exclude(self, **criteria: Any) -> "DeviceView":
+        """Drop devices matching any ``index=value`` criterion."""
+        positions = set(self._positions)
+        for index, value in criteria.items():
+            positions -= self._inventory._group_positions(index, value)
+        return DeviceView(self._inventory, positions)
+
+    def to_list(self) -> List[Any]:
+        """Materialise the view as a list."""
+        return list(self)
+
+
+class DeviceInventory:
+    """Hash and trigram indexed collection of network devices.
+
+    :param devices: Iterable of device records.
+    """
+
+    def __init__(self, devices: Iterable[Any]) -> None:
+        self.devices: List[Any] = list(devices)
+        self._unique: Dict[str, Dict[str, int]] = {name: {} for name in _UNIQUE_FIELDS.values()}
+        self._groups: Dict[str, Dict[str, Set[int]]] = {name: {} for name in _GROUP_FIELDS}
+        self._hostnames: List[str] = []
+        self._trigram_index: Dict[str, Set[int]] = {}
+        for pos, dev in enumerate(self.devices):
+            self._index(pos, dev)
+
+    @classmethod
+    def from_device_json(cls, device_json: Dict[str, Any]) -> "DeviceInventory":
+        """Build an inventory from a :func:`~na_utils.dnac.get_device_list` result."""
+        return cls(device_json.get("response", []))
+
+    def _index(self, pos: int, dev: Any) -> None:
+        for field, index in _UNIQUE_FIELDS.items():
+            key = _norm(dev.get(field))
+            if key is not None:
+                self._unique[index].setdefault(key, pos)
+        for index, fields in _GROUP_FIELDS.items():
+            for field in fields:
+                key = _norm(dev.get(field))
+                if key is not None:
+                    self._groups[index].setdefault(key, set()).add(pos)
+                    break
+        hostname = _norm(dev.get("hostname")) or ""
+        self._hostnames.append(hostname)
+        for gram in _trigrams(hostname):
+            self._trigram_index.setdefault(gram, set()).add(pos)
+
+    def __len__(self) -> int:
+        return len(self.devices)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.devices)
+
+    def all(self) -> DeviceView:
+        """Return a view over every device."""
+        return DeviceView(self, range(len(self.devices)))
+
+    # Exact lookups -----------------------------------------------------
+
+    def _unique_lookup(self, index: str, value: Any) -> Optional[Any]:
+        pos = self._unique[index].get(_norm(value) or "")
+        return None if pos is None else self.devices[pos]
+
+    def by_hostname(self, hostname: str) -> Optional[Any]:
+        """Return the device with this hostname (case-insensitive)."""
+        return self._unique_lookup("hostname", hostname)
+
+    def by_ip(self, ip: str) -> Optional[Any]:
+        """Return the device with this management IP address."""
+        return self._unique_lookup("ip", ip)
+
+    def by_serial(self, serial: str) -> Optional[Any]:
+        """Return the device with this serial number."""
+        return self._unique_lookup("serial", serial)
+
+    def by_id(self, device_id: str) -> Optional[Any]:
+        """Return the device with this Catalyst Center id."""
+        return self._unique_lookup("id", device_id)
+
+    def _group_positions(self, index: str, value: Any) -> Set[int]:
+        if index not in self._groups:
+            raise ValueError(f"Unknown index '{index}'; expected one of {', '.join(self._groups)}")
+        values = [value] if isinstance(value, str) or value is None else list(value)
+        positions: Set[int] = set()
+        for item in values:
+            positions |= self._groups[index].get(_norm(item) or "", set())
+        return positions
+
+    def by_family(self, family: str) -> DeviceView:
+        """Return a view of the devices in ``family``."""
+        return DeviceView(self, self._group_positions("family", family))
+
+    def by_reachability(self, status: str) -> DeviceView:
+        """Return a view of devices whose ``reachabilityStatus`` is ``status``."""
+        return DeviceView(self, self._group_positions("reachability", status))
+
+    def by_site(self, site: str) -> DeviceView:
+        """Return a view of devices at ``site``.
+
+        The site is read from ``siteId``, ``location`` or
+        ``locationName``, whichever the device record carries.
+        """
+        return DeviceView(self, self._group_positions("site", site))
+
+    # Hostname matching -------------------------------------------------
+
+    def _candidates(self, fragments: Iterable[str]) -> Optional[Set[int]]:
+        """Intersect trigram postings for ``fragments``.
+
+        Returns ``None`` if no fragment is long enough to use the index.
+        """
+        result: Optional[Set[int]] = None
+        for fragment in fragments:
+            for gram in _trigrams(fragment):
+                postings = self._trigram_index.get(gram, set())
+                result = set(postings) if result is None else result & postings
+                if not result:
+                    return set()
+        return result
+
+    def search(self, substring: str) -> DeviceView:
+        """Return devices whose hostname contains ``substring``.
+
+        Matching is case-insensitive.  Substrings of three or more
+        characters are resolved through the trigram index.
+        """
+        needle = substring.lower()
+        candidates = self._candidates([needle])
+        if candidates is None:
+            candidates = set(range(len(self.devices)))
+        hostnames = self._hostnames
+        return DeviceView(self, {pos for pos in candidates if needle in hostnames[pos]})
+
+    def match(self, pattern: str) -> DeviceView:
+        """Return devices whose hostname matches a shell style glob.
+
+        The literal runs of the pattern are used to narrow the
+        candidates via the trigram index before :mod:`fnmatch` confirms
+        each match.  Matching is case-insensitive.
+        """
+        pattern = pattern.lower()
+        fragments = [frag for frag in re.split(r"\[[^\]]*\]|[*?]", pattern) if len(frag) >= 3]
+        candidates = self._candidates(fragments)
+        if candidates is None:
+            candidates = set(range(len(self.devices)))
+        regex = re.compile(fnmatch.translate(pattern))
+        hostnames = self._hostnames
+        return DeviceView(self, {pos for pos in candidates if regex.match(hostnames[pos])})
@@ -0,0 +1,262 @@
+"""Native parser for Cisco IOS / IOS-XE configuration text.
+
+:class:`IOSConfig` turns a running configuration into a parent/child
+tree in one linear pass over the text, using indentation the same way
+the device does.  It is a lightweight replacement for the parts of
+``ciscoconfparse`` used in this repository: ``find_objects``,
+``find_objects_w_child``, ``find_objects_wo_child`` and the
+``find_parents_*`` variants behave like their ``ciscoconfparse``
+namesakes, and the returned :class:`ConfigLine` objects expose
+``text``, ``linenum``, ``parent`` and ``children``.
+
+Top-level lines are indexed by their first keyword while parsing (as
+well as by their first two keywords, e.g. ``ip access-list``).  Queries
+whose pattern is anchored on a keyword, such as ``^interface`` or
+``^router bgp``, therefore only test the matching blocks instead of
+rescanning the whole configuration.
+
+Usage example:
+
+    >>> parse = IOSConfig(running_config)
+    >>> for iface in parse.find_objects_w_child(r"^interface ", r"no cdp enable"):
+    ...     print(iface.text)
+    >>> acls = parse.blocks("ip access-list")
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Pattern, Union
+
+# Leading literal keyword of an anchored pattern, e.g. ``^ip access-list``.
+_ANCHORED_RE = re.compile(r"^\^([A-Za-z0-9_-]+)(?:(?: |\\s\+?|\\s)([A-Za-z0-9_-]+))?")
+# ``banner motd ^C`` style blocks whose body is free text.
+_BANNER_RE = re.compile(r"^banner\s+\S+\s+(\^C|\S)")
+
+# Commands that enter a configuration block from global mode.
+MODE_KEYWORDS = (
+    "interface",
+    "router",
+    "line",
+    "vlan",
+    "ip access-list",
+    "ipv6 access-list",
+    "ip dhcp pool",
+    "policy-map",
+    "class-map",
+    "route-map",
+    "key chain",
+    "dial-peer",
+    "voice service",
+    "voice register",
+    "voice class",
+    "voice translation-rule",
+    "voice translation-profile",
+    "call-manager-fallback",
+    "mgcp profile",
+    "crypto map",
+    "crypto isakmp policy",
+    "crypto isakmp profile",
+    "crypto keyring",
+    "flow monitor",
+    "flow exporter",
+    "flow record",
+    "archive",
+    "control-plane",
+)
+
+
+class ConfigLine:
+    """One configuration line and its position in the hierarchy.
+
+    :param text: The line without trailing whitespace.
+    :param linenum: Zero based line number in the source text.
+    :param indent: Number of leading spaces.
+    :param parent: Enclosing line, or ``None`` at the top level.
+    """
+
+    __slots__ = ("text", "linenum", "indent", "parent", "children")
+
+    def __init__(self, text: str, linenum: int, indent: int, parent: Optional["ConfigLine"] = None) -> None:
+        self.text = text
+        self.linenum = linenum
+        self.indent = indent
+        self.parent = parent
+        self.children: List["ConfigLine"] = []
+
+    @property
+    def has_children(self) -> bool:
+        """``True`` if the line has child lines."""
+        return bool(self.children)
+
+    @property
+    def keyword(self) -> str:
+        """The first word of the line."""
+        stripped = self.text.lstrip()
+        return stripped.split(None, 1)[0] if stripped else ""
+
+    @property
+    def is_comment(self) -> bool:
+        """``True`` for ``!`` comment lines."""
+        return self.text.lstrip().startswith("!")
+
+    def all_children(self) -> Iterator["ConfigLine"]:
+        """Yield every descendant in configuration order."""
+        for child in self.children:
+            yield child
+            yield from child.all_children()
+
+    def re_search_children(self, regex: Union[str, Pattern[str]], *, recurse: bool = False) -> List["ConfigLine"]:
+        """Return children whose text matches ``regex``.
+
+        :param regex: Pattern searched in each child's text.
+        :param recurse: Search all descendants instead of direct children.
+        """
+        pattern = re.compile(regex) if isinstance(regex, str) else regex
+        candidates = self.all_children() if recurse else self.children
+        return [child for child in candidates if pattern.search(child.text)]
+
+    def __repr__(self) -> str:
+        return f"<ConfigLine #{self.linenum} {self.text!r}>"
+
+
+class IOSConfig:
+    """Parent/child tree of an IOS configuration with a keyword index.
+
+    :param config: Configuration text or an iterable of lines, e.g. a
+        file object, so large configurations can be parsed while they
+        are read.
+    """
+
+    def __init__(self, config: Union[str, Iterable[str]]) -> None:
+        lines = config.splitlines() if isinstance(config, str) else config
+        self.objs: List[ConfigLine] = []
+        self.top: List[ConfigLine] = []
+        self._index: Dict[str, List[ConfigLine]] = {}
+        self._parse(lines)
+
+    def _parse(self, lines: Iterable[str]) -> None:
+        stack: List[ConfigLine] = []
+        banner_end: Optional[str] = None
+        banner: Optional[ConfigLine] = None
+        objs = self.objs
+        for linenum, raw in enumerate(lines):
+            text = raw.rstrip("\r\n").rstrip()
+            if banner is not None:
+                # Banner bodies are free text; keep them as flat children.
+                line = ConfigLine(text, linenum, len(text) - len(text.lstrip(" ")), banner)
+                banner.children.append(line)
+                objs.append(line)
+                if banner_end in text:
+                    banner = None
+                continue
+            stripped = text.lstrip(" ")
+            if not stripped or stripped == "!":
+                continue
+            indent = len(text) - len(stripped)
+            while stack and stack[-1].indent >= indent:
+                stack.pop()
+            parent = stack[-1] if stack else None
+            line = ConfigLine(text, linenum, indent, parent)
+            objs.append(line)
+            if parent is None:
+                self.top.append(line)
+                self._add_to_index(line)
+                match = _BANNER_RE.match(text)
+                if match:
+                    delimiter = match.group(1)
+                    if text.count(delimiter) < 2:
+                        banner, banner_end = line, delimiter
+                    continue
+            else:
+                parent.children.append(line)
+            stack.append(line)
+
+    def _add_to_index(self, line: ConfigLine) -> None:
+        words = line.text.split(None, 2)
+        self._index.setdefault(words[0], []).append(line)
+        if len(words) > 1:
+            self._index.setdefault(f"{words[0]} {words[1]}", []).append(line)
+
+    # Index based access -------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.objs)
+
+    def __iter__(self) -> Iterator[ConfigLine]:
+        return iter(self.objs)
+
+    def keywords(self) -> List[str]:
+        """Return the indexed top-level keywords."""
+        return [key for key in self._index if " " not in key]
+
+    def blocks(self, keyword: str) -> List[ConfigLine]:
+        """Return top-level lines starting with ``keyword``.
+
+        ``keyword`` is one word (``interface``) or two (``ip access-list``).
+        """
+        return list(self._index.get(" ".join(keyword.split()), ()))
+
+    def _candidates(self, pattern: Pattern[str]) -> List[ConfigLine]:
+        """Return lines that may match ``pattern``, using the index when possible."""
+        source = pattern.pattern
+        match = _ANCHORED_RE.match(source)
+        if not match or "|" in source or pattern.flags & re.IGNORECASE:
+            return self.objs
+
+        def complete(end: int) -> bool:
+            # The literal is a whole word only if followed by a space, \s or $
+            # that is not made optional by a quantifier.
+            if source[end:end + 1] == "$":
+                return True
+            width = 1 if source[end:end + 1] == " " else 2 if source[end:end + 2] == "\\s" else 0
+            return width > 0 and source[end + width:end + width + 1] not in ("*", "?", "{")
+
+        first, second = match.group(1), match.group(2)
+        if second is not None:
+            prefix = f"{first} {second}"
+            if complete(match.end(2)):
+                keys = [prefix]
+            else:
+                keys = [key for key in self._index if key.startswith(prefix) and key.count(" ") == 1]
+        elif complete(match.end(1)):
+            keys = [first]
+        else:
+            keys = [key for key in self._index if " " not in key and key.startswith(first)]
+        if len(keys) == 1:
+            return self._index.get(keys[0], [])
+        # Several keywords share the prefix (``^inter``): merge them in file order.
+        return sorted((line for key in keys for line in self._index[key]), key=lambda line: line.linenum)
+
+    # ciscoconfparse style queries -----------------------------------------
+
+    def find_objects(self, linespec: Union[str, Pattern[str]]) -> List[ConfigLine]:
+        """Return lines at any depth whose text matches ``linespec``."""
+        pattern = re.compile(linespec) if isinstance(linespec, str) else linespec
+        return [line for line in self._candidates(pattern) if pattern.search(line.text)]
+
+    def find_objects_w_child(
+        self, parentspec: Union[str, Pattern[str]], childspec: Union[str, Pattern[str]]
+    ) -> List[ConfigLine]:
+        """Return lines matching ``parentspec`` with a direct child matching ``childspec``."""
+        child = re.compile(childspec) if isinstance(childspec, str) else childspec
+        return [obj for obj in self.find_objects(parentspec) if any(child.search(c.text) for c in obj.children)]
+
+    def find_objects_wo_child(
+        self, parentspec: Union[str, Pattern[str]], childspec: Union[str, Pattern[str]]
+    ) -> List[ConfigLine]:
+        """Return lines matching ``parentspec`` without a direct child matching ``childspec``."""
+        child = re.compile(childspec) if isinstance(childspec, str) else childspec
+        return [obj for obj in self.find_objects(parentspec) if not any(child.search(c.text) for c in obj.children)]
+
+    def find_parents_w_child(self, parentspec: Union[str, Pattern[str]], childspec: Union[str, Pattern[str]]) -> List[str]:
+        """Like :meth:`find_objects_w_child` but return the parent text."""
+        return [obj.text for obj in self.find_objects_w_child(parentspec, childspec)]
+
+    def find_parents_wo_child(self, parentspec: Union[str, Pattern[str]], childspec: Union[str, Pattern[str]]) -> List[str]:
+        """Like :meth:`find_objects_wo_child` but return the parent text."""
+        return [obj.text for obj in self.find_objects_wo_child(parentspec, childspec)]
+
+    def find_lines(self, linespec: Union[str, Pattern[str]]) -> List[str]:
+        """Return the text of every line matching ``linespec``."""
+        return [obj.text for obj in self.find_objects(linespec)]
@@ -0,0 +1,212 @@
+"""Incremental decoding of large JSON list responses.
+
+Catalyst Center wraps list results in an envelope such as
+``{"response": [...], "version": "1.0"}``.  Calling
+:meth:`requests.Response.json` on a large client or device dump builds
+the entire structure in memory before the first record can be used.
+:class:`JsonArrayDecoder` instead consumes the body chunk by chunk as
+it arrives from the socket and emits each element of the target array
+as soon as it is complete, so peak memory is bounded by the size of a
+single record plus one network chunk.
+
+An optional field projection keeps only the named keys of each
+element; the remaining keys are dropped as soon as the element has
+been decoded, so they never accumulate in the caller's data.
+
+Usage example:
+
+    >>> response = session.get(url, stream=True)
+    >>> for client in iter_json_array(response.iter_content(65536), fields=("macAddress",)):
+    ...     print(client["macAddress"])
+"""
+
+from __future__ import annotations
+
+import codecs
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+_WHITESPACE = " \t\n\r"
+_NUMBER_CHARS = frozenset("0123456789+-.eE")
+# Compact the buffer once this many characters have been consumed.
+_COMPACT_THRESHOLD = 1 << 16
+
+
+def project(record: Any, fields: Optional[Sequence[str]]) -> Any:
+    """Return ``record`` reduced to ``fields`` if it is a mapping."""
+    if fields is None or not isinstance(record, dict):
+        return record
+    return {key: record[key] for key in fields if key in record}
+
+
+class JsonArrayDecoder:
+    """Push parser yielding the elements of one JSON array.
+
+    Feed raw body chunks with :meth:`feed`; each call returns the
+    elements completed by that chunk.  Call :meth:`close` once the body
+    is exhausted to validate that the array was terminated.
+
+    If the document is a bare list its elements are produced.  If it is
+    an object, the elements of the array stored under ``key`` at the top
+    level are produced; other top-level members are skipped.
+
+    :param key: Name of the top-level member holding the array.
+    :param fields: Optional keys to keep from each element.
+    :raises ValueError: From :meth:`feed` or :meth:`close` if the body
+        is not valid JSON or does not contain the requested array.
+    """
+
+    def __init__(self, key: str = "response", *, fields: Optional[Sequence[str]] = None) -> None:
+        self.key = key
+        self.fields = tuple(fields) if fields is not None else None
+        self._decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buf = ""
+        self._pos = 0
+        # States: start -> (object_key -> object_value)* -> array -> done
+        self._state = "start"
+        self._expect_comma = False
+        self._pending_key: Any = None
+        self.count = 0
+
+    # Low level helpers -------------------------------------------------
+
+    def _skip_ws(self) -> Optional[str]:
+        buf, pos = self._buf, self._pos
+        while pos < len(buf) and buf[pos] in _WHITESPACE:
+            pos += 1
+        self._pos = pos
+        return buf[pos] if pos < len(buf) else None
+
+    def _decode_value(self, final: bool) -> tuple[bool, Any]:
+        """Decode one JSON value at the cursor.
+
+        :returns: ``(True, value)`` or ``(False, None)`` if more input
+            is needed to finish the value.
+        """
+        try:
+            value, end = self._decoder.raw_decode(self._buf, self._pos)
+        except json.JSONDecodeError:
+            if final:
+                raise ValueError(f"Malformed JSON near offset {self._pos}") from None
+            return False, None
+        if not final and (end == len(self._buf) or (
+            isinstance(value, (int, float)) and self._buf[end] in _NUMBER_CHARS
+        )):
+            # A number such as ``12`` or ``4.5e`` may continue in the next chunk.
+            return False, None
+        self._pos = end
+        return True, value
+
+    def _compact(self) -> None:
+        if self._pos > _COMPACT_THRESHOLD:
+            self._buf = self._buf[self._pos:]
+            self._pos = 0
+
+    # Public API ----------------------------------------------------------
+
+    def feed(self, chunk: Union[bytes, str], *, final: bool = False) -> List[Any]:
+        """Consume ``chunk`` and return the array elements it completed."""
+        if isinstance(chunk, bytes):
+            chunk = self._text_decoder.decode(chunk, final=final)
+        self._buf += chunk
+        items: List[Any] = []
+        while True:
+            char = self._skip_ws()
+            if char is None or self._state == "done":
+                break
+            if self._state == "start":
+                if char == "[":
+                    self._state = "array"
+                elif char == "{":
+                    self._state = "object_key"
+                else:
+                    raise ValueError("Expected a JSON object or array")
+                self._pos += 1
+            elif self._state == "object_key":
+                if char == ",":
+                    self._pos += 1
+                    continue
+                if char == "}":
+                    raise ValueError(f"JSON object has no '{self.key}' array")
+                ok, name = self._decode_value(final)
+                if not ok:
+                    break
+                if self._skip_ws() is None:
+                    self._state = "object_colon"
+                    self._pending_key = name
+                    break
+                if self._buf[self._pos] != ":":
+                    raise ValueError("Expected ':' in JSON object")
+                self._pos += 1
+                self._pending_key = name
+                self._state = "object_value"
+            elif self._state == "object_colon":
+                if char != ":":
+                    raise ValueError("Expected ':' in JSON object")
+                self._pos += 1
+                self._state = "object_value"
+            elif self._state == "object_value":
+                if self._pending_key == self.key:
+                    if char != "[":
+                        raise ValueError(f"'{self.key}' is not a JSON array")
+                    self._pos += 1
+                    self._state = "array"
+                    continue
+                ok, _ = self._decode_value(final)
+                if not ok:
+                    break
+                self._state = "object_key"
+            elif self._state == "array":
+                if char == "]":
+                    self._pos += 1
+                    self._state = "done"
+                    break
+                if self._expect_comma:
+                    if char != ",":
+                        raise ValueError("Expected ',' between array elements")
+                    self._pos += 1
+                    self._expect_comma = False
+                    continue
+                ok, value = self._decode_value(final)
+                if not ok:
+                    break
+                items.append(project(value, self.fields))
+                self.count += 1
+                self._expect_comma = True
+        self._compact()
+        return items
+
+    def close(self) -> List[Any]:
+        """Flush remaining input and verify the array was terminated."""
+        items = self.feed(b"", final=True)
+        if self._state != "done":
+            raise ValueError("JSON body ended before the array was complete")
+        return items
+
+
+def iter_json_array(
+    chunks: Iterable[Union[bytes, str]],
+    key: str = "response",
+    *,
+    fields: Optional[Sequence[str]] = None,
+) -> Iterator[Any]:
+    """Yield elements of a JSON array from an iterable of body chunks.
+
+    :param chunks: Body chunks, e.g. ``response.iter_content(65536)``.
+    :param key: Top-level member holding the array when the body is an
+        object.  Ignored for bare lists.
+    :param fields: Optional keys to keep from each element.
+    :returns: An iterator over the (projected) elements.
+    :raises ValueError: If the body is malformed.
+    """
+    decoder = JsonArrayDecoder(key, fields=fields)
+    for chunk in chunks:
+        yield from decoder.feed(chunk)
+    yield from decoder.close()
+
+
+def project_all(records: Iterable[Dict[str, Any]], fields: Optional[Sequence[str]]) -> Iterator[Any]:
+    """Apply :func:`project` to every record lazily."""
+    for record in records:
+        yield project(record, fields)
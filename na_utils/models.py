@@ -0,0 +1,143 @@
+"""Compact record types for Catalyst Center data.
+
+Catalyst Center returns around fifty fields for every network device,
+while the tooling in this repository only reads a handful of them.
+Keeping every device as a raw :class:`dict` wastes a large amount of
+memory on fleets with tens of thousands of access points.
+:class:`NetworkDevice` keeps only the frequently used fields in
+``__slots__`` and interns strings that repeat across the fleet (family,
+software type, reachability and platform).  The full payload can be
+retained in compressed form and is decoded only when accessed.
+
+Instances behave like a read-only mapping for the common ``get`` and
+``[]`` lookups, so helpers such as :func:`na_utils.dnac.to_ansible_inventory`
+accept them in place of the raw dictionaries.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import zlib
+from typing import Any, Dict, Optional
+
+# Fields retained on every NetworkDevice, named as in the API payload.
+DEVICE_FIELDS = (
+    "hostname",
+    "managementIpAddress",
+    "family",
+    "softwareType",
+    "reachabilityStatus",
+    "id",
+    "serialNumber",
+    "platformId",
+)
+
+# Low cardinality fields whose values are shared via sys.intern.
+_INTERNED_FIELDS = frozenset({"family", "softwareType", "reachabilityStatus", "platformId"})
+
+
+class NetworkDevice:
+    """Memory efficient view of a ``network-device`` record.
+
+    :param raw_blob: Optional zlib compressed JSON of the original
+        record, as produced by :meth:`from_dict` with ``keep_raw``.
+    """
+
+    __slots__ = DEVICE_FIELDS + ("_raw_blob",)
+
+    def __init__(
+        self,
+        hostname: Optional[str] = None,
+        managementIpAddress: Optional[str] = None,
+        family: Optional[str] = None,
+        softwareType: Optional[str] = None,
+        reachabilityStatus: Optional[str] = None,
+        id: Optional[str] = None,  # noqa: A002 - mirrors the API field name
+        serialNumber: Optional[str] = None,
+        platformId: Optional[str] = None,
+        *,
+        raw_blob: Optional[bytes] = None,
+    ) -> None:
+        self.hostname = hostname
+        self.managementIpAddress = managementIpAddress
+        self.family = family
+        self.softwareType = softwareType
+        self.reachabilityStatus = reachabilityStatus
+        self.id = id
+        self.serialNumber = serialNumber
+        self.platformId = platformId
+        self._raw_blob = raw_blob
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], *, keep_raw: bool = False) -> "NetworkDevice":
+        """Build a device from an API record.
+
+        :param data: One element of the ``response`` list.
+        :param keep_raw: Retain the complete record, compressed, so
+            that :attr:`raw` and lookups of other fields still work.
+        :returns: A new :class:`NetworkDevice`.
+        """
+        values = {}
+        for field in DEVICE_FIELDS:
+            value = data.get(field)
+            if field in _INTERNED_FIELDS and isinstance(value, str):
+                value = sys.intern(value)
+            values[field] = value
+        blob = None
+        if keep_raw:
+            blob = zlib.compress(json.dumps(data, separators=(",", ":")).encode("utf-8"))
+        return cls(**values, raw_blob=blob)
+
+    @property
+    def raw(self) -> Dict[str, Any]:
+        """The full API record if retained, else the hot fields only.
+
+        The record is decompressed and decoded on every access; keep a
+        reference to the result if many fields are needed.
+        """
+        if self._raw_blob is not None:
+            return json.loads(zlib.decompress(self._raw_blob))
+        return self.to_dict()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the retained fields as a plain dictionary."""
+        return {field: getattr(self, field) for field in DEVICE_FIELDS}
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Look up a field like :meth:`dict.get`.
+
+        Retained fields are read directly.  Other fields are read from
+        the raw record when it was kept.  ``default`` is returned when
+        the field is missing or ``None``.
+        """
+        if key in DEVICE_FIELDS:
+            value = getattr(self, key)
+        elif self._raw_blob is not None:
+            value = self.raw.get(key)
+        else:
+            value = None
+        return default if value is None else value
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key)
+        if value is None and key not in DEVICE_FIELDS:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        return key in DEVICE_FIELDS or (self._raw_blob is not None and key in self.raw)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, NetworkDevice):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __hash__(self) -> int:
+        return hash(self.id or self.serialNumber or self.hostname)
+
+    def __repr__(self) -> str:
+        return (
+            f"NetworkDevice(hostname={self.hostname!r}, managementIpAddress={self.managementIpAddress!r}, "
+            f"family={self.family!r}, reachabilityStatus={self.reachabilityStatus!r})"
+        )
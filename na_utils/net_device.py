@@ -10,12 +10,25 @@ Netmiko must be installed in your Python environment (see
 ``requirements.txt``).  Supported device types include Cisco IOS
 variants such as ``cisco_ios`` and ``cisco_xe``.  Refer to the
 Netmiko documentation for a full list of supported platforms.
+
+:func:`run_on_devices` fans a per-device task out over a thread pool
+so that change windows covering hundreds of routers are bound by the
+slowest device rather than the sum of all of them.
+:class:`ConnectionPool` keeps sessions open between the steps of a
+workflow so each device pays the SSH handshake once per run.
 """
 
 from __future__ import annotations
 
 import os
-from typing import List, Iterable, Optional, Dict, Any
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import List, Iterable, Iterator, Optional, Dict, Any, Callable, Tuple, Union
 
 from dotenv import load_dotenv
 from netmiko import ConnectHandler
@@ -86,7 +99,21 @@ def connect_device(host: str, *, device_type: str = "cisco_xe", username: Option
         return None
 
 
-def send_config_commands(connection: ConnectHandler, commands: Iterable[str]) -> str:
+# Keyword arguments for Netmiko's send_config_set per push profile.
+# ``fast`` writes the whole block without waiting for each command to
+# echo back and reads the output once at the end, like Netmiko's
+# ``fast_cli``; use it with compiled command lists
+# (see :mod:`na_utils.command_compiler`).
+CONFIG_PROFILES: Dict[str, Dict[str, Any]] = {
+    "default": {},
+    "fast": {"cmd_verify": False, "read_timeout": 60.0},
+}
+
+# Device responses that mean a configuration command was rejected.
+CONFIG_ERROR_RE = re.compile(r"^% ?(?:Invalid input|Incomplete command|Ambiguous command)", re.MULTILINE)
+
+
+def send_config_commands(connection: ConnectHandler, commands: Iterable[str], *, profile: str = "default") -> str:
     """Send a list of configuration commands to a device.
 
     Uses Netmiko's :meth:`~netmiko.BaseConnection.send_config_set` to
@@ -97,10 +124,524 @@ def send_config_commands(connection: ConnectHandler, commands: Iterable[str]) ->
     :param connection: An active Netmiko connection obtained via
         :func:`connect_device`.
     :param commands: An iterable of CLI commands as strings.
+    :param profile: Name of a :data:`CONFIG_PROFILES` entry.  With
+        ``fast`` the output is checked for rejected commands afterwards,
+        since they are no longer caught one at a time.
     :returns: The command output concatenated into a single string.
+    :raises ValueError: If ``profile`` is unknown.
+    :raises RuntimeError: If the device rejected a command in the
+        ``fast`` profile.
     :raises Exception: If the command execution fails.
     """
     if not connection:
         raise ValueError("Connection object must not be None")
-    output = connection.send_config_set(list(commands))
-    return output
\ No newline at end of file
+    if profile not in CONFIG_PROFILES:
+        raise ValueError(f"Unknown config profile '{profile}'; expected one of {', '.join(CONFIG_PROFILES)}")
+    output = connection.send_config_set(list(commands), **CONFIG_PROFILES[profile])
+    if profile == "fast":
+        match = CONFIG_ERROR_RE.search(output)
+        if match:
+            raise RuntimeError(f"Device rejected a configuration command: {match.group(0)}")
+    return output
+
+
+# Default number of devices handled concurrently by run_on_devices.
+DEFAULT_WORKERS = 8
+
+# Device record fields used to group hosts by site, tried in order.
+_SITE_FIELDS = ("siteId", "location", "locationName", "snmpLocation")
+
+
+@dataclass
+class HostResult:
+    """Outcome of running a task against one host.
+
+    ``status`` is ``ok``, ``failed``, ``timeout`` or ``skipped`` (not
+    attempted because the failure threshold was reached).
+
+    :param index: Position of the host in the input sequence.
+    :param host: The host object passed to the task.
+    :param name: Display name of the host.
+    :param status: Outcome of the task.
+    :param result: Return value of the task when it succeeded.
+    :param error: Error message when it did not.
+    :param elapsed: Wall clock seconds spent in the task.
+    """
+
+    index: int
+    host: Any
+    name: str
+    status: str
+    result: Any = None
+    error: Optional[str] = None
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """``True`` if the task completed without raising."""
+        return self.status == "ok"
+
+
+def device_name(host: Any) -> str:
+    """Return a display name for a host string or device record."""
+    if isinstance(host, str):
+        return host
+    get = getattr(host, "get", None)
+    if get is not None:
+        return str(get("hostname") or get("managementIpAddress") or get("id") or host)
+    return str(host)
+
+
+def device_group(field: str) -> Callable[[Any], Any]:
+    """Return a ``group_by`` callable for :func:`run_on_devices`.
+
+    :param field: ``site``, ``family`` or any device record field.
+    """
+    fields = _SITE_FIELDS if field == "site" else (field,)
+
+    def group(host: Any) -> Any:
+        get = getattr(host, "get", None)
+        if get is None:
+            return None
+        for name in fields:
+            value = get(name)
+            if value:
+                return value
+        return None
+
+    return group
+
+
+def iter_on_devices(
+    hosts: Iterable[Any],
+    task: Callable[[Any], Any],
+    *,
+    max_workers: int = DEFAULT_WORKERS,
+    per_host_timeout: Optional[float] = None,
+    max_failures: Optional[int] = None,
+    group_by: Optional[Callable[[Any], Any]] = None,
+    group_limit: Union[int, Dict[Any, int], None] = None,
+    name: Callable[[Any], str] = device_name,
+    progress: bool = True,
+) -> Iterator[HostResult]:
+    """Run ``task`` for every host in a thread pool, yielding results as they finish.
+
+    Hosts are started in input order.  Each call of ``task(host)`` runs
+    in a worker thread; its return value becomes
+    :attr:`HostResult.result` and any exception is captured in
+    :attr:`HostResult.error`, so one bad device never aborts the run.
+    Results are yielded in completion order from the calling thread,
+    which makes it safe to write trackers or print output there.
+
+    Python threads cannot be interrupted, so a task that exceeds
+    ``per_host_timeout`` is reported as ``timeout`` and abandoned; its
+    worker remains busy until the underlying I/O gives up.  Pass
+    Netmiko's own ``conn_timeout``/``read_timeout`` to keep such
+    stragglers short.
+
+    :param hosts: Host strings or device records.
+    :param task: Callable invoked with each host.
+    :param max_workers: Maximum number of hosts handled at once.
+    :param per_host_timeout: Seconds after which a running task is
+        reported as timed out.  ``None`` waits indefinitely.
+    :param max_failures: Stop starting new hosts once this many have
+        failed or timed out; the rest are reported as ``skipped``.
+    :param group_by: Callable returning a group key (e.g. site or
+        family) for a host, used with ``group_limit``.
+    :param group_limit: Maximum concurrent hosts per group, either one
+        number for every group or a mapping of group key to limit.
+        Groups missing from the mapping are only bound by
+        ``max_workers``.
+    :param name: Callable returning the display name of a host.
+    :param progress: Print a line as each host completes.
+    :returns: An iterator over :class:`HostResult` objects.
+    :raises ValueError: If ``max_workers`` is less than one.
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+    pending: deque = deque(enumerate(hosts))
+    total = len(pending)
+    in_flight: Dict[Future, Tuple[int, Any, Any]] = {}
+    started: Dict[int, float] = {}
+    running_per_group: Dict[Any, int] = {}
+    failures = 0
+    completed = 0
+    abandoned = False
+
+    def limit_for(group: Any) -> Optional[int]:
+        if group_by is None or group_limit is None:
+            return None
+        cap = group_limit.get(group) if isinstance(group_limit, dict) else group_limit
+        return None if cap is None else max(cap, 1)
+
+    def run(index: int, host: Any) -> Any:
+        started[index] = time.monotonic()
+        return task(host)
+
+    def finish(index: int, host: Any, status: str, result: Any = None, error: Optional[str] = None) -> HostResult:
+        nonlocal completed, failures
+        completed += 1
+        if status in ("failed", "timeout"):
+            failures += 1
+        start = started.pop(index, None)
+        elapsed = time.monotonic() - start if start is not None else 0.0
+        outcome = HostResult(index, host, name(host), status, result, error, elapsed)
+        if progress:
+            detail = f"ok ({elapsed:.1f}s)" if outcome.ok else f"{status.upper()}: {error}"
+            print(f"[{completed}/{total}] {outcome.name}: {detail}")
+        return outcome
+
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="net_device")
+    try:
+        while pending or in_flight:
+            if max_failures is not None and failures >= max_failures:
+                while pending:
+                    index, host = pending.popleft()
+                    yield finish(index, host, "skipped", error=f"not attempted after {failures} failure(s)")
+            deferred = []
+            while pending and len(in_flight) < max_workers:
+                index, host = pending.popleft()
+                group = group_by(host) if group_by is not None else None
+                cap = limit_for(group)
+                if cap is not None and running_per_group.get(group, 0) >= cap:
+                    deferred.append((index, host))
+                    continue
+                running_per_group[group] = running_per_group.get(group, 0) + 1
+                in_flight[executor.submit(run, index, host)] = (index, host, group)
+            pending.extendleft(reversed(deferred))
+            if not in_flight:
+                continue
+
+            timeout = None
+            if per_host_timeout is not None:
+                starts = [started[index] for index, _, _ in in_flight.values() if index in started]
+                if starts:
+                    timeout = max(min(starts) + per_host_timeout - time.monotonic(), 0.0)
+                if len(starts) < len(in_flight):
+                    # Some tasks have not reached a worker yet; poll until they do.
+                    timeout = 1.0 if timeout is None else min(timeout, 1.0)
+            done, _ = wait(list(in_flight), timeout=timeout, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                index, host, group = in_flight.pop(future)
+                running_per_group[group] -= 1
+                exc = future.exception()
+                if exc is None:
+                    yield finish(index, host, "ok", result=future.result())
+                else:
+                    yield finish(index, host, "failed", error=str(exc) or type(exc).__name__)
+
+            if per_host_timeout is not None:
+                now = time.monotonic()
+                for future, (index, host, group) in list(in_flight.items()):
+                    start = started.get(index)
+                    if start is None or now - start < per_host_timeout:
+                        continue
+                    del in_flight[future]
+                    running_per_group[group] -= 1
+                    abandoned = True
+                    yield finish(index, host, "timeout", error=f"timed out after {per_host_timeout:g}s")
+    finally:
+        executor.shutdown(wait=not abandoned, cancel_futures=True)
+
+
+def run_on_devices(
+    hosts: Iterable[Any],
+    task: Callable[[Any], Any],
+    *,
+    max_workers: int = DEFAULT_WORKERS,
+    per_host_timeout: Optional[float] = None,
+    **kwargs: Any,
+) -> List[HostResult]:
+    """Run ``task`` against every host concurrently and collect the results.
+
+    Thin wrapper around :func:`iter_on_devices` (see there for the
+    remaining keyword arguments) that returns one :class:`HostResult`
+    per host, in input order.
+
+    Usage example:
+
+        >>> results = run_on_devices(["192.0.2.1", "192.0.2.2"], backup, max_workers=16)
+        >>> failed = [r.name for r in results if not r.ok]
+    """
+    results = list(
+        iter_on_devices(hosts, task, max_workers=max_workers, per_host_timeout=per_host_timeout, **kwargs)
+    )
+    results.sort(key=lambda result: result.index)
+    return results
+
+
+def add_worker_arguments(parser: Any, *, grouping: bool = True) -> None:
+    """Add fan-out options for :func:`run_on_devices` to an argument parser.
+
+    Adds ``--workers``, ``--host-timeout`` and ``--max-failures`` and,
+    when ``grouping`` is true, ``--group-by``/``--group-limit`` for a
+    per-site or per-family concurrency cap.  Convert the parsed
+    namespace with :func:`worker_options`.
+    """
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Number of devices to handle concurrently (default {DEFAULT_WORKERS})")
+    parser.add_argument("--host-timeout", type=float, default=None,
+                        help="Give up on a device after this many seconds")
+    parser.add_argument("--max-failures", type=int, default=None,
+                        help="Stop starting new devices after this many failures")
+    if grouping:
+        parser.add_argument("--group-by", choices=("site", "family"), default="site",
+                            help="Device attribute used by --group-limit (default site)")
+        parser.add_argument("--group-limit", type=int, default=None,
+                            help="Maximum devices handled concurrently per site or family")
+
+
+def worker_options(args: Any) -> Dict[str, Any]:
+    """Return :func:`run_on_devices` keyword arguments for parsed options."""
+    options: Dict[str, Any] = {
+        "max_workers": max(1, args.workers),
+        "per_host_timeout": args.host_timeout,
+        "max_failures": args.max_failures,
+    }
+    if getattr(args, "group_limit", None):
+        options["group_by"] = device_group(args.group_by)
+        options["group_limit"] = args.group_limit
+    return options
+
+
+# Defaults for ConnectionPool.
+DEFAULT_MAX_SESSIONS = 32
+DEFAULT_IDLE_TIMEOUT = 300.0
+DEFAULT_PROBE_AFTER = 10.0
+
+
+@dataclass
+class _PooledSession:
+    # ``conn`` is ``None`` while the owner is still connecting.
+    conn: Any
+    last_used: float
+    owner: Optional[int] = None
+
+
+class ConnectionPool:
+    """Thread-safe pool of live Netmiko sessions keyed by host.
+
+    A session is handed to one caller at a time via :meth:`session` (or
+    :meth:`acquire`/:meth:`release`) and kept open afterwards, so the
+    next step of a workflow for the same host skips the SSH handshake.
+
+    * Before a session that has been idle for ``probe_after`` seconds is
+      handed out it is health checked with a prompt probe
+      (``find_prompt``); stale sessions are closed and re-established.
+    * Sessions idle for longer than ``idle_timeout`` are disconnected.
+    * At most ``max_sessions`` sessions are open.  When the cap is
+      reached the least recently used idle session is closed; if every
+      session is in use the caller waits for one to be released.
+
+    Sessions are not re-entrant: a thread must release a host's session
+    before acquiring it again.  Other threads asking for a host whose
+    session is checked out, or still connecting, wait for it.
+
+    ``stats`` counts ``hits`` (reused sessions), ``connects``,
+    ``reconnects`` (stale sessions replaced), ``expired`` and
+    ``evicted``.
+
+    Usage example:
+
+        >>> with ConnectionPool(max_sessions=16) as pool:
+        ...     with pool.session("192.0.2.1") as conn:
+        ...         send_config_commands(conn, commands)
+        ...     with pool.session("192.0.2.1") as conn:
+        ...         conn.send_command("write memory")
+
+    :param max_sessions: Maximum number of open sessions.
+    :param idle_timeout: Seconds after which an unused session is closed.
+    :param probe_after: Idle seconds after which a session is probed
+        before reuse.  ``0`` probes on every checkout.
+    :param connect: Callable opening a session for a host; defaults to
+        :func:`connect_device`.
+    :param connect_kwargs: Keyword arguments passed to ``connect``.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_sessions: int = DEFAULT_MAX_SESSIONS,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+        probe_after: float = DEFAULT_PROBE_AFTER,
+        connect: Optional[Callable[..., Any]] = None,
+        **connect_kwargs: Any,
+    ) -> None:
+        if max_sessions < 1:
+            raise ValueError("max_sessions must be at least 1")
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.probe_after = probe_after
+        self._connect = connect or connect_device
+        self._connect_kwargs = connect_kwargs
+        self._sessions: Dict[str, _PooledSession] = {}
+        self._cond = threading.Condition()
+        self._closed = False
+        self.stats: Dict[str, int] = {"hits": 0, "connects": 0, "reconnects": 0, "expired": 0, "evicted": 0}
+
+    @staticmethod
+    def _disconnect(conn: Any) -> None:
+        try:
+            conn.disconnect()
+        except Exception:
+            pass
+
+    def _healthy(self, conn: Any) -> bool:
+        """Return ``True`` if ``conn`` answers a prompt probe."""
+        try:
+            is_alive = getattr(conn, "is_alive", None)
+            if is_alive is not None and not is_alive():
+                return False
+            return bool(conn.find_prompt())
+        except Exception:
+            return False
+
+    def _expire_idle(self, now: float) -> List[Any]:
+        """Drop idle sessions past ``idle_timeout``; caller holds the lock."""
+        stale = []
+        for host, entry in list(self._sessions.items()):
+            if entry.owner is None and now - entry.last_used > self.idle_timeout:
+                del self._sessions[host]
+                stale.append(entry.conn)
+                self.stats["expired"] += 1
+        return stale
+
+    def _evict_one(self) -> Optional[Any]:
+        """Drop the least recently used idle session; caller holds the lock."""
+        idle = [(entry.last_used, host) for host, entry in self._sessions.items() if entry.owner is None]
+        if not idle:
+            return None
+        _, host = min(idle)
+        self.stats["evicted"] += 1
+        return self._sessions.pop(host).conn
+
+    def acquire(self, host: str) -> Any:
+        """Check out a live session for ``host``, connecting if needed.
+
+        :param host: IP address or hostname of the device.
+        :returns: A Netmiko connection owned by the caller until
+            :meth:`release` is called.
+        :raises RuntimeError: If the pool is closed, the calling thread
+            already holds this host, or the connection fails.
+        """
+        me = threading.get_ident()
+        to_close: List[Any] = []
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("ConnectionPool is closed")
+                to_close.extend(self._expire_idle(time.monotonic()))
+                entry = self._sessions.get(host)
+                if entry is not None:
+                    if entry.owner == me:
+                        raise RuntimeError(f"Session for {host} is already held by this thread")
+                    if entry.owner is None:
+                        entry.owner = me
+                        break
+                elif len(self._sessions) < self.max_sessions:
+                    # Reserve the host so other acquirers wait for this connection.
+                    entry = self._sessions[host] = _PooledSession(None, time.monotonic(), me)
+                    break
+                else:
+                    victim = self._evict_one()
+                    if victim is not None:
+                        to_close.append(victim)
+                        continue
+                self._cond.wait()
+        for conn in to_close:
+            self._disconnect(conn)
+
+        if entry.conn is not None:
+            if time.monotonic() - entry.last_used < self.probe_after or self._healthy(entry.conn):
+                self._count("hits")
+                return entry.conn
+            # Stale: reconnect in place while still owning the slot.
+            self._disconnect(entry.conn)
+            entry.conn = None
+            self._count("reconnects")
+        try:
+            conn = self._open(host)
+        except BaseException:
+            with self._cond:
+                del self._sessions[host]
+                self._cond.notify_all()
+            raise
+        with self._cond:
+            entry.conn = conn
+            entry.last_used = time.monotonic()
+        return conn
+
+    def _open(self, host: str) -> Any:
+        conn = self._connect(host, **self._connect_kwargs)
+        if not conn:
+            raise RuntimeError(f"SSH connection to {host} failed")
+        self._count("connects")
+        return conn
+
+    def _count(self, name: str) -> None:
+        with self._cond:
+            self.stats[name] += 1
+
+    def release(self, host: str, *, discard: bool = False) -> None:
+        """Return the session for ``host`` to the pool.
+
+        :param host: Host passed to :meth:`acquire`.
+        :param discard: Close the session instead of keeping it, e.g.
+            after an error left it in an unknown state.
+        :raises RuntimeError: If the calling thread does not hold the
+            session.
+        """
+        conn = None
+        with self._cond:
+            entry = self._sessions.get(host)
+            if entry is None:
+                return
+            if entry.owner != threading.get_ident():
+                raise RuntimeError(f"Session for {host} is not held by this thread")
+            if discard or self._closed:
+                del self._sessions[host]
+                conn = entry.conn
+            else:
+                entry.owner = None
+                entry.last_used = time.monotonic()
+            self._cond.notify_all()
+        if conn is not None:
+            self._disconnect(conn)
+
+    @contextmanager
+    def session(self, host: str) -> Iterator[Any]:
+        """Context manager around :meth:`acquire` and :meth:`release`.
+
+        If the block raises, the session is discarded rather than
+        returned, since the device may be left mid-command.
+        """
+        conn = self.acquire(host)
+        try:
+            yield conn
+        except BaseException:
+            self.release(host, discard=True)
+            raise
+        self.release(host)
+
+    def close(self) -> None:
+        """Disconnect every idle session and refuse new checkouts.
+
+        Sessions still checked out are closed when they are released.
+        """
+        with self._cond:
+            self._closed = True
+            idle = [host for host, entry in self._sessions.items() if entry.owner is None]
+            conns = [self._sessions.pop(host).conn for host in idle]
+            self._cond.notify_all()
+        for conn in conns:
+            self._disconnect(conn)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __enter__(self) -> "ConnectionPool":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
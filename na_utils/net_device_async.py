@@ -0,0 +1,452 @@
+"""Asynchronous network device sessions built on asyncssh.
+
+This module is the :mod:`asyncio` sibling of :mod:`na_utils.net_device`.
+A Netmiko session ties up one thread for its whole lifetime, which
+limits a process to a few hundred concurrent devices.  The coroutines
+here drive an interactive shell over :mod:`asyncssh` instead, so a
+single process can collect ``show running-config`` from well over a
+thousand devices at once (raise ``ulimit -n`` accordingly).
+
+The shell handling follows Netmiko's ``cisco_ios``/``cisco_xe``
+behaviour: the base prompt is learned after login, paging is disabled
+with ``terminal length 0``, the session enters privileged mode when an
+enable secret is given, and configuration is sent inside
+``configure terminal`` … ``end``.  Credentials default to ``DNAC_USER``
+and ``DNAC_PASS`` as in :func:`na_utils.net_device.connect_device`.
+
+Usage example:
+
+    >>> import asyncio
+    >>> from na_utils.net_device_async import connect_device, run_on_devices, send_command
+    >>> async def backup(ip):
+    ...     conn = await connect_device(ip)
+    ...     if conn is None:
+    ...         raise RuntimeError("SSH connection failed")
+    ...     async with conn:
+    ...         return await send_command(conn, "show running-config", read_timeout=120)
+    >>> results = asyncio.run(run_on_devices(ips, backup, concurrency=1000))
+"""
+
+from __future__ import annotations
+
+import asyncio
+import re
+import time
+from typing import Any, Awaitable, Callable, Iterable, List, Optional
+
+import asyncssh
+
+from .net_device import HostResult, _get_device_credentials, device_name
+
+# Device types whose prompt and configuration semantics are emulated.
+SUPPORTED_DEVICE_TYPES = frozenset({"cisco_ios", "cisco_xe"})
+
+# Default number of devices handled concurrently by run_on_devices.
+DEFAULT_CONCURRENCY = 500
+
+# Prompt terminators for user EXEC (``>``) and privileged EXEC (``#``).
+_ANY_PROMPT = re.compile(r"[>#]\s*$")
+_PAGER = re.compile(r"[ \t]*--More--[ \t]*$")
+# Backspace/space/backspace sequence IOS uses to erase an answered pager prompt.
+_PAGER_ERASE = re.compile(r"\x08+ *\x08*")
+# Only the tail of the output is searched for the prompt.
+_TAIL = 512
+
+
+class ReadTimeout(Exception):
+    """Raised when the expected prompt is not seen within ``read_timeout``."""
+
+
+class AsyncDeviceConnection:
+    """Interactive IOS shell over an :mod:`asyncssh` connection.
+
+    Instances are created by :func:`connect_device`; use them as an
+    ``async with`` context manager or call :meth:`disconnect`.
+
+    :param host: Device address, used in error messages.
+    :param connection: The underlying :class:`asyncssh.SSHClientConnection`.
+    :param process: Interactive shell process on that connection.
+    :param device_type: ``cisco_ios`` or ``cisco_xe``.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        connection: asyncssh.SSHClientConnection,
+        process: asyncssh.SSHClientProcess,
+        device_type: str = "cisco_xe",
+    ) -> None:
+        self.host = host
+        self.device_type = device_type
+        self.prompt = ""
+        self.base_prompt = ""
+        self._connection = connection
+        self._process = process
+        self._prompt_re = _ANY_PROMPT
+
+    # Low level I/O ------------------------------------------------------
+
+    async def _read_until(self, pattern: re.Pattern, read_timeout: float) -> str:
+        """Read output until ``pattern`` matches its tail.
+
+        Any ``--More--`` pager prompt is answered with a space, and the
+        backspaces the device sends to erase it are removed.
+
+        :raises ReadTimeout: If the pattern is not seen in time.
+        """
+        deadline = time.monotonic() + read_timeout
+        chunks: List[str] = []
+        tail = ""
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise ReadTimeout(f"Pattern {pattern.pattern!r} not detected on {self.host} within {read_timeout:g}s")
+            try:
+                data = await asyncio.wait_for(self._process.stdout.read(65536), remaining)
+            except asyncio.TimeoutError:
+                continue
+            if not data:
+                raise ConnectionError(f"Session to {self.host} closed while reading output")
+            chunks.append(data)
+            tail = (tail + data)[-_TAIL:]
+            if _PAGER.search(tail):
+                chunks[-1] = _PAGER.sub("", chunks[-1])
+                tail = _PAGER.sub("", tail)
+                self._process.stdin.write(" ")
+                continue
+            if pattern.search(tail):
+                output = "".join(chunks).replace("\r\n", "\n").replace("\r", "")
+                return _PAGER_ERASE.sub("", output)
+
+    async def _drain(self, quiet: float) -> str:
+        """Read whatever arrives until the session is quiet for ``quiet`` seconds."""
+        chunks: List[str] = []
+        while True:
+            try:
+                data = await asyncio.wait_for(self._process.stdout.read(65536), quiet)
+            except asyncio.TimeoutError:
+                return "".join(chunks).replace("\r\n", "\n").replace("\r", "")
+            if not data:
+                raise ConnectionError(f"Session to {self.host} closed while reading output")
+            chunks.append(data)
+
+    def _write_line(self, line: str) -> None:
+        self._process.stdin.write(line + "\n")
+
+    async def _session_preparation(self, secret: Optional[str], read_timeout: float) -> None:
+        """Learn the prompt, enter enable mode and disable paging."""
+        await self.find_prompt(read_timeout=read_timeout)
+        if secret and not self.check_enable_mode():
+            await self.enable(secret, read_timeout=read_timeout)
+        await self.send_command("terminal length 0", read_timeout=read_timeout)
+        await self.send_command("terminal width 511", read_timeout=read_timeout)
+
+    # Prompt handling ------------------------------------------------------
+
+    async def find_prompt(self, *, read_timeout: float = 10.0) -> str:
+        """Return the current prompt and update :attr:`base_prompt`.
+
+        A newline is sent and output is read until the session goes
+        quiet, so prompts from a login banner or earlier input are
+        consumed too.  Like Netmiko, the hostname portion is truncated
+        to 16 characters when matching, since IOS shortens it in
+        configuration mode prompts.
+        """
+        self._write_line("")
+        output = await self._read_until(_ANY_PROMPT, read_timeout)
+        output += await self._drain(0.2)
+        prompt = output.strip().splitlines()[-1].strip()
+        self.prompt = prompt
+        base = re.sub(r"\(.*\)", "", prompt[:-1])
+        self.base_prompt = base
+        self._prompt_re = re.compile(re.escape(base[:16]) + r"[^\n]*[>#]\s*$")
+        return prompt
+
+    def check_enable_mode(self) -> bool:
+        """Return ``True`` if the last seen prompt is privileged."""
+        return self.prompt.endswith("#")
+
+    def check_config_mode(self) -> bool:
+        """Return ``True`` if the last seen prompt is a configuration prompt."""
+        return "(config" in self.prompt
+
+    async def enable(self, secret: str, *, read_timeout: float = 10.0) -> None:
+        """Enter privileged EXEC mode.
+
+        :raises ValueError: If the device rejects the enable secret.
+        """
+        self._write_line("enable")
+        output = await self._read_until(re.compile(r"(?i)(password:\s*$)|([>#]\s*$)"), read_timeout)
+        if output.rstrip().lower().endswith("password:"):
+            self._write_line(secret)
+            await self.find_prompt(read_timeout=read_timeout)
+        else:
+            self.prompt = output.strip().splitlines()[-1].strip()
+        if not self.check_enable_mode():
+            raise ValueError(f"Failed to enter enable mode on {self.host}")
+
+    # Commands ---------------------------------------------------------------
+
+    async def send_command(
+        self,
+        command: str,
+        *,
+        expect_string: Optional[str] = None,
+        read_timeout: float = 10.0,
+        strip_prompt: bool = True,
+        strip_command: bool = True,
+    ) -> str:
+        """Send an EXEC command and return its output.
+
+        :param command: Command to run.
+        :param expect_string: Regular expression marking the end of the
+            output.  Defaults to the device prompt.
+        :param read_timeout: Seconds to wait for the output to finish.
+        :param strip_prompt: Remove the trailing prompt from the output.
+        :param strip_command: Remove the echoed command from the output.
+        :returns: The command output.
+        :raises ReadTimeout: If the prompt is not seen in time.
+        """
+        pattern = re.compile(expect_string) if expect_string else self._prompt_re
+        self._write_line(command)
+        output = await self._read_until(pattern, read_timeout)
+        lines = output.split("\n")
+        if expect_string is None:
+            self.prompt = lines[-1].strip()
+        if strip_command and lines and command and lines[0].strip().endswith(command.strip()):
+            lines = lines[1:]
+        if strip_prompt and expect_string is None and lines:
+            lines = lines[:-1]
+        return "\n".join(lines)
+
+    async def config_mode(self, *, read_timeout: float = 10.0) -> str:
+        """Enter ``configure terminal`` if not already in configuration mode."""
+        if self.check_config_mode():
+            return ""
+        output = await self.send_command("configure terminal", read_timeout=read_timeout, strip_prompt=False)
+        if not self.check_config_mode():
+            raise ValueError(f"Failed to enter configuration mode on {self.host}")
+        return output
+
+    async def exit_config_mode(self, *, read_timeout: float = 10.0) -> str:
+        """Leave configuration mode with ``end``."""
+        if not self.check_config_mode():
+            return ""
+        output = await self.send_command("end", read_timeout=read_timeout, strip_prompt=False)
+        if self.check_config_mode():
+            raise ValueError(f"Failed to exit configuration mode on {self.host}")
+        return output
+
+    async def send_config_set(
+        self,
+        commands: Iterable[str],
+        *,
+        exit_config_mode: bool = True,
+        read_timeout: float = 15.0,
+    ) -> str:
+        """Send configuration commands, mirroring Netmiko's ``send_config_set``.
+
+        Each command is sent once the device has returned to its prompt,
+        so the combined output shows every command with its response.
+
+        :param commands: Configuration lines.
+        :param exit_config_mode: Send ``end`` after the last command.
+        :param read_timeout: Seconds to wait for each command.
+        :returns: The echoed commands and device responses.
+        """
+        output = [await self.config_mode(read_timeout=read_timeout)]
+        for command in commands:
+            output.append(
+                await self.send_command(command, read_timeout=read_timeout, strip_prompt=False, strip_command=False)
+            )
+        if exit_config_mode:
+            output.append(await self.exit_config_mode(read_timeout=read_timeout))
+        return "\n".join(part for part in output if part)
+
+    async def disconnect(self) -> None:
+        """Close the shell and the SSH connection."""
+        try:
+            if self.check_config_mode():
+                self._write_line("end")
+            self._write_line("exit")
+        except Exception:
+            pass
+        self._process.close()
+        self._connection.close()
+        try:
+            await self._connection.wait_closed()
+        except Exception:
+            pass
+
+    async def __aenter__(self) -> "AsyncDeviceConnection":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.disconnect()
+
+
+async def connect_device(
+    host: str,
+    *,
+    device_type: str = "cisco_xe",
+    username: Optional[str] = None,
+    password: Optional[str] = None,
+    secret: Optional[str] = None,
+    port: int = 22,
+    conn_timeout: float = 10.0,
+    read_timeout: float = 10.0,
+    **kwargs: Any,
+) -> Optional[AsyncDeviceConnection]:
+    """Open an interactive SSH session to a network device.
+
+    Mirrors :func:`na_utils.net_device.connect_device`: connection and
+    authentication failures are printed and ``None`` is returned.  As
+    with Netmiko's defaults, host keys are not verified and neither
+    local keys nor an SSH agent are offered unless overridden through
+    ``kwargs``.
+
+    :param host: IP address or hostname of the target device.
+    :param device_type: ``cisco_xe`` (default) or ``cisco_ios``.
+    :param username: Optional SSH username.  Defaults to ``DNAC_USER``.
+    :param password: Optional SSH password.  Defaults to ``DNAC_PASS``.
+    :param secret: Optional enable secret.
+    :param port: SSH port.
+    :param conn_timeout: Seconds allowed for the SSH handshake.
+    :param read_timeout: Seconds allowed for the initial prompt.
+    :param kwargs: Additional keyword arguments for :func:`asyncssh.connect`.
+    :returns: A session or ``None`` on failure.
+    :raises ValueError: If ``device_type`` is not supported.
+    """
+    if device_type not in SUPPORTED_DEVICE_TYPES:
+        raise ValueError(f"Unsupported device_type '{device_type}'; expected one of {sorted(SUPPORTED_DEVICE_TYPES)}")
+    creds = _get_device_credentials() if not (username and password) else {}
+    kwargs.setdefault("known_hosts", None)
+    kwargs.setdefault("client_keys", None)
+    kwargs.setdefault("agent_path", None)
+    try:
+        connection = await asyncssh.connect(
+            host,
+            port=port,
+            username=username or creds["username"],
+            password=password or creds["password"],
+            connect_timeout=conn_timeout,
+            **kwargs,
+        )
+    except asyncio.TimeoutError:
+        print(f"Timeout connecting to {host}")
+        return None
+    except asyncssh.PermissionDenied:
+        print(f"Authentication failure for {host}")
+        return None
+    except OSError as exc:
+        # Refused, unreachable or unresolvable; TimeoutError is handled above.
+        print(f"Error connecting to {host}: {exc.strerror or exc}")
+        return None
+    except Exception as exc:  # pragma: no cover
+        print(f"Unexpected error connecting to {host}: {exc}")
+        return None
+    try:
+        process = await connection.create_process(term_type="vt100", term_size=(511, 24))
+        conn = AsyncDeviceConnection(host, connection, process, device_type)
+        await conn._session_preparation(secret, read_timeout)
+    except Exception as exc:
+        connection.close()
+        print(f"Unexpected error preparing session on {host}: {exc}")
+        return None
+    return conn
+
+
+async def send_command(connection: AsyncDeviceConnection, command: str, **kwargs: Any) -> str:
+    """Run an EXEC command; see :meth:`AsyncDeviceConnection.send_command`."""
+    if not connection:
+        raise ValueError("Connection object must not be None")
+    return await connection.send_command(command, **kwargs)
+
+
+async def send_config_commands(connection: AsyncDeviceConnection, commands: Iterable[str]) -> str:
+    """Send a list of configuration commands to a device.
+
+    Asynchronous counterpart of :func:`na_utils.net_device.send_config_commands`.
+
+    :param connection: A session obtained via :func:`connect_device`.
+    :param commands: An iterable of CLI commands as strings.
+    :returns: The command output concatenated into a single string.
+    """
+    if not connection:
+        raise ValueError("Connection object must not be None")
+    return await connection.send_config_set(list(commands))
+
+
+class _TaskTimeout(Exception):
+    """A ``TimeoutError`` raised by the task itself, not by ``per_host_timeout``."""
+
+
+async def _own_timeouts(coro: Awaitable[Any]) -> Any:
+    try:
+        return await coro
+    except asyncio.TimeoutError as exc:
+        raise _TaskTimeout() from exc
+
+
+async def run_on_devices(
+    hosts: Iterable[Any],
+    task: Callable[[Any], Awaitable[Any]],
+    *,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    per_host_timeout: Optional[float] = None,
+    max_failures: Optional[int] = None,
+    name: Callable[[Any], str] = device_name,
+    progress: bool = True,
+) -> List[HostResult]:
+    """Await ``task(host)`` for every host with bounded concurrency.
+
+    Asynchronous counterpart of :func:`na_utils.net_device.run_on_devices`
+    returning the same :class:`~na_utils.net_device.HostResult` objects
+    in input order.  Unlike threads, a coroutine exceeding
+    ``per_host_timeout`` is cancelled outright.
+
+    :param hosts: Host strings or device records.
+    :param task: Coroutine function invoked with each host.
+    :param concurrency: Maximum number of hosts handled at once.
+    :param per_host_timeout: Seconds after which a task is cancelled.
+    :param max_failures: Skip hosts not yet started once this many
+        have failed or timed out.
+    :param name: Callable returning the display name of a host.
+    :param progress: Print a line as each host completes.
+    :returns: One result per host.
+    :raises ValueError: If ``concurrency`` is less than one.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    hosts = list(hosts)
+    semaphore = asyncio.Semaphore(concurrency)
+    failures = 0
+    completed = 0
+
+    async def run(index: int, host: Any) -> HostResult:
+        nonlocal failures, completed
+        async with semaphore:
+            start = time.monotonic()
+            if max_failures is not None and failures >= max_failures:
+                status, result, error = "skipped", None, f"not attempted after {failures} failure(s)"
+            else:
+                try:
+                    result = await asyncio.wait_for(_own_timeouts(task(host)), per_host_timeout)
+                    status, error = "ok", None
+                except asyncio.TimeoutError:
+                    # Only the per-host deadline gets here; see _own_timeouts.
+                    status, result, error = "timeout", None, f"timed out after {per_host_timeout:g}s"
+                except Exception as exc:
+                    if isinstance(exc, _TaskTimeout):
+                        exc = exc.__cause__
+                    status, result, error = "failed", None, str(exc) or type(exc).__name__
+            if status in ("failed", "timeout"):
+                failures += 1
+            completed += 1
+            outcome = HostResult(index, host, name(host), status, result, error, time.monotonic() - start)
+            if progress:
+                detail = f"ok ({outcome.elapsed:.1f}s)" if outcome.ok else f"{status.upper()}: {error}"
+                print(f"[{completed}/{len(hosts)}] {outcome.name}: {detail}")
+            return outcome
+
+    return list(await asyncio.gather(*(run(index, host) for index, host in enumerate(hosts))))
@@ -0,0 +1,389 @@
+"""Predict the effect of configuration pushes on archived configurations.
+
+Before a change window the push scripts can be run in simulation mode:
+instead of connecting to devices, the commands each script would send
+are applied to a local model of every device's archived configuration
+(a snapshot directory of ``<hostname>.conf`` files or a
+:class:`~na_utils.config_store.ConfigStore` date).  The predicted
+configuration is diffed against the archived one.  Devices are
+simulated in a process pool, so a 5,000 device fleet takes seconds.
+
+:class:`ConfigModel` follows IOS configuration mode closely enough for
+rollout commands:
+
+* Mode commands (``interface``, ``router``, ``dial-peer`` …, see
+  :data:`~na_utils.ios_config.MODE_KEYWORDS`) enter their block, creating it if needed;
+  ``interface range`` enters every interface of the range.  ``exit``
+  leaves a block and ``end`` returns to global mode.
+* ``no X`` removes the line ``X`` (with its children) or, failing
+  that, lines starting with ``X``.  Inside a block, a ``no X`` for a
+  line that is not configured is recorded as an explicit ``no X``, the
+  way IOS shows disabled defaults such as ``no lldp transmit``.
+* ``X`` removes an explicit ``no X``, replaces the value of a
+  single-value command (:data:`~na_utils.config_utils.OVERWRITE_COMMANDS`)
+  or adds the line.
+
+Scripts plug in a *planner*, a picklable ``planner(hostname, config)``
+function returning the commands the script would send to that device.
+
+Usage example:
+
+    >>> snapshot = load_snapshot("2026-01-31", store=ConfigStore("/backups/archive"))
+    >>> for result in iter_simulation(snapshot, plan_device):
+    ...     print(result.hostname, result.added, result.removed)
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .batch_diff import ConfigRef, load_snapshot
+from .command_compiler import expand_interface_range
+from .config_store import ConfigStore
+from .config_utils import overwrite_prefix
+from .ios_config import MODE_KEYWORDS, ConfigLine, IOSConfig
+from .line_diff import unified_diff
+
+# Commands that enter a nested block from inside another block.
+NESTED_MODE_KEYWORDS = ("address-family", "class")
+
+Planner = Callable[[str, str], List[str]]
+
+
+def _starts_with(text: str, prefix: str) -> bool:
+    return text == prefix or text.startswith(prefix + " ")
+
+
+def _enters_mode(command: str, keywords: Tuple[str, ...]) -> bool:
+    return any(_starts_with(command, keyword) for keyword in keywords)
+
+
+class _Node:
+    __slots__ = ("text", "children", "removed")
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.children: List["_Node"] = []
+        self.removed = False
+
+    @classmethod
+    def from_line(cls, line: ConfigLine) -> "_Node":
+        node = cls(" ".join(line.text.split()))
+        node.children = [cls.from_line(child) for child in line.children]
+        return node
+
+
+class ConfigModel:
+    """Mutable model of a configuration that configuration commands can be applied to.
+
+    :param config: Configuration text.
+    """
+
+    def __init__(self, config: str) -> None:
+        self.top: List[_Node] = [_Node.from_line(line) for line in IOSConfig(config).top]
+        # Top-level lines by first word and by first two words.
+        self._index: Dict[str, List[_Node]] = {}
+        for node in self.top:
+            self._add_to_index(node)
+
+    def _add_to_index(self, node: _Node) -> None:
+        words = node.text.split(None, 2)
+        self._index.setdefault(words[0], []).append(node)
+        if len(words) > 1:
+            self._index.setdefault(f"{words[0]} {words[1]}", []).append(node)
+
+    def _top_candidates(self, text: str) -> List[_Node]:
+        words = text.split(None, 2)
+        key = f"{words[0]} {words[1]}" if len(words) > 1 else words[0]
+        return [node for node in self._index.get(key, ()) if not node.removed]
+
+    def _top_block(self, text: str) -> _Node:
+        for node in self._top_candidates(text):
+            if node.text == text:
+                return node
+        node = _Node(text)
+        self.top.append(node)
+        self._add_to_index(node)
+        return node
+
+    @staticmethod
+    def _child_block(parent: _Node, text: str) -> _Node:
+        for node in parent.children:
+            if not node.removed and node.text == text:
+                return node
+        node = _Node(text)
+        parent.children.append(node)
+        return node
+
+    def _apply(self, nodes: List[_Node], command: str, parent: Optional[_Node]) -> None:
+        """Apply one command to the live ``nodes`` of a block (or the top level)."""
+        if command.startswith("no "):
+            target = command[3:]
+            matches = [node for node in nodes if node.text == target]
+            if not matches:
+                matches = [node for node in nodes if _starts_with(node.text, target)]
+            for node in matches:
+                node.removed = True
+            if not matches and parent is not None and not any(node.text == command for node in nodes):
+                parent.children.append(_Node(command))
+            return
+        if any(node.text == command for node in nodes):
+            return
+        negated = [node for node in nodes if node.text == "no " + command]
+        if negated:
+            for node in negated:
+                node.removed = True
+            return
+        prefix = overwrite_prefix(command)
+        if prefix is not None:
+            for node in nodes:
+                if overwrite_prefix(node.text) == prefix:
+                    node.text = command
+                    return
+        if parent is None:
+            node = _Node(command)
+            self.top.append(node)
+            self._add_to_index(node)
+        else:
+            parent.children.append(_Node(command))
+
+    def apply(self, commands: Iterable[str]) -> None:
+        """Apply configuration commands as they would be typed in configuration mode."""
+        # Each stack level is the list of blocks the next command applies to.
+        stack: List[List[_Node]] = []
+        for raw in commands:
+            command = " ".join(raw.split())
+            if not command or command.startswith("!"):
+                continue
+            if command == "end":
+                stack = []
+                continue
+            if command == "exit":
+                if stack:
+                    stack.pop()
+                continue
+            target = command[3:] if command.startswith("no ") else command
+            if stack and not _enters_mode(target, MODE_KEYWORDS):
+                if _enters_mode(command, NESTED_MODE_KEYWORDS) and not command.startswith("no "):
+                    stack.append([self._child_block(block, command) for block in stack[-1]])
+                    continue
+                for block in stack[-1]:
+                    self._apply([child for child in block.children if not child.removed], command, block)
+                continue
+            # Global mode; IOS also falls back here for global commands
+            # typed inside a block.
+            stack = []
+            if command.startswith("interface range "):
+                names = expand_interface_range(command[len("interface range "):])
+                stack = [[self._top_block(f"interface {name}") for name in names]]
+            elif _enters_mode(command, MODE_KEYWORDS) and not command.startswith("no "):
+                stack = [[self._top_block(command)]]
+            else:
+                candidates = self._top_candidates(target) + self._top_candidates("no " + target)
+                prefix = overwrite_prefix(target)
+                if prefix is not None:
+                    candidates += self._top_candidates(prefix)
+                unique = list({id(node): node for node in candidates}.values())
+                self._apply(unique, command, None)
+
+    def render(self) -> str:
+        """Return the modelled configuration as indented text."""
+        lines: List[str] = []
+
+        def walk(node: _Node, depth: int) -> None:
+            if node.removed:
+                return
+            lines.append(" " * depth + node.text)
+            for child in node.children:
+                walk(child, depth + 1)
+
+        for node in self.top:
+            walk(node, 0)
+        return "\n".join(lines)
+
+
+@dataclass
+class SimulationResult:
+    """Predicted effect of a push on one device.
+
+    :param commands: Number of commands the script would send.
+    :param added: Lines the push would add to the configuration.
+    :param removed: Lines the push would remove.
+    :param diff: Unified diff of the archived and predicted configuration.
+    :param error: Error raised while planning or simulating, if any.
+    """
+
+    hostname: str
+    commands: int = 0
+    added: int = 0
+    removed: int = 0
+    diff: str = ""
+    error: Optional[str] = None
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.added or self.removed)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the result as a JSON serialisable dictionary."""
+        return asdict(self)
+
+
+def simulate_config(hostname: str, config: str, commands: List[str], context: int = 3) -> SimulationResult:
+    """Apply ``commands`` to ``config`` and diff the prediction."""
+    if not commands:
+        return SimulationResult(hostname)
+    model = ConfigModel(config)
+    before = model.render()
+    model.apply(commands)
+    after = model.render()
+    if after == before:
+        return SimulationResult(hostname, len(commands))
+    diff_lines = list(
+        unified_diff(
+            before.splitlines(),
+            after.splitlines(),
+            f"{hostname} (archived)",
+            f"{hostname} (predicted)",
+            n=context,
+            lineterm="",
+        )
+    )
+    added = sum(1 for line in diff_lines[2:] if line.startswith("+"))
+    removed = sum(1 for line in diff_lines[2:] if line.startswith("-"))
+    return SimulationResult(hostname, len(commands), added, removed, "\n".join(diff_lines))
+
+
+def simulate_device(hostname: str, ref: ConfigRef, planner: Planner, context: int = 3) -> SimulationResult:
+    """Plan and simulate one device; runs in a worker process."""
+    try:
+        config = ref.load()
+        return simulate_config(hostname, config, planner(hostname, config), context)
+    except Exception as exc:
+        return SimulationResult(hostname, error=f"{type(exc).__name__}: {exc}")
+
+
+def _simulate_item(item: Tuple[str, ConfigRef, Planner, int]) -> SimulationResult:
+    return simulate_device(*item)
+
+
+def iter_simulation(
+    snapshot: Dict[str, ConfigRef],
+    planner: Planner,
+    *,
+    workers: Optional[int] = None,
+    context: int = 3,
+) -> Iterator[SimulationResult]:
+    """Simulate ``planner`` on every device of ``snapshot``, in hostname order.
+
+    :param snapshot: Devices from :func:`~na_utils.batch_diff.load_snapshot`.
+    :param planner: Picklable ``planner(hostname, config)`` returning the
+        commands for a device.
+    :param workers: Size of the process pool; defaults to the CPU count.
+        ``1`` simulates in the calling process.
+    :param context: Lines of context in the predicted diffs.
+    """
+    items = [(hostname, snapshot[hostname], planner, context) for hostname in sorted(snapshot)]
+    if workers == 1 or len(items) <= 1:
+        yield from map(_simulate_item, items)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Devices are cheap to simulate; batch them to keep IPC low.
+        chunksize = max(1, min(64, len(items) // ((workers or os.cpu_count() or 1) * 4)))
+        yield from executor.map(_simulate_item, items, chunksize=chunksize)
+
+
+def format_simulation_summary(results: List[SimulationResult]) -> str:
+    """Return a plain text fleet summary with a row per changed or failed device."""
+    rows = [result for result in results if result.changed or result.error]
+    lines: List[str] = []
+    if rows:
+        width = max(len("Device"), *(len(result.hostname) for result in rows))
+        lines.append(f"{'Device':<{width}}  {'Commands':>8}  {'Added':>7}  {'Removed':>7}")
+        lines.append("-" * len(lines[0]))
+        for result in rows:
+            if result.error:
+                lines.append(f"{result.hostname:<{width}}  error: {result.error}")
+            else:
+                lines.append(
+                    f"{result.hostname:<{width}}  {result.commands:>8}  {result.added:>7}  {result.removed:>7}"
+                )
+    changed = sum(result.changed for result in results)
+    errors = sum(bool(result.error) for result in results)
+    lines.append(
+        f"{len(results)} device(s) simulated: {changed} would change, "
+        f"{len(results) - changed - errors} unchanged, {errors} error(s); "
+        f"{sum(result.commands for result in results)} command(s) in total"
+    )
+    return "\n".join(lines)
+
+
+def add_simulation_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add ``--simulate`` and its report options to a push script's parser."""
+    group = parser.add_argument_group("simulation")
+    group.add_argument(
+        "--simulate",
+        metavar="SNAPSHOT",
+        help=(
+            "Predict the changes on archived configurations instead of connecting: a directory of "
+            "<hostname>.conf files, or a date/timestamp/'latest' in the archive (CONFIG_ARCHIVE_DIR)"
+        ),
+    )
+    group.add_argument("--simulate-json", metavar="PATH", help="Write the simulation report as JSON")
+    group.add_argument("--simulate-diffs", metavar="PATH", help="Write predicted diffs to this file ('-' for stdout)")
+    group.add_argument(
+        "--simulate-workers", type=int, default=None, help="Simulation worker processes (default: CPU count)"
+    )
+
+
+def run_simulation(
+    args: argparse.Namespace, planner: Planner, *, select: Optional[Callable[[str], bool]] = None
+) -> List[SimulationResult]:
+    """Run a push script in simulation mode from its parsed arguments.
+
+    Prints the fleet summary and writes the optional reports.
+
+    :param args: Arguments parsed with :func:`add_simulation_arguments`.
+        ``args.archive`` (or ``CONFIG_ARCHIVE_DIR``) resolves dates.
+    :param planner: ``planner(hostname, config)`` returning the commands
+        the script would send.
+    :param select: Optional hostname filter, e.g. the script's
+        ``--pattern``.
+    :returns: The results in hostname order.
+    :raises ValueError: If the snapshot cannot be resolved.
+    """
+    archive = getattr(args, "archive", None) or os.getenv("CONFIG_ARCHIVE_DIR")
+    snapshot = load_snapshot(args.simulate, store=ConfigStore(archive) if archive else None)
+    if select is not None:
+        snapshot = {hostname: ref for hostname, ref in snapshot.items() if select(hostname)}
+    results = list(iter_simulation(snapshot, planner, workers=args.simulate_workers))
+    if args.simulate_diffs:
+        out = sys.stdout if args.simulate_diffs == "-" else open(args.simulate_diffs, "w", encoding="utf-8")
+        try:
+            for result in results:
+                if result.diff:
+                    out.write(result.diff + "\n")
+        finally:
+            if out is not sys.stdout:
+                out.close()
+    if args.simulate_json:
+        report = {
+            "snapshot": args.simulate,
+            "devices": [result.to_dict() for result in results],
+            "summary": {
+                "devices": len(results),
+                "changed": sum(result.changed for result in results),
+                "errors": sum(bool(result.error) for result in results),
+                "commands": sum(result.commands for result in results),
+            },
+        }
+        with open(args.simulate_json, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+    print(format_simulation_summary(results))
+    return results
@@ -0,0 +1,266 @@
+"""Transactional configuration changes with verification and rollback.
+
+:func:`run_transaction` applies one batch of configuration commands to
+a device over an open Netmiko connection as a unit:
+
+1. **Snapshot.**  The running configuration is copied to the device's
+   flash (:data:`SNAPSHOT_PATH`), and the sections the batch touches
+   (see :func:`touched_sections`) are captured with one
+   ``show running-config | section`` command.  If the copy fails, the
+   captured sections alone serve as the snapshot.
+2. **Apply.**  The commands are sent, followed by any commands that ask
+   for confirmation, which are answered from :data:`CONFIRM_ANSWERS`.
+3. **Verify.**  Only the touched sections are read again.  By default
+   every global ``no X`` must have removed the line ``X`` and every other
+   global command must now be configured; a custom ``verify`` callback
+   can be supplied.
+4. **Commit or roll back.**  On success the configuration is saved.  If
+   applying or verifying fails, the snapshot is restored with
+   ``configure replace``.  With a captured
+   snapshot, the commands that turn the touched sections back into the
+   captured ones are sent instead (see
+   :meth:`~na_utils.config_utils.StructuredDiff.remediation`).  A
+   :class:`TransactionError` is raised either way.  The flash snapshot
+   is deleted in every case once the device is committed or rolled
+   back.
+
+Each device's transaction runs on one connection, so it fits in a
+:func:`~na_utils.net_device.iter_on_devices` task.
+
+Usage example:
+
+    >>> with pool.session(host) as conn:
+    ...     result = run_transaction(conn, commands, confirm_commands=["no voice register global"])
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, List, Optional, Sequence, Tuple
+
+from .config_utils import diff_config_text
+from .ios_config import MODE_KEYWORDS, IOSConfig
+from .net_device import send_config_commands
+
+# Device file the running configuration is copied to before a change.
+SNAPSHOT_PATH = "flash:na-rollback.cfg"
+# Prompts answered while running confirmation commands, in order.
+CONFIRM_ANSWERS: Tuple[Tuple[str, str], ...] = (
+    ("yes/no", "yes"),
+    ("Destination filename", ""),
+    ("Over write", ""),
+    ("[confirm]", ""),
+)
+# Seconds allowed for reading sections, copying and replacing configs.
+READ_TIMEOUT = 120.0
+
+Verifier = Callable[[List[str], str], List[str]]
+
+
+@dataclass
+class TransactionResult:
+    """Outcome of :func:`run_transaction` on one device.
+
+    :param output: Device output of the apply step.
+    :param snapshot: :data:`SNAPSHOT_PATH` or ``capture`` when only the
+        touched sections were captured.
+    :param before: Touched sections before the change.
+    :param after: Touched sections after the change.
+    :param problems: Verification failures.
+    :param rolled_back: ``True`` if the change was rolled back.
+    :param restored: ``True`` if, after a rollback, the touched sections
+        matched the snapshot again.
+    """
+
+    output: str = ""
+    snapshot: str = ""
+    before: str = ""
+    after: str = ""
+    problems: List[str] = field(default_factory=list)
+    rolled_back: bool = False
+    restored: bool = False
+
+
+class TransactionError(RuntimeError):
+    """Raised when a transaction failed; ``result`` tells whether it was rolled back."""
+
+    def __init__(self, message: str, result: TransactionResult) -> None:
+        super().__init__(message)
+        self.result = result
+
+
+def _starts_with(text: str, prefix: str) -> bool:
+    return text == prefix or text.startswith(prefix + " ")
+
+
+def _global_commands(commands: Iterable[str]) -> List[str]:
+    """Return the commands typed in global mode (block headers included)."""
+    result: List[str] = []
+    in_block = False
+    for raw in commands:
+        command = " ".join(raw.split())
+        if not command or command.startswith("!"):
+            continue
+        if command in ("exit", "end"):
+            in_block = False
+            continue
+        target = command[3:] if command.startswith("no ") else command
+        entering = any(_starts_with(target, keyword) for keyword in MODE_KEYWORDS)
+        if in_block and not entering:
+            continue
+        result.append(command)
+        in_block = entering and not command.startswith("no ")
+    return result
+
+
+def touched_sections(commands: Iterable[str]) -> List[str]:
+    """Return the section keywords (up to two words) a batch of commands touches.
+
+    A keyword that extends another one (``mgcp call-agent`` after
+    ``mgcp``) is dropped, since its section is already covered.
+    """
+    keywords: List[str] = []
+    for command in _global_commands(commands):
+        target = command[3:] if command.startswith("no ") else command
+        if target.startswith("interface range "):
+            keywords.append("interface")
+            continue
+        keyword = " ".join(target.split()[:2])
+        if keyword not in keywords:
+            keywords.append(keyword)
+    return [kw for kw in keywords if not any(other != kw and _starts_with(kw, other) for other in keywords)]
+
+
+def read_sections(conn: Any, keywords: Sequence[str]) -> str:
+    """Return the running configuration sections starting with ``keywords``."""
+    if not keywords:
+        return ""
+    pattern = "|".join(f"^{keyword}" for keyword in keywords)
+    return conn.send_command(f"show running-config | section {pattern}", read_timeout=READ_TIMEOUT)
+
+
+def send_confirmed(conn: Any, command: str, answers: Sequence[Tuple[str, str]] = CONFIRM_ANSWERS) -> str:
+    """Send ``command`` and answer the confirmation prompts it raises."""
+    output = response = conn.send_command_timing(command, read_timeout=READ_TIMEOUT)
+    for _ in range(len(answers) + 1):
+        lines = response.rstrip().splitlines()
+        last = lines[-1] if lines else ""
+        reply = next((answer for prompt, answer in answers if prompt in last), None)
+        if reply is None:
+            break
+        response = conn.send_command_timing(reply, read_timeout=READ_TIMEOUT)
+        output += response
+    return output
+
+
+def verify_commands(commands: List[str], after: str) -> List[str]:
+    """Default verifier: check the global commands against the re-read sections.
+
+    The line removed by each global ``no X`` must be gone and every
+    other global command must be present, both compared exactly.
+
+    :returns: A list of problems; empty if the change took effect.
+    """
+    configured = {" ".join(line.text.split()) for line in IOSConfig(after).top}
+    problems: List[str] = []
+    for command in _global_commands(commands):
+        if command.startswith("interface range "):
+            continue
+        if command.startswith("no "):
+            if command[3:] in configured:
+                problems.append(f"'{command[3:]}' is still configured")
+        elif command not in configured:
+            problems.append(f"'{command}' is not configured")
+    return problems
+
+
+def _take_snapshot(conn: Any) -> str:
+    try:
+        output = send_confirmed(conn, f"copy running-config {SNAPSHOT_PATH}")
+    except Exception:
+        return "capture"
+    # Errors such as "%Error opening flash:..." mean there is no file.
+    return "capture" if "%" in output else SNAPSHOT_PATH
+
+
+def _delete_snapshot(conn: Any) -> None:
+    try:
+        send_confirmed(conn, f"delete /force {SNAPSHOT_PATH}")
+    except Exception:
+        # A leftover file is overwritten by the next snapshot.
+        pass
+
+
+def _roll_back(conn: Any, result: TransactionResult, keywords: List[str]) -> None:
+    if result.snapshot == SNAPSHOT_PATH:
+        output = conn.send_command_timing(f"configure replace {SNAPSHOT_PATH} force", read_timeout=READ_TIMEOUT)
+        if "Rollback Done" not in output:
+            lines = output.strip().splitlines()
+            raise RuntimeError(f"configure replace failed: {lines[-1] if lines else 'no output'}")
+    else:
+        current = read_sections(conn, keywords)
+        commands = diff_config_text(current, result.before).remediation()
+        if commands:
+            send_config_commands(conn, commands)
+    result.rolled_back = True
+    restored = read_sections(conn, keywords)
+    result.restored = not diff_config_text(restored, result.before)
+
+
+def run_transaction(
+    conn: Any,
+    commands: List[str],
+    *,
+    confirm_commands: Sequence[str] = (),
+    verify: Optional[Verifier] = None,
+    save: bool = True,
+    snapshot: bool = True,
+) -> TransactionResult:
+    """Apply ``commands`` to a device as one verified, reversible change.
+
+    :param conn: Open Netmiko connection in privileged mode.
+    :param commands: Configuration commands for
+        :func:`~na_utils.net_device.send_config_commands`.
+    :param confirm_commands: Configuration commands that ask for
+        confirmation, sent after ``commands``.
+    :param verify: ``verify(commands, sections)`` returning a list of
+        problems; defaults to :func:`verify_commands`.
+    :param save: Save the configuration after a verified change.
+    :param snapshot: Copy the running configuration to flash first.
+        Without it only the touched sections are captured.
+    :returns: A :class:`TransactionResult`.
+    :raises TransactionError: If applying or verifying failed; the change
+        was rolled back (see ``result.rolled_back``).
+    """
+    everything = list(commands) + list(confirm_commands)
+    keywords = touched_sections(everything)
+    result = TransactionResult()
+    result.snapshot = _take_snapshot(conn) if snapshot else "capture"
+    try:
+        result.before = read_sections(conn, keywords)
+        try:
+            if commands:
+                result.output = send_config_commands(conn, commands)
+            if confirm_commands:
+                output = conn.send_command_timing("configure terminal")
+                for command in confirm_commands:
+                    output += send_confirmed(conn, command)
+                output += conn.send_command_timing("end")
+                result.output += ("\n" if result.output else "") + output
+            result.after = read_sections(conn, keywords)
+            result.problems = (verify or verify_commands)(everything, result.after)
+            if result.problems:
+                raise RuntimeError("verification failed: " + "; ".join(result.problems))
+        except Exception as exc:
+            try:
+                _roll_back(conn, result, keywords)
+            except Exception as rollback_exc:
+                raise TransactionError(f"{exc}; rollback failed: {rollback_exc}", result) from exc
+            state = "restored" if result.restored else "rolled back, but the sections differ from the snapshot"
+            raise TransactionError(f"{exc}; {state}", result) from exc
+        if save:
+            result.output += "\n" + conn.send_command("write memory", read_timeout=READ_TIMEOUT)
+    finally:
+        if result.snapshot == SNAPSHOT_PATH:
+            _delete_snapshot(conn)
+    return result
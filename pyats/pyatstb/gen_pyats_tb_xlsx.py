@@ -5,7 +5,8 @@ generates an Excel file listing attributes used by pyATS, such as
 hostname, management IP, protocol and operating system.  It relies on
 environment variables for authentication; see the root ``.env.template``
 for details.  The output directory defaults to ``pyats/pyatstb`` but
-can be overridden via ``--output``.
+can be overridden via ``--output``.  ``--refresh``/``--no-cache``
+bypass the shared Catalyst Center response cache.
 """
 
 from __future__ import annotations
@@ -17,7 +18,7 @@ from typing import Any, Dict, List
 
 import pandas as pd
 
-from na_utils.dnac import get_device_list
+from na_utils.dnac import add_cache_arguments, apply_cache_arguments, get_device_list
 
 
 def filter_devices(device_json: Dict[str, Any]) -> List[Dict[str, str]]:
@@ -60,8 +61,10 @@ def main() -> None:
         help="Path to the output Excel file",
         default=str(Path(__file__).resolve().parent / "pyats_tb.xlsx"),
     )
+    add_cache_arguments(parser)
     args = parser.parse_args()
-    devices_json = get_device_list()
+    apply_cache_arguments(args)
+    devices_json = get_device_list(as_models=True)
     rows = filter_devices(devices_json)
     df = pd.DataFrame(rows)
     out_path = Path(args.output)
@@ -13,6 +13,7 @@ Example::
     python generate_testbed.py --output my_testbed.yaml
 
 If ``--output`` is omitted the default file name is ``generated_testbed.yaml``.
+Use ``--refresh`` or ``--no-cache`` to bypass a cached device list.
 """
 
 from __future__ import annotations
@@ -32,7 +33,7 @@ PROJECT_ROOT = Path(__file__).resolve().parents[3]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from na_utils.dnac import get_device_list, to_pyats_testbed
+from na_utils.dnac import add_cache_arguments, apply_cache_arguments, get_device_list, to_pyats_testbed
 
 
 def main() -> None:
@@ -47,9 +48,11 @@ def main() -> None:
         help="Optional name for the testbed",
         default="generated_testbed",
     )
+    add_cache_arguments(parser)
     args = parser.parse_args()
+    apply_cache_arguments(args)
     # Fetch devices from Catalyst Center
-    devices = get_device_list()
+    devices = get_device_list(as_models=True)
     testbed_dict: Dict[str, Any] = to_pyats_testbed(devices, testbed_name=args.name)
     # Determine output path under testbeds/
     base_dir = Path(__file__).resolve().parent.parent / "testbeds"
@@ -0,0 +1,112 @@
+"""Benchmark the fast line diff against ``difflib`` on synthetic configs.
+
+Generates switch style configurations of the requested sizes (many
+near-identical ``interface`` blocks, so lines such as `` shutdown`` and
+`` switchport mode access`` repeat thousands of times), applies random
+edits to a copy and times :func:`difflib.unified_diff` against
+:func:`na_utils.line_diff.unified_diff` on each pair.  Every fast diff
+is checked to rebuild the edited configuration and to be no larger
+than the ``difflib`` one.
+
+Example::
+
+    python benchmark_config_diff.py --sizes 10000 50000 100000 --edits 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import difflib
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Iterable, List, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from na_utils.line_diff import unified_diff
+
+DEFAULT_SIZES = (10000, 25000, 50000, 100000)
+
+
+def synthetic_config(size: int, rng: random.Random) -> List[str]:
+    """Return a configuration of roughly ``size`` lines."""
+    lines = ["hostname bench-sw01", "!", "vlan 10", " name users", "!"]
+    port = 0
+    while len(lines) < size:
+        port += 1
+        stack, member = divmod(port - 1, 48)
+        lines.append(f"interface GigabitEthernet{stack + 1}/0/{member + 1}")
+        lines.append(" switchport access vlan 10")
+        lines.append(" switchport mode access")
+        if rng.random() < 0.3:
+            lines.append(" shutdown")
+        lines.append(" spanning-tree portfast")
+        lines.append("!")
+    return [line + "\n" for line in lines[:size]]
+
+
+def mutate(config: List[str], edits: int, rng: random.Random) -> List[str]:
+    """Return a copy of ``config`` with ``edits`` random line edits."""
+    lines = list(config)
+    for _ in range(edits):
+        index = rng.randrange(len(lines))
+        action = rng.random()
+        if action < 0.4:
+            lines[index] = f" description changed {rng.randrange(10**6)}\n"
+        elif action < 0.7:
+            del lines[index]
+        else:
+            lines.insert(index, rng.choice([" shutdown\n", "!\n", f" switchport access vlan {rng.randrange(4094)}\n"]))
+    return lines
+
+
+def _time(func: Callable[[], List[str]], repeat: int) -> Tuple[float, List[str]]:
+    best = float("inf")
+    result: List[str] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def _rebuild(diff: Iterable[str]) -> List[str]:
+    # With unlimited context the diff holds the whole new file.
+    return [line[1:] for line in list(diff)[2:] if line[:1] in (" ", "+")]
+
+
+def _changed(diff: List[str]) -> int:
+    return sum(1 for line in diff[2:] if line[:1] in ("+", "-"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark difflib against the fast line diff")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="Config sizes in lines")
+    parser.add_argument("--edits", type=int, default=100, help="Random edits applied to each config (default 100)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement; the best is reported")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'Lines':>8}  {'Edits':>6}  {'difflib (s)':>11}  {'fast (s)':>9}  {'Speedup':>8}  {'Changed lines':>16}")
+    for size in args.sizes:
+        old = synthetic_config(size, rng)
+        new = mutate(old, args.edits, rng)
+        slow_time, slow = _time(lambda: list(difflib.unified_diff(old, new, "old", "new")), args.repeat)
+        fast_time, fast = _time(lambda: list(unified_diff(old, new, "old", "new")), args.repeat)
+        if _rebuild(unified_diff(old, new, n=len(old) + len(new))) != new:
+            raise RuntimeError(f"fast diff does not rebuild the {size} line config")
+        if _changed(fast) > _changed(slow):
+            raise RuntimeError(f"fast diff is larger than difflib's for the {size} line config")
+        print(
+            f"{size:>8}  {args.edits:>6}  {slow_time:>11.3f}  {fast_time:>9.3f}  "
+            f"{slow_time / fast_time:>7.1f}x  {_changed(fast):>7} / {_changed(slow):<7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,8 @@ This script wraps :func:`na_utils.config_utils.compare_configs` to
 provide a convenient command‑line interface for comparing network
 configurations.  It supports writing the diff to a file or printing
 to stdout.  The underlying comparison uses a unified diff from the
-standard library.
+standard library; ``--fast`` switches to the much faster
+:mod:`na_utils.line_diff` for large configurations.
 
 Usage example::
 
@@ -27,9 +28,14 @@ def main() -> None:
     parser.add_argument("file1", help="Path to the first configuration file")
     parser.add_argument("file2", help="Path to the second configuration file")
     parser.add_argument("--output", "-o", help="Optional file to write diff to", default=None)
+    parser.add_argument(
+        "--fast",
+        action="store_true",
+        help="Use the fast line diff; hunks may differ from difflib's on ambiguous edits",
+    )
     args = parser.parse_args()
 
-    diff_result = compare_configs(args.file1, args.file2, args.output)
+    diff_result = compare_configs(args.file1, args.file2, args.output, fast=args.fast)
     if diff_result is not None:
         print(diff_result)
 
@@ -0,0 +1,107 @@
+"""Compare two fleet-wide configuration snapshots in one run.
+
+Each snapshot is either a directory of ``<hostname>.conf`` files (as
+written by ``get_device_config_v2.py``) or, with ``--archive``, a date,
+timestamp or ``latest`` in the configuration archive.  Devices whose
+configuration did not change are skipped by hash; the rest are diffed
+in parallel worker processes.
+
+The combined report is streamed as devices finish: ``--json`` writes a
+JSON document with one entry per changed device and ``--unified``
+writes all unified diffs to one text file (``-`` for stdout).  A
+summary table with per-device added and removed line counts is printed
+at the end.
+
+Examples::
+
+    python config_diff_batch.py configs_2026-01-30 configs_2026-01-31 --unified -
+    python config_diff_batch.py 2026-01-30 latest --archive /backups/archive --json changes.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+from typing import List, Optional, TextIO
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from na_utils.batch_diff import DeviceDiff, format_summary, iter_batch_diff, load_snapshot
+from na_utils.config_store import ConfigStore
+
+
+def _open_output(path: Optional[str]) -> Optional[TextIO]:
+    if not path:
+        return None
+    if path == "-":
+        return sys.stdout
+    return open(path, "w", encoding="utf-8")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Diff every device between two configuration snapshots")
+    parser.add_argument("old", help="Earlier snapshot: directory, or date/timestamp with --archive")
+    parser.add_argument("new", help="Later snapshot: directory, or date/timestamp/'latest' with --archive")
+    parser.add_argument(
+        "--archive",
+        default=os.getenv("CONFIG_ARCHIVE_DIR"),
+        help="Configuration archive for date/timestamp snapshots (env CONFIG_ARCHIVE_DIR)",
+    )
+    parser.add_argument("--json", dest="json_path", help="Write the report as JSON to this file")
+    parser.add_argument("--unified", help="Write all unified diffs to this file ('-' for stdout)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--context", type=int, default=3, help="Context lines in unified diffs (default 3)")
+    parser.add_argument(
+        "--fast",
+        action="store_true",
+        help="Use the fast line diff; hunks may differ from difflib's on ambiguous edits",
+    )
+    args = parser.parse_args()
+
+    store = ConfigStore(args.archive) if args.archive else None
+    try:
+        old = load_snapshot(args.old, store=store)
+        new = load_snapshot(args.new, store=store)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    json_out = _open_output(args.json_path)
+    unified_out = _open_output(args.unified)
+    results: List[DeviceDiff] = []
+    try:
+        if json_out:
+            json_out.write(json.dumps({"old": args.old, "new": args.new})[:-1] + ', "devices": [\n')
+        for result in iter_batch_diff(old, new, workers=args.workers, context=args.context, fast=args.fast):
+            if json_out:
+                json_out.write((",\n" if results else "") + json.dumps(result.to_dict()))
+            if unified_out and result.diff:
+                unified_out.write(result.diff + "\n")
+            # Keep only the counts for the summary table.
+            results.append(DeviceDiff(result.hostname, result.status, result.added, result.removed))
+        if json_out:
+            summary = {
+                "devices_old": len(old),
+                "devices_new": len(new),
+                "changed": sum(r.status == "changed" for r in results),
+                "added": sum(r.status == "added" for r in results),
+                "removed": sum(r.status == "removed" for r in results),
+            }
+            json_out.write('\n], "summary": ' + json.dumps(summary) + "}\n")
+    finally:
+        for out in (json_out, unified_out):
+            if out is not None and out is not sys.stdout:
+                out.close()
+
+    unchanged = len(set(old) | set(new)) - len(results)
+    if results:
+        print(format_summary(results))
+    print(f"{len(results)} device(s) differ, {unchanged} unchanged")
+
+
+if __name__ == "__main__":
+    main()
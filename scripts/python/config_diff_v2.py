@@ -1,21 +1,36 @@
-"""Structured configuration diff using ciscoconfparse2.
+"""Structured configuration diff.
 
-This script compares two configuration files using the
-``ciscoconfparse2`` library which understands Cisco configuration
-syntax and can produce a more intuitive diff than a line‑by‑line
-comparison.  It falls back to the unified diff implementation if
-``ciscoconfparse2`` is not installed.
+This script compares two configuration files with a diff that
+understands Cisco configuration syntax: blocks such as ``interface``
+or ``router bgp`` are matched by their header line and their children
+are compared within the block, so reordered blocks are not reported as
+changes and every change is shown in its parent context.
+
+The built-in engine (:func:`na_utils.config_utils.diff_config_text`)
+needs no third-party libraries.  ``--engine ciscoconfparse2`` uses the
+``ciscoconfparse2`` library instead and falls back to the unified diff
+implementation if it is not installed.
 
 Example::
 
     python config_diff_v2.py config_a.conf config_b.conf
+    python config_diff_v2.py running.conf intended.conf --remediation
 
 The diff is printed to stdout.  To save to a file pass ``--output``.
+``--remediation`` prints the configuration commands that turn the
+first file into the second instead of the diff.
 """
 
 from __future__ import annotations
 
 import argparse
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
 from na_utils.config_utils import compare_configs_structured, compare_configs
 
 
@@ -24,15 +39,35 @@ def main() -> None:
     parser.add_argument("file1", help="First configuration file")
     parser.add_argument("file2", help="Second configuration file")
     parser.add_argument("--output", "-o", help="Write diff to this file", default=None)
+    parser.add_argument(
+        "--engine",
+        choices=("builtin", "ciscoconfparse2"),
+        default="builtin",
+        help="Diff engine (default: builtin)",
+    )
+    parser.add_argument(
+        "--remediation",
+        action="store_true",
+        help="Print the commands that turn file1 into file2 (builtin engine only)",
+    )
+    parser.add_argument(
+        "--fast",
+        action="store_true",
+        help="Use the fast line diff for the unified fallback; hunks may differ from difflib's on ambiguous edits",
+    )
     args = parser.parse_args()
+    if args.remediation and args.engine != "builtin":
+        parser.error("--remediation requires the builtin engine")
     try:
-        diff = compare_configs_structured(args.file1, args.file2, args.output)
+        diff = compare_configs_structured(
+            args.file1, args.file2, args.output, engine=args.engine, remediation=args.remediation
+        )
     except RuntimeError:
-        # Fall back to unified diff if structured diff unavailable
-        diff = compare_configs(args.file1, args.file2, args.output)
+        # Fall back to unified diff if ciscoconfparse2 is unavailable
+        diff = compare_configs(args.file1, args.file2, args.output, fast=args.fast)
     if diff is not None:
         print(diff)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -31,6 +31,37 @@ To specify a YAML file containing a list of hosts::
 
 The YAML file should contain a top‑level ``hosts`` list with either
 ``hostname`` or ``ip`` keys.
+
+Routers are configured concurrently; ``--workers`` sets how many at a
+time and ``--max-failures`` aborts the rollout after repeated errors::
+
+    python dco_config_push.py --from-dnac --workers 20 --max-failures 5
+
+Devices discovered from Catalyst Center may come from the shared
+response cache; add ``--refresh`` to force a fresh download.
+
+With ``--archive DIR`` (or ``CONFIG_ARCHIVE_DIR``) each router's
+command set is planned against its last archived configuration with
+:func:`na_utils.change_plan.plan_removals`: only ``no`` commands whose
+target is configured are sent, in dependency order, and routers with
+nothing to remove are skipped without connecting.  Routers missing from
+the archive get the full command set.
+
+Each router is changed as a transaction
+(:func:`na_utils.transaction.run_transaction`).  The running
+configuration is first copied to flash (or, with
+``--no-flash-snapshot``, only the touched sections are captured).
+The commands are applied and the touched sections are read back to
+verify them.  The configuration is saved only if the change verified;
+otherwise the router is rolled back to the snapshot and reported as
+failed.
+
+``--simulate SNAPSHOT`` predicts the result without connecting: the
+planned commands are applied to a model of every router's archived
+configuration (a directory of ``.conf`` files, or a date/``latest``
+with ``--archive``) and the predicted diffs are summarised::
+
+    python dco_config_push.py --simulate latest --archive /backups/archive --simulate-diffs -
 """
 
 from __future__ import annotations
@@ -38,7 +69,7 @@ from __future__ import annotations
 import argparse
 import os
 import sys
-from typing import Iterable, List, Dict, Any
+from typing import Iterable, List, Dict, Any, Optional, Tuple
 
 import yaml
 
@@ -53,8 +84,17 @@ PROJECT_ROOT = Path(__file__).resolve().parents[2]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from na_utils.net_device import connect_device, send_config_commands
-from na_utils.dnac import get_device_list
+from na_utils.change_plan import plan_removals
+from na_utils.config_store import ConfigStore
+from na_utils.net_device import (
+    ConnectionPool,
+    add_worker_arguments,
+    iter_on_devices,
+    worker_options,
+)
+from na_utils.dnac import add_cache_arguments, apply_cache_arguments, get_device_list
+from na_utils.simulate import add_simulation_arguments, run_simulation
+from na_utils.transaction import run_transaction
 
 
 # Commands to run on the routers.  These were extracted from the
@@ -138,12 +178,16 @@ def load_hosts_from_yaml(path: str) -> List[str]:
     return hosts
 
 
-def load_hosts_from_dnac() -> List[str]:
+def load_hosts_from_dnac(names: Optional[Dict[str, str]] = None) -> List[str]:
     """Retrieve router hostnames from Catalyst Center.
 
     Uses :func:`na_utils.dnac.get_device_list` with the family
-    'Routers' to limit to router devices.  Returns the hostname for
-    each router.
+    'Routers' to limit to router devices.  The family filter is applied
+    by Catalyst Center, so other devices are never downloaded.  Returns
+    the hostname for each router.
+
+    :param names: Optional mapping filled with the hostname of each
+        returned management address, for archive lookups.
     """
     devices = get_device_list(family="Routers")
     hosts: List[str] = []
@@ -151,34 +195,68 @@ def load_hosts_from_dnac() -> List[str]:
         host = dev.get("managementIpAddress") or dev.get("hostname")
         if host:
             hosts.append(host)
+            if names is not None and dev.get("hostname"):
+                names[host] = dev["hostname"]
     return hosts
 
 
-def connect_and_run(host: str) -> None:
-    """Connect to a single device and apply the command set.
+def plan_host(host: str, store: Optional[ConfigStore], names: Dict[str, str]) -> Tuple[List[str], bool, str]:
+    """Plan the commands for one router.
 
-    Handles the special command requiring confirmation via send_command_timing.
+    :returns: The standard commands to send, whether the confirmation
+        command :data:`CMD_SPECIAL` is needed, and a note on how the
+        plan was made.
     """
-    from netmiko import BaseConnection
-    conn = connect_device(host)
-    if not conn:
-        return
-    try:
-        # Send standard commands
-        output = send_config_commands(conn, CMD_LIST)
-        print(output)
-        # Handle special command that prompts for confirmation
-        # Use send_command_timing to interactively send 'yes'
-        output = conn.send_command_timing("conf t")
-        output += conn.send_command_timing(CMD_SPECIAL)
-        if "yes/no" in output.lower():
-            output += conn.send_command_timing("yes")
-        output += conn.send_command_timing("end")
-        print(output)
-        # Save configuration
-        print(conn.send_command("write memory"))
-    finally:
-        conn.disconnect()
+    config = store.get_config(names.get(host, host)) if store is not None else None
+    if store is not None and config is None:
+        note = "not in the archive, sending the full command set"
+    else:
+        note = "planned from the archived configuration" if store is not None else ""
+    plan = plan_removals(CMD_LIST + [CMD_SPECIAL], config)
+    commands = [command for command in plan.commands if command != CMD_SPECIAL]
+    return commands, CMD_SPECIAL in plan.commands, note
+
+
+def plan_device(hostname: str, config: str) -> List[str]:
+    """Return the commands planned for a router, :data:`CMD_SPECIAL` included.
+
+    Used by ``--simulate``.
+    """
+    return plan_removals(CMD_LIST + [CMD_SPECIAL], config).commands
+
+
+def connect_and_run(
+    host: str,
+    pool: ConnectionPool,
+    commands: Optional[List[str]] = None,
+    special: bool = True,
+    snapshot: bool = True,
+) -> str:
+    """Apply the command set to a single device as a transaction.
+
+    The standard commands are sent with
+    :func:`na_utils.net_device.send_config_commands` and the special
+    command's yes/no prompt is answered, after a snapshot; the touched
+    sections are then verified and the configuration saved, or the
+    device is rolled back (see :func:`na_utils.transaction.run_transaction`).
+    The whole transaction uses the device's session from ``pool``.
+    Runs in a worker thread, so the device output is returned rather
+    than printed.
+
+    :param commands: Standard commands to send; defaults to :data:`CMD_LIST`.
+    :param special: Whether to send :data:`CMD_SPECIAL`.
+    :param snapshot: Copy the running configuration to flash first.
+    :returns: The combined device output.
+    :raises RuntimeError: If the SSH connection cannot be established.
+    :raises na_utils.transaction.TransactionError: If the change failed
+        or did not verify and was rolled back.
+    """
+    commands = CMD_LIST if commands is None else commands
+    with pool.session(host) as conn:
+        result = run_transaction(
+            conn, commands, confirm_commands=[CMD_SPECIAL] if special else [], snapshot=snapshot
+        )
+    return result.output
 
 
 def main() -> None:
@@ -198,21 +276,67 @@ def main() -> None:
         action="store_true",
         help="Discover router hosts from Catalyst Center",
     )
+    parser.add_argument(
+        "--archive",
+        default=os.getenv("CONFIG_ARCHIVE_DIR"),
+        help="Plan commands against archived configurations in this directory (env CONFIG_ARCHIVE_DIR)",
+    )
+    parser.add_argument(
+        "--no-flash-snapshot",
+        dest="flash_snapshot",
+        action="store_false",
+        help="Capture only the touched sections for rollback instead of copying the config to flash",
+    )
+    add_cache_arguments(parser)
+    add_worker_arguments(parser, grouping=False)
+    add_simulation_arguments(parser)
     args = parser.parse_args()
+    apply_cache_arguments(args)
+    names: Dict[str, str] = {}
     hosts: List[str] = []
     if args.hosts:
         hosts.extend([h.strip() for h in args.hosts.split(",") if h.strip()])
     if args.testbed:
         hosts.extend(load_hosts_from_yaml(args.testbed))
+    if args.simulate:
+        # Offline: simulate the named hosts, or every archived router.
+        selected = set(hosts)
+        try:
+            run_simulation(args, plan_device, select=(selected.__contains__ if selected else None))
+        except ValueError as exc:
+            parser.error(str(exc))
+        return
     if args.from_dnac or not hosts:
         # If --from-dnac specified or no hosts provided, query DNAC
-        hosts.extend(load_hosts_from_dnac())
+        hosts.extend(load_hosts_from_dnac(names))
     if not hosts:
         print("No hosts to configure.  Provide --hosts, --testbed or --from-dnac", file=sys.stderr)
         sys.exit(1)
+    store = ConfigStore(args.archive) if args.archive else None
+    plans: Dict[str, Tuple[List[str], bool, str]] = {}
     for host in hosts:
-        print(f"Configuring {host}")
-        connect_and_run(host)
+        commands, special, note = plan_host(host, store, names)
+        if not commands and not special:
+            print(f"{host}: nothing to remove in the archived configuration, skipped")
+            continue
+        if note:
+            print(f"{host}: {len(commands) + special} command(s), {note}")
+        plans[host] = (commands, special, note)
+    if not plans:
+        print("Configuration complete; no host needed changes")
+        return
+    print(f"Configuring {len(plans)} host(s) with {args.workers} worker(s)")
+    failed: List[str] = []
+    with ConnectionPool(max_sessions=max(1, args.workers)) as pool:
+        task = lambda host: connect_and_run(host, pool, *plans[host][:2], snapshot=args.flash_snapshot)  # noqa: E731
+        for result in iter_on_devices(list(plans), task, **worker_options(args)):
+            if result.ok:
+                print(result.result)
+            else:
+                failed.append(result.name)
+    if failed:
+        print(f"Configuration failed or skipped on {len(failed)} host(s): {', '.join(failed)}", file=sys.stderr)
+        sys.exit(1)
     print("Configuration complete")
 
 
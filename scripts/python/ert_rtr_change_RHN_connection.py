@@ -19,7 +19,12 @@ Usage example::
 
     python ert_rtr_change_RHN_connection.py \
         --pattern ERT \
-        --tracker ert_rtr_change_tracker.csv
+        --tracker ert_rtr_change_tracker.csv \
+        --workers 20 --max-failures 5
+
+Routers are updated concurrently (``--workers``, default 8).  Use
+``--max-failures`` to stop the rollout early if devices keep failing
+and ``--group-limit`` to cap concurrent changes per site.
 
 You can override the list of configuration commands by specifying
 ``--commands-file`` pointing to a plain text file with one command per
@@ -27,6 +32,18 @@ line.  By default a reasonable set of ``no`` commands are used to
 disable MGCP, remove call manager fallback, dial peers and other
 voice‑related features.
 
+With ``--archive DIR`` (or ``CONFIG_ARCHIVE_DIR``) the commands, which
+must all be ``no`` commands, are planned per router against its last
+archived configuration (:func:`na_utils.change_plan.plan_removals`):
+only removals whose target is configured are sent, in dependency
+order, and routers with nothing to remove are recorded as skipped
+without an SSH session.
+
+``--simulate SNAPSHOT`` predicts the result without connecting: the
+commands are applied to a model of each matching router's archived
+configuration (a directory of ``.conf`` files, or a date/``latest``
+with ``--archive``) and the predicted diffs are summarised.
+
 Note that the commands in this script are representative; adjust
 ``DEFAULT_COMMANDS`` as needed for your environment.  The script
 prints progress information to standard output and writes a summary
@@ -37,9 +54,12 @@ from __future__ import annotations
 
 import argparse
 import csv
+import functools
 import os
+import sys
 from datetime import datetime
-from typing import List, Iterable, Optional
+from pathlib import Path
+from typing import Dict, List, Iterable, Optional
 
 try:
     from dotenv import load_dotenv  # type: ignore
@@ -48,7 +68,6 @@ except Exception:
     # environment variables must already be set in the environment.
     def load_dotenv(*args: any, **kwargs: any) -> None:
         return None
-from ciscoconfparse import CiscoConfParse
 
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 if str(PROJECT_ROOT) not in sys.path:
@@ -56,6 +75,10 @@ if str(PROJECT_ROOT) not in sys.path:
 
 from na_utils import dnac
 from na_utils import net_device
+from na_utils.change_plan import plan_removals
+from na_utils.config_store import ConfigStore
+from na_utils.inventory import DeviceInventory
+from na_utils.simulate import add_simulation_arguments, run_simulation
 
 
 # Load environment variables from .env
@@ -125,6 +148,17 @@ def load_commands_from_file(path: str) -> List[str]:
     return commands
 
 
+def plan_device(commands: List[str], hostname: str, config: str) -> List[str]:
+    """Return the commands sent to a router with ``config``; used by ``--simulate``.
+
+    Lists made only of ``no`` commands are planned against ``config``
+    as with ``--archive``; other lists are sent as they are.
+    """
+    if all(cmd.split()[:1] == ["no"] for cmd in commands if cmd.strip() not in ("", "!")):
+        return plan_removals(commands, config).commands
+    return list(commands)
+
+
 def write_tracker_row(tracker_path: str, row: Iterable[str]) -> None:
     """Append a row to the CSV tracker file.
 
@@ -188,6 +222,13 @@ def parse_args() -> argparse.Namespace:
         default="ert_rtr_change_tracker.csv",
         help="Path to CSV tracker file for logging changes. Defaults to 'ert_rtr_change_tracker.csv'.",
     )
+    parser.add_argument(
+        "--archive",
+        default=os.getenv("CONFIG_ARCHIVE_DIR"),
+        help="Plan commands against archived configurations in this directory (env CONFIG_ARCHIVE_DIR)",
+    )
+    net_device.add_worker_arguments(parser)
+    add_simulation_arguments(parser)
     return parser.parse_args()
 
 
@@ -205,37 +246,75 @@ def main() -> None:
     else:
         commands = DEFAULT_COMMANDS
 
+    if args.simulate:
+        run_simulation(args, functools.partial(plan_device, commands), select=lambda name: pattern in name.lower())
+        return
+
     # Fetch routers from Catalyst Center
     try:
         device_json = dnac.get_device_list(family="Routers")
     except Exception as exc:
         raise RuntimeError(f"Failed to retrieve device list: {exc}")
 
-    devices = device_json.get("response", [])
-    if not devices:
+    inventory = DeviceInventory.from_device_json(device_json)
+    if not len(inventory):
         print("No routers returned from Catalyst Center.")
         return
 
     # Filter based on hostname pattern
-    targets = [d for d in devices if pattern in str(d.get("hostname", "")).lower()]
+    targets = inventory.search(pattern).to_list()
     if not targets:
         print(f"No routers matching pattern '{args.pattern}' were found.")
         return
 
     print(f"Found {len(targets)} router(s) matching pattern '{args.pattern}'. Starting updates...")
 
+    store = ConfigStore(args.archive) if args.archive else None
+    if store is not None and any(cmd.split()[:1] != ["no"] for cmd in commands if cmd.strip() not in ("", "!")):
+        raise RuntimeError("--archive planning requires a command list of 'no' commands only")
+    device_commands: Dict[str, List[str]] = {}
+
+    reachable_targets = []
     for dev in targets:
         hostname = dev.get("hostname", "unknown")
-        ip = dev.get("managementIpAddress") or dev.get("ipAddress")
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        if not ip:
+        if not (dev.get("managementIpAddress") or dev.get("ipAddress")):
+            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             print(f"Skipping {hostname}: no management IP available")
             write_tracker_row(tracker, [timestamp, hostname, "", "skipped", "No management IP"])
             continue
-        print(f"\nProcessing {hostname} ({ip})...")
-        success, message = apply_commands_to_device(hostname, ip, commands)
-        status = "success" if success else "failure"
-        print(message)
+        if store is not None:
+            config = store.get_config(hostname)
+            if config is not None:
+                plan = plan_removals(commands, config)
+                if not plan:
+                    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                    ip = dev.get("managementIpAddress") or dev.get("ipAddress")
+                    print(f"Skipping {hostname}: nothing to remove in the archived configuration")
+                    write_tracker_row(tracker, [timestamp, hostname, ip, "skipped", "Nothing to remove"])
+                    continue
+                device_commands[hostname] = plan.commands
+            else:
+                print(f"{hostname}: not in the archive, sending the full command set")
+        reachable_targets.append(dev)
+
+    def task(dev) -> str:
+        hostname = dev.get("hostname", "unknown")
+        success, message = apply_commands_to_device(
+            hostname, dev.get("managementIpAddress") or dev.get("ipAddress"), device_commands.get(hostname, commands)
+        )
+        if not success:
+            raise RuntimeError(message)
+        return message
+
+    for result in net_device.iter_on_devices(reachable_targets, task, **net_device.worker_options(args)):
+        dev = result.host
+        hostname = dev.get("hostname", "unknown")
+        ip = dev.get("managementIpAddress") or dev.get("ipAddress")
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        status = {"ok": "success", "skipped": "skipped"}.get(result.status, "failure")
+        message = result.result if result.ok else result.error
+        if result.ok:
+            print(f"\n{hostname} ({ip}):\n{message}")
         write_tracker_row(tracker, [timestamp, hostname, ip, status, message.split("\n")[0]])
 
 
@@ -6,15 +6,20 @@ leverages :mod:`na_utils.dnac` for API access and uses
 ``openpyxl`` to generate the report.  A backup copy of the report
 can be stored in a separate directory.  Paths and time zones are
 customisable via command line arguments.
+
+By default buildings and days are queried one after another.  Pass
+``--concurrency N`` to issue up to ``N`` client queries at once through
+:class:`na_utils.dnac_async.AsyncDnacClient`.
 """
 
 from __future__ import annotations
 
 import argparse
+import asyncio
 import os
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, Iterator, List, Tuple
 
 import pytz
 import sys
@@ -27,7 +32,11 @@ PROJECT_ROOT = Path(__file__).resolve().parents[2]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from na_utils.dnac import get_api_response, get_auth_token
+from na_utils.dnac import get_api_response, get_default_client, get_token_manager, iter_paginated
+from na_utils.dnac_async import AsyncDnacClient
+
+# The client data API returns at most 100 records per page.
+CLIENTS_PAGE_SIZE = 100
 
 
 def get_site_topology() -> Dict[str, Any]:
@@ -35,14 +44,63 @@ def get_site_topology() -> Dict[str, Any]:
     return get_api_response("/api/v1/topology/site-topology").get("response", {})
 
 
+def iter_users_per_bldg(bldg_id: str, start_time_ms: int, end_time_ms: int) -> Iterator[Dict[str, Any]]:
+    """Yield wireless clients for a building and time range, page by page."""
+    endpoint, params = clients_query(bldg_id, start_time_ms, end_time_ms)
+    # Only the count is needed, so stream each page and keep just the id.
+    return iter_paginated(endpoint, CLIENTS_PAGE_SIZE, params=params, stream=True, fields=("id",))
+
+
 def get_users_per_bldg(bldg_id: str, start_time_ms: int, end_time_ms: int) -> List[Dict[str, Any]]:
     """Return wireless client list for a building and time range."""
-    endpoint = (
-        f"/dna/data/api/v1/clients?startTime={start_time_ms}&endTime={end_time_ms}"
-        f"&type=Wireless&siteHierarchyId=*{bldg_id}*"
-    )
-    resp = get_api_response(endpoint)
-    return resp.get("response", [])
+    return list(iter_users_per_bldg(bldg_id, start_time_ms, end_time_ms))
+
+
+def clients_query(bldg_id: str, start_time_ms: int, end_time_ms: int) -> Tuple[str, Dict[str, Any]]:
+    """Return the endpoint and query parameters for a building/day query."""
+    params = {
+        "startTime": start_time_ms,
+        "endTime": end_time_ms,
+        "type": "Wireless",
+        "siteHierarchyId": f"*{bldg_id}*",
+    }
+    return "/dna/data/api/v1/clients", params
+
+
+async def collect_counts_async(
+    bldg_id_map: Dict[str, str],
+    time_ranges: List[Tuple[int, int, str]],
+    concurrency: int,
+) -> Dict[str, List[int]]:
+    """Count clients for every building and day with bounded concurrency.
+
+    Failed queries are reported and counted as zero, matching the
+    sequential code path.
+    """
+    keys = [(bldg_id, day) for day in range(len(time_ranges)) for bldg_id in bldg_id_map]
+    queries = [clients_query(bldg_id, *time_ranges[day][:2]) for bldg_id, day in keys]
+    # Share the synchronous client's rate limiter so that both paths draw
+    # from the same buckets and the summary printed by main() covers both.
+    async with AsyncDnacClient(limit=concurrency, rate_limiter=get_default_client().rate_limiter) as client:
+        results = await client.gather_endpoints(
+            queries,
+            concurrency=concurrency,
+            paginate=True,
+            page_size=CLIENTS_PAGE_SIZE,
+            stream=True,
+            fields=("id",),
+            return_exceptions=True,
+        )
+        print(f"Auth tokens: {client.stats['hits']} cached, {client.stats['misses']} issued, "
+              f"{client.stats['refreshes']} refreshed")
+    bldg_stats: Dict[str, List[int]] = {name: [0] * len(time_ranges) for name in bldg_id_map.values()}
+    for (bldg_id, day), result in zip(keys, results):
+        bldg_name = bldg_id_map[bldg_id]
+        if isinstance(result, Exception):
+            print(f"  Error fetching data for {bldg_name} ({time_ranges[day][2]}): {result}")
+            continue
+        bldg_stats[bldg_name][day] = len(result)
+    return bldg_stats
 
 
 def generate_daily_time_ranges(days: int, timezone: str) -> List[Tuple[int, int, str]]:
@@ -97,6 +155,8 @@ def main() -> None:
     parser.add_argument("--timezone", default="US/Central", help="Timezone for reporting (e.g. US/Central)")
     parser.add_argument("--output", default="wireless_reports/building_client_summary.xlsx", help="Excel file path to write")
     parser.add_argument("--backup-dir", default=None, help="Optional directory to save a copy of the report")
+    parser.add_argument("--concurrency", type=int, default=1,
+                        help="Number of client queries to run at once (1 = sequential)")
     args = parser.parse_args()
     site_topology = get_site_topology()
     # Build a mapping of building ID to hierarchy name for floors
@@ -106,20 +166,23 @@ def main() -> None:
         if site.get('locationType') == 'floor'
     }
     time_ranges = generate_daily_time_ranges(args.days, args.timezone)
-    bldg_stats: Dict[str, List[int]] = {bldg_name: [] for bldg_name in bldg_id_map.values()}
     day_labels = [label for _, _, label in time_ranges]
     print(f"Collecting data for {args.days} days…")
-    for day_index, (start_ms, end_ms, label) in enumerate(time_ranges, 1):
-        print(f"Day {day_index} ({label}):")
-        for bldg_id, bldg_name in bldg_id_map.items():
-            try:
-                clients = get_users_per_bldg(bldg_id, start_ms, end_ms)
-                client_count = len(clients)
-                bldg_stats[bldg_name].append(client_count)
-                print(f"  {bldg_name}: {client_count} clients")
-            except Exception as e:
-                print(f"  Error fetching data for {bldg_name}: {e}")
-                bldg_stats[bldg_name].append(0)
+    bldg_stats: Dict[str, List[int]]
+    if args.concurrency > 1:
+        bldg_stats = asyncio.run(collect_counts_async(bldg_id_map, time_ranges, args.concurrency))
+    else:
+        bldg_stats = {bldg_name: [] for bldg_name in bldg_id_map.values()}
+        for day_index, (start_ms, end_ms, label) in enumerate(time_ranges, 1):
+            print(f"Day {day_index} ({label}):")
+            for bldg_id, bldg_name in bldg_id_map.items():
+                try:
+                    client_count = sum(1 for _ in iter_users_per_bldg(bldg_id, start_ms, end_ms))
+                    bldg_stats[bldg_name].append(client_count)
+                    print(f"  {bldg_name}: {client_count} clients")
+                except Exception as e:
+                    print(f"  Error fetching data for {bldg_name}: {e}")
+                    bldg_stats[bldg_name].append(0)
     summary_data: List[Dict[str, Any]] = []
     for bldg_name, daily_counts in bldg_stats.items():
         total = sum(daily_counts)
@@ -137,6 +200,11 @@ def main() -> None:
     write_excel_report(summary_data, day_labels, report_path)
     if args.backup_dir:
         save_report_copy(report_path, Path(args.backup_dir))
+    stats = get_token_manager().stats
+    print(f"Auth tokens: {stats['hits']} cached, {stats['misses']} issued, {stats['refreshes']} refreshed")
+    for family, counters in get_default_client().rate_limiter.stats.items():
+        print(f"Rate limiter [{family}]: {counters['requests']} requests, {counters['queued']} queued "
+              f"for {counters['queued_seconds']:.1f}s total, {counters['retries']} retries")
 
 
 if __name__ == "__main__":
@@ -6,14 +6,47 @@ list to only those that report a ``reachabilityStatus`` of
 its running configuration.  The configurations are saved to
 ``<output_dir>/<hostname>.conf``.  Use environment variables to set
 device credentials; see ``.env.template`` for details.
+
+Devices are backed up concurrently; ``--workers`` sets how many at a
+time (default 32).  Each device gets a time budget (``--host-timeout``,
+default 180 seconds) that covers both the SSH login and the
+``show running-config`` transfer, so a hung device cannot stall the
+run.
+
+Backups are resumable.  Every saved device is recorded in a checkpoint
+journal (``<output_dir>/.backup-journal-<run-id>.jsonl``); rerunning
+with the same ``--run-id`` (today's date by default) skips devices
+already saved in that run.  Pass ``--restart`` to ignore the journal.
+Configuration files are written to a temporary file and renamed into
+place, so a partially written ``.conf`` file never appears.
+
+With ``--archive DIR`` (or ``CONFIG_ARCHIVE_DIR``) every configuration
+is also added to a :class:`~na_utils.config_store.ConfigStore`, which
+keeps the full history while storing each distinct configuration once,
+and the output reports whether each device changed since its last
+backup.
+
+``--async`` collects over the :mod:`asyncssh` transport
+(:mod:`na_utils.net_device_async`) instead of Netmiko threads, so one
+process can hold 1,000+ sessions; ``--workers`` then sets the number of
+concurrent sessions and ``--group-limit`` is not applied.
+
+Example::
+
+    python get_device_config_v2.py -o /backups/configs --workers 64
+    python get_device_config_v2.py -o /backups/configs --async --workers 1000
 """
 
 from __future__ import annotations
 
 import argparse
+import asyncio
+import json
 import os
+import time
+from datetime import date, datetime
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 
 import sys
 
@@ -26,8 +59,159 @@ PROJECT_ROOT = Path(__file__).resolve().parents[2]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
+from na_utils.config_store import ConfigStore
+from na_utils.config_utils import write_text_atomic
 from na_utils.dnac import get_device_list
-from na_utils.net_device import connect_device
+from na_utils.inventory import DeviceInventory
+from na_utils import net_device_async
+from na_utils.net_device import HostResult, add_worker_arguments, connect_device, iter_on_devices, worker_options
+
+# Defaults tuned for nightly full-fleet backups.
+DEFAULT_WORKERS = 32
+DEFAULT_HOST_TIMEOUT = 180.0
+# Upper bound on the SSH login portion of a device's budget.
+MAX_CONNECT_TIMEOUT = 30.0
+# Extra time given to the executor before it abandons a device whose
+# Netmiko timeouts did not fire.
+TIMEOUT_GRACE = 30.0
+
+
+class CheckpointJournal:
+    """Append-only record of the devices saved during one backup run.
+
+    Each line is a JSON object with the device key, the file written and
+    a timestamp.  Lines are flushed and synced as they are written, so
+    the journal survives the process being killed.  A truncated last
+    line from such a kill is ignored when the journal is loaded.
+
+    :param path: Journal file path.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.saved: Dict[str, str] = self._load()
+
+    def _load(self) -> Dict[str, str]:
+        saved: Dict[str, str] = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as fh:
+                for line in fh:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    saved[entry["device"]] = entry["file"]
+        except FileNotFoundError:
+            pass
+        return saved
+
+    def is_saved(self, key: str) -> bool:
+        """Return ``True`` if ``key`` was saved and its file still exists."""
+        file_path = self.saved.get(key)
+        return file_path is not None and os.path.exists(file_path)
+
+    def record(self, key: str, file_path: Path) -> None:
+        """Record that ``key`` has been saved to ``file_path``."""
+        entry = {"device": key, "file": str(file_path), "saved_at": datetime.now().isoformat(timespec="seconds")}
+        with open(self.path, "a", encoding="utf-8") as fh:
+            fh.write(json.dumps(entry) + "\n")
+            fh.flush()
+            os.fsync(fh.fileno())
+        self.saved[key] = str(file_path)
+
+
+def device_key(dev: Any) -> str:
+    """Return the key identifying a device in the journal."""
+    return str(dev.get("id") or dev.get("hostname") or dev.get("managementIpAddress"))
+
+
+def save_config(
+    dev: Any, out_dir: Path, budget: float, store: Optional[ConfigStore] = None
+) -> Tuple[Path, Optional[bool]]:
+    """Back up the running configuration of one device.
+
+    The SSH login and the transfer share ``budget`` seconds; Netmiko's
+    own timeouts are derived from what remains.
+
+    :returns: Path of the configuration file written and, if ``store``
+        is given, whether the configuration changed since the last
+        archived snapshot.
+    :raises RuntimeError: If the connection fails or the budget is spent.
+    """
+    deadline = time.monotonic() + budget
+    hostname = dev.get("hostname") or dev.get("id")
+    connect_timeout = min(budget, MAX_CONNECT_TIMEOUT)
+    conn = connect_device(
+        dev.get("managementIpAddress"),
+        conn_timeout=connect_timeout,
+        auth_timeout=connect_timeout,
+        banner_timeout=connect_timeout,
+    )
+    if not conn:
+        raise RuntimeError("SSH connection failed")
+    try:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise RuntimeError(f"time budget of {budget:g}s spent before the transfer started")
+        output = conn.send_command("show running-config", read_timeout=remaining)
+    finally:
+        conn.disconnect()
+    file_path = out_dir / f"{hostname}.conf"
+    write_text_atomic(str(file_path), output)
+    changed = store.put(hostname, output).changed if store is not None else None
+    return file_path, changed
+
+
+async def save_config_async(
+    dev: Any, out_dir: Path, budget: float, store: Optional[ConfigStore] = None
+) -> Tuple[Path, Optional[bool]]:
+    """Back up one device over the asyncio transport; see :func:`save_config`.
+
+    The caller enforces ``budget`` by cancelling the coroutine.
+    """
+    hostname = dev.get("hostname") or dev.get("id")
+    connect_timeout = min(budget, MAX_CONNECT_TIMEOUT)
+    conn = await net_device_async.connect_device(
+        dev.get("managementIpAddress"), conn_timeout=connect_timeout, read_timeout=connect_timeout
+    )
+    if conn is None:
+        raise RuntimeError("SSH connection failed")
+    async with conn:
+        output = await conn.send_command("show running-config", read_timeout=budget)
+    file_path = out_dir / f"{hostname}.conf"
+    write_text_atomic(str(file_path), output)
+    changed = store.put(hostname, output).changed if store is not None else None
+    return file_path, changed
+
+
+def collect_async(
+    devices: List[Any],
+    out_dir: Path,
+    budget: float,
+    store: Optional[ConfigStore],
+    journal: CheckpointJournal,
+    options: Dict[str, Any],
+) -> List[HostResult]:
+    """Back up ``devices`` with :func:`net_device_async.run_on_devices`.
+
+    Results are only returned once every device is done, so each saved
+    device is recorded in ``journal`` as soon as its file is written.
+    """
+
+    async def backup(dev: Any) -> Tuple[Path, Optional[bool]]:
+        file_path, changed = await save_config_async(dev, out_dir, budget, store)
+        journal.record(device_key(dev), file_path)
+        return file_path, changed
+
+    return asyncio.run(
+        net_device_async.run_on_devices(
+            devices,
+            backup,
+            concurrency=options["max_workers"],
+            per_host_timeout=budget,
+            max_failures=options["max_failures"],
+        )
+    )
 
 
 def main() -> None:
@@ -37,32 +221,77 @@ def main() -> None:
         help="Directory to write configuration files to",
         default="device_configs",
     )
+    parser.add_argument(
+        "--run-id",
+        default=date.today().isoformat(),
+        help="Identifier of the backup run used for resuming (default: today's date)",
+    )
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="Ignore the checkpoint journal and back up every device again",
+    )
+    parser.add_argument(
+        "--archive",
+        default=os.getenv("CONFIG_ARCHIVE_DIR"),
+        help="Also add configurations to this deduplicated history archive (env CONFIG_ARCHIVE_DIR)",
+    )
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="Collect over the asyncssh transport instead of Netmiko threads",
+    )
+    add_worker_arguments(parser)
+    parser.set_defaults(workers=DEFAULT_WORKERS, host_timeout=DEFAULT_HOST_TIMEOUT)
     args = parser.parse_args()
     out_dir = Path(args.output_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
-    devices: Dict[str, Any] = get_device_list()
-    reachable = [dev for dev in devices.get("response", []) if dev.get("reachabilityStatus") == "Reachable" and dev.get('family') != "Unified AP"]
+    journal_path = out_dir / f".backup-journal-{args.run_id}.jsonl"
+    if args.restart and journal_path.exists():
+        journal_path.unlink()
+    journal = CheckpointJournal(journal_path)
+    store = ConfigStore(args.archive) if args.archive else None
+
+    # Reachability is filtered by Catalyst Center; access points are
+    # dropped locally because the API cannot express "family not equal".
+    devices: Dict[str, Any] = get_device_list(filters={"reachabilityStatus": "Reachable"})
+    inventory = DeviceInventory.from_device_json(devices)
+    reachable = inventory.by_reachability("Reachable").exclude(family="Unified AP")
     if not reachable:
         print("No reachable devices found")
         return
-    for dev in reachable:
-        hostname = dev.get("hostname") or dev.get("id")
-        ip = dev.get("managementIpAddress")
-        print(f"Connecting to {hostname} ({ip})…")
-        conn = connect_device(ip)
-        if not conn:
-            continue
-        try:
-            output = conn.send_command("show running-config")
-            file_path = out_dir / f"{hostname}.conf"
-            with open(file_path, "w") as fh:
-                fh.write(output)
-            print(f"Saved config to {file_path}")
-        except Exception as exc:
-            print(f"Failed to retrieve config from {hostname}: {exc}")
-        finally:
-            conn.disconnect()
+    pending = [dev for dev in reachable if not journal.is_saved(device_key(dev))]
+    skipped = len(reachable) - len(pending)
+    if skipped:
+        print(f"Skipping {skipped} device(s) already saved in run {args.run_id}")
+
+    budget = args.host_timeout
+    options = worker_options(args)
+    options["per_host_timeout"] = budget + TIMEOUT_GRACE
+    saved = changed_count = 0
+    # The journal is only written from this thread (and, with --async,
+    # its event loop) as results arrive.
+    if args.use_async:
+        results = collect_async(pending, out_dir, budget, store, journal, options)
+    else:
+        results = iter_on_devices(pending, lambda dev: save_config(dev, out_dir, budget, store), **options)
+    for result in results:
+        if result.ok:
+            saved += 1
+            file_path, changed = result.result
+            if not args.use_async:
+                journal.record(device_key(result.host), file_path)
+            note = "" if changed is None else (" (changed)" if changed else " (unchanged)")
+            changed_count += bool(changed)
+            print(f"Saved config to {file_path}{note}")
+        else:
+            print(f"Failed to retrieve config from {result.name}: {result.error}")
+    print(f"Saved {saved} of {len(pending)} configuration(s) to {out_dir}"
+          + (f" ({skipped} already saved earlier in this run)" if skipped else ""))
+    if store is not None:
+        print(f"{changed_count} configuration(s) changed since the last archived backup")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
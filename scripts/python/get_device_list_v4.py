@@ -4,6 +4,9 @@ This refactored version uses :mod:`na_utils.dnac` to query the
 Catalyst Center API rather than reimplementing token handling.  It
 prints a formatted table of devices and can optionally save the list
 to an Excel file.  Use command line arguments to control output.
+The device list is served from the shared response cache when fresh;
+pass ``--refresh`` to force a new download or ``--no-cache`` to bypass
+the cache entirely.
 """
 
 from __future__ import annotations
@@ -22,7 +25,7 @@ PROJECT_ROOT = Path(__file__).resolve().parents[2]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from na_utils.dnac import get_device_list
+from na_utils.dnac import add_cache_arguments, apply_cache_arguments, get_device_list
 
 
 def safe_format(value: Any, default: str = "N/A") -> str:
@@ -91,7 +94,9 @@ def main() -> None:
     parser.add_argument(
         "--excel", "-e", help="Path to save Excel file with device information", default=None,
     )
+    add_cache_arguments(parser)
     args = parser.parse_args()
+    apply_cache_arguments(args)
     devices = get_device_list()
     print_device_list(devices)
     if args.excel:
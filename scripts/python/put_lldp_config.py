@@ -14,23 +14,43 @@ The script performs the following high‑level steps:
     processed.
 2.  Connect to each device via SSH using Netmiko, leveraging
     credentials from your ``.env`` file.
-3.  Parse the running configuration with :mod:`ciscoconfparse` to
-    locate interface blocks.  For every interface that contains ``no
-    cdp enable`` but does not already disable LLDP, build a set of
+3.  Fetch only the interface lines that matter instead of the full
+    running configuration: the device filters its configuration down
+    to ``interface`` headers and their CDP/LLDP lines
+    (see :data:`INTERFACE_STATE_COMMAND`).  The output is scanned in
+    one streaming pass.  For every interface that contains ``no cdp
+    enable`` but does not already disable LLDP, build a set of
     commands to enter the interface and issue ``no lldp transmit`` and
     ``no lldp receive``.
-4.  Send the commands to the device using Netmiko.  Results and
+4.  Compile the commands with
+    :func:`na_utils.command_compiler.compile_commands`, which merges
+    the per-interface blocks into ``interface range`` statements, and
+    send them as one block with the ``fast`` push profile.  Results and
     errors are logged to a CSV tracker for auditing purposes.
 
-Because fetching a full running configuration can be time consuming,
-consider limiting the number of devices processed by specifying a
-device family (e.g. ``--family Switches and Hubs``).  Use the
-``--pattern`` option to restrict the script to devices whose hostname
-contains a given substring (case‑insensitive).
+Compliant devices are remembered in a state cache (``--cache``,
+default ``lldp_state_cache.json``) with the device's ``Last
+configuration change`` marker and a fingerprint of its interface
+state.  On a rerun a one-line probe of the marker is enough to skip a
+device whose configuration has not changed; if the marker changed but
+the interface state did not, the device is skipped after the
+interface fetch.  ``--refresh`` ignores the cache.
+
+``--simulate SNAPSHOT`` predicts the result without connecting: the
+compiled commands are applied to a model of each device's archived
+configuration (a directory of ``.conf`` files, or a date/``latest``
+in ``CONFIG_ARCHIVE_DIR``) and the predicted diffs are summarised.
+
+Use ``--family`` (e.g. ``--family "Switches and Hubs"``) and
+``--pattern`` to restrict the script to a device family or to devices
+whose hostname contains a given substring (case‑insensitive).
+
+Devices are processed concurrently; ``--workers`` sets how many at a
+time and ``--group-limit`` caps how many run at once per site.
 
 Example::
 
-    python put_lldp_config.py --family "Switches and Hubs" --pattern LAB
+    python put_lldp_config.py --family "Switches and Hubs" --pattern LAB --workers 16
 
 Security Note:  Credentials are loaded from environment variables via
 ``python‑dotenv``.  Ensure you have created a local ``.env`` file
@@ -43,11 +63,13 @@ from __future__ import annotations
 
 import argparse
 import csv
+import hashlib
+import json
 import os
 import sys
 from pathlib import Path
 from datetime import datetime
-from typing import Iterable, List
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 try:
     from dotenv import load_dotenv  # type: ignore
@@ -58,7 +80,6 @@ except Exception:
     # are already set.
     def load_dotenv(*args: any, **kwargs: any) -> None:
         return None
-from ciscoconfparse import CiscoConfParse
 
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 if str(PROJECT_ROOT) not in sys.path:
@@ -66,35 +87,71 @@ if str(PROJECT_ROOT) not in sys.path:
 
 from na_utils import dnac
 from na_utils import net_device
+from na_utils.command_compiler import compile_commands
+from na_utils.config_utils import write_text_atomic
+from na_utils.inventory import DeviceInventory
+from na_utils.simulate import add_simulation_arguments, run_simulation
 
 
 load_dotenv()
 
+# Interface headers and the CDP/LLDP lines below them, filtered on the
+# device so only a few lines per port cross the WAN.  These per-port
+# commands exist only in interface mode, so every matching child line
+# belongs to the interface header before it.
+INTERFACE_STATE_COMMAND = "show running-config | include ^interface|cdp enable|lldp transmit|lldp receive"
+# One line identifying the last configuration change.
+CHANGE_MARKER_COMMAND = "show running-config | include Last configuration change"
+FETCH_TIMEOUT = 30
 
-def parse_interface_commands(config: str) -> List[str]:
-    """Generate commands to disable LLDP on interfaces with CDP disabled.
 
-    Parses the provided running configuration and locates all
-    ``interface`` stanzas.  For each interface, if it contains the
-    directive ``no cdp enable`` and does not already include ``no
-    lldp transmit``, a sequence of commands is built to enter the
-    interface configuration mode and disable LLDP transmit and
-    receive.  The interface name is extracted from the first word of
-    the interface header.
+def scan_interfaces(lines: Iterable[str]) -> Iterator[Tuple[str, bool, bool]]:
+    """Scan configuration lines for interface CDP/LLDP state in one pass.
 
-    :param config: The full running configuration of a device.
-    :returns: A flat list of CLI commands to send to the device.
+    Works on full running configurations as well as on the filtered
+    output of :data:`INTERFACE_STATE_COMMAND`; lines are consumed as
+    they arrive and no configuration tree is built.
+
+    :param lines: Configuration lines.
+    :returns: An iterator of ``(interface, cdp_disabled,
+        lldp_transmit_disabled)`` tuples.
     """
-    parse = CiscoConfParse(config.splitlines())
+    name: Optional[str] = None
+    no_cdp = no_lldp_tx = False
+    for raw in lines:
+        line = raw.rstrip()
+        if not line:
+            continue
+        if not line[0].isspace():
+            # Any top-level line ends the current block.
+            if name is not None:
+                yield name, no_cdp, no_lldp_tx
+            words = line.split()
+            name = words[1] if words[0] == "interface" and len(words) > 1 else None
+            no_cdp = no_lldp_tx = False
+        elif name is not None:
+            text = line.strip().lower()
+            if text.startswith("no cdp enable"):
+                no_cdp = True
+            elif text.startswith("no lldp transmit"):
+                no_lldp_tx = True
+    if name is not None:
+        yield name, no_cdp, no_lldp_tx
+
+
+def interface_fingerprint(states: Iterable[Tuple[str, bool, bool]]) -> str:
+    """Return a digest of the interface states from :func:`scan_interfaces`."""
+    digest = hashlib.sha256()
+    for name, no_cdp, no_lldp_tx in states:
+        digest.update(f"{name} {int(no_cdp)} {int(no_lldp_tx)}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def build_lldp_commands(states: Iterable[Tuple[str, bool, bool]]) -> List[str]:
+    """Return the commands disabling LLDP where CDP is disabled but LLDP is not."""
     commands: List[str] = []
-    for iface in parse.find_objects(r"^interface "):
-        # Determine if CDP is disabled on this interface
-        children = [child.text.strip() for child in iface.children]
-        has_no_cdp = any(line.lower().startswith("no cdp enable") for line in children)
-        # Determine if LLDP already disabled
-        has_no_lldp_tx = any(line.lower().startswith("no lldp transmit") for line in children)
+    for int_name, has_no_cdp, has_no_lldp_tx in states:
         if has_no_cdp and not has_no_lldp_tx:
-            int_name = iface.text.split()[1]
             commands.append(f"interface {int_name}")
             commands.append("no lldp transmit")
             commands.append("no lldp receive")
@@ -102,6 +159,28 @@ def parse_interface_commands(config: str) -> List[str]:
     return commands
 
 
+def parse_interface_commands(config: Union[str, Iterable[str]]) -> List[str]:
+    """Generate commands to disable LLDP on interfaces with CDP disabled.
+
+    Scans the configuration with :func:`scan_interfaces`.  For each
+    interface that contains the directive ``no cdp enable`` and does
+    not already include ``no lldp transmit``, a sequence of commands is
+    built to enter the interface configuration mode and disable LLDP
+    transmit and receive.
+
+    :param config: Configuration text or lines, either the full running
+        configuration or the output of :data:`INTERFACE_STATE_COMMAND`.
+    :returns: A flat list of CLI commands to send to the device.
+    """
+    lines = config.splitlines() if isinstance(config, str) else config
+    return build_lldp_commands(scan_interfaces(lines))
+
+
+def plan_device(hostname: str, config: str) -> List[str]:
+    """Return the compiled commands sent to a device; used by ``--simulate``."""
+    return compile_commands(parse_interface_commands(config))
+
+
 def write_tracker_row(tracker_path: str, row: Iterable[str]) -> None:
     """Append a row to the CSV tracker file.
 
@@ -118,37 +197,76 @@ def write_tracker_row(tracker_path: str, row: Iterable[str]) -> None:
         writer.writerow(row)
 
 
-def process_device(hostname: str, ip: str) -> tuple[bool, int, str]:
+def load_state_cache(path: str) -> Dict[str, Dict[str, Any]]:
+    """Load the per-device state cache, or return an empty one."""
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            cache = json.load(fh)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _fetch_interface_state(conn: Any) -> Tuple[List[Tuple[str, bool, bool]], int]:
+    output = conn.send_command(INTERFACE_STATE_COMMAND, read_timeout=FETCH_TIMEOUT)
+    return list(scan_interfaces(output.splitlines())), len(output)
+
+
+def _fetch_change_marker(conn: Any) -> Tuple[str, int]:
+    output = conn.send_command(CHANGE_MARKER_COMMAND, read_timeout=FETCH_TIMEOUT)
+    marker = next((line.strip() for line in output.splitlines() if "Last configuration change" in line), "")
+    return marker, len(output)
+
+
+def process_device(
+    hostname: str, ip: str, cached: Optional[Dict[str, Any]] = None
+) -> Tuple[bool, int, str, Optional[Dict[str, Any]], int]:
     """Connect to a device, build LLDP disable commands and apply them.
 
     :param hostname: Device name for logging.
     :param ip: Management IP address.
-    :returns: Tuple of success flag, number of interfaces processed and a message.
+    :param cached: The device's entry from the state cache, if any.
+    :returns: Tuple of success flag, number of interfaces processed, a
+        message, the new cache entry (``None`` if the device is not
+        known to be compliant) and the number of bytes fetched.
     """
     conn = net_device.connect_device(ip)
     if not conn:
-        return False, 0, "SSH connection failed"
+        return False, 0, "SSH connection failed", None, 0
+    fetched = 0
     try:
-        # Retrieve full running config.  In practice you might limit
-        # this with a pipe (e.g. ``show run | section interface``) but
-        # here we fetch the entire config to ensure LLDP state is
-        # parsed correctly.
-        running = conn.send_command("show running-config", read_timeout=90)
-        commands = parse_interface_commands(running)
+        marker, size = _fetch_change_marker(conn)
+        fetched += size
+        if cached and marker and cached.get("marker") == marker:
+            return True, 0, "Unchanged since last run", cached, fetched
+        states, size = _fetch_interface_state(conn)
+        fetched += size
+        fingerprint = interface_fingerprint(states)
+        if cached and cached.get("fingerprint") == fingerprint:
+            return True, 0, "Interface state unchanged since last run", {"marker": marker, "fingerprint": fingerprint}, fetched
+        commands = build_lldp_commands(states)
         if not commands:
-            conn.disconnect()
-            return True, 0, "No interfaces required changes"
+            return True, 0, "No interfaces required changes", {"marker": marker, "fingerprint": fingerprint}, fetched
         # Count interfaces by counting "interface" lines in commands
         num_interfaces = sum(1 for cmd in commands if cmd.startswith("interface "))
-        output = net_device.send_config_commands(conn, commands)
-        conn.disconnect()
-        return True, num_interfaces, output.splitlines()[0] if output else "Commands sent"
+        # One block of "interface range" statements instead of four
+        # prompt round trips per port.
+        output = net_device.send_config_commands(conn, compile_commands(commands), profile="fast")
+        message = output.splitlines()[0] if output else "Commands sent"
+        # Our change moved the marker; record the new state once verified.
+        marker, size = _fetch_change_marker(conn)
+        fetched += size
+        states, size = _fetch_interface_state(conn)
+        fetched += size
+        entry = None if build_lldp_commands(states) else {"marker": marker, "fingerprint": interface_fingerprint(states)}
+        return True, num_interfaces, message, entry, fetched
     except Exception as exc:  # pragma: no cover
+        return False, 0, f"Error processing device: {exc}", None, fetched
+    finally:
         try:
             conn.disconnect()
         except Exception:
             pass
-        return False, 0, f"Error processing device: {exc}"
 
 
 def parse_args() -> argparse.Namespace:
@@ -170,6 +288,18 @@ def parse_args() -> argparse.Namespace:
         default="lldp_change_tracker.csv",
         help="Path to CSV tracker file. Defaults to 'lldp_change_tracker.csv'.",
     )
+    parser.add_argument(
+        "--cache",
+        default="lldp_state_cache.json",
+        help="Per-device state cache used to skip unchanged devices. Defaults to 'lldp_state_cache.json'.",
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Ignore the state cache and check every device.",
+    )
+    net_device.add_worker_arguments(parser)
+    add_simulation_arguments(parser)
     return parser.parse_args()
 
 
@@ -179,41 +309,78 @@ def main() -> None:
     family = args.family
     pattern = args.pattern.lower() if args.pattern else None
 
+    if args.simulate:
+        run_simulation(args, plan_device, select=(lambda name: pattern in name.lower()) if pattern else None)
+        return
+
     # Retrieve devices from Catalyst Center
     try:
         device_json = dnac.get_device_list(family=family) if family else dnac.get_device_list()
     except Exception as exc:
         raise RuntimeError(f"Failed to retrieve device list: {exc}")
-    devices = device_json.get("response", [])
+    inventory = DeviceInventory.from_device_json(device_json)
+    devices = inventory.devices
     if not devices:
         print("No devices returned from Catalyst Center.")
         return
 
     # Filter by hostname pattern if provided
     if pattern:
-        devices = [d for d in devices if pattern in str(d.get("hostname", "")).lower()]
+        devices = inventory.search(pattern).to_list()
         if not devices:
             print(f"No devices matching pattern '{args.pattern}' were found.")
             return
 
-    print(f"Processing {len(devices)} device(s) to update LLDP configuration...")
+    targets = []
     for dev in devices:
         hostname = dev.get("hostname", "unknown")
-        ip = dev.get("managementIpAddress") or dev.get("ipAddress")
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        if not ip:
+        if not (dev.get("managementIpAddress") or dev.get("ipAddress")):
+            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             print(f"Skipping {hostname}: no management IP available")
             write_tracker_row(tracker, [timestamp, hostname, "", "skipped", 0, "No management IP"])
             continue
-        print(f"\nProcessing {hostname} ({ip})...")
-        success, num_ifaces, message = process_device(hostname, ip)
-        status = "success" if success else "failure"
+        targets.append(dev)
+
+    cache = {} if args.refresh else load_state_cache(args.cache)
+    new_cache: Dict[str, Dict[str, Any]] = dict(cache)
+
+    def cache_key(dev) -> str:
+        return str(dev.get("id") or dev.get("hostname", "unknown"))
+
+    def task(dev) -> Tuple[bool, int, str, Optional[Dict[str, Any]], int]:
+        return process_device(
+            dev.get("hostname", "unknown"),
+            dev.get("managementIpAddress") or dev.get("ipAddress"),
+            cache.get(cache_key(dev)),
+        )
+
+    print(f"Processing {len(targets)} device(s) to update LLDP configuration...")
+    fetched_total = 0
+    # Results arrive in completion order; the tracker and the cache are
+    # only written from this thread.
+    for result in net_device.iter_on_devices(targets, task, **net_device.worker_options(args)):
+        dev = result.host
+        hostname = dev.get("hostname", "unknown")
+        ip = dev.get("managementIpAddress") or dev.get("ipAddress")
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        if result.ok:
+            success, num_ifaces, message, entry, fetched = result.result
+            fetched_total += fetched
+            if entry is None:
+                new_cache.pop(cache_key(dev), None)
+            else:
+                new_cache[cache_key(dev)] = entry
+        else:
+            success, num_ifaces, message = False, 0, result.error
+        status = "success" if success else ("skipped" if result.status == "skipped" else "failure")
         if num_ifaces:
             summary = f"Updated {num_ifaces} interface(s)"
         else:
             summary = message
-        print(summary)
+        print(f"{hostname}: {summary}")
         write_tracker_row(tracker, [timestamp, hostname, ip, status, num_ifaces, summary])
+    write_text_atomic(args.cache, json.dumps(new_cache, indent=2, sort_keys=True) + "\n")
+    print(f"Fetched {fetched_total / 1024:.1f} KiB of configuration from {len(targets)} device(s)")
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -0,0 +1,197 @@
+"""Local asyncssh server that emulates an IOS command line.
+
+:class:`FakeIOSDevice` answers like a Catalyst switch closely enough to
+exercise :mod:`na_utils.net_device_async`:
+
+* login lands in user EXEC (``rtr01>``); ``enable`` asks for the secret
+  and switches to ``rtr01#``;
+* output longer than the terminal length is paged with ``--More--``
+  until ``terminal length 0`` is sent;
+* ``configure terminal`` enters ``(config)#``; ``interface``, ``line``
+  and ``router`` enter their sub-mode prompts, ``exit`` leaves one
+  level and ``end`` returns to privileged EXEC;
+* configuration commands are recorded in ``applied``, and commands
+  starting with ``bogus`` are rejected with ``% Invalid input``.
+
+Usage example:
+
+    >>> device = FakeIOSDevice()
+    >>> port = await device.start()
+    >>> conn = await connect_device("127.0.0.1", port=port, username="admin", password="admin")
+    >>> await device.stop()
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import List, Optional
+
+import asyncssh
+
+USERNAME = "admin"
+PASSWORD = "admin"
+SECRET = "enable"
+
+_SUB_MODES = {"interface": "config-if", "line": "config-line", "router": "config-router"}
+
+
+def running_config(hostname: str, interfaces: int = 48) -> str:
+    """Return a switch configuration long enough to be paged."""
+    lines = ["Building configuration...", "", "Current configuration : 4096 bytes", "!", f"hostname {hostname}", "!"]
+    for port in range(1, interfaces + 1):
+        lines += [f"interface GigabitEthernet1/0/{port}", " switchport mode access", "!"]
+    lines.append("end")
+    return "\n".join(lines)
+
+
+class _Server(asyncssh.SSHServer):
+    def begin_auth(self, username: str) -> bool:
+        return True
+
+    def password_auth_supported(self) -> bool:
+        return True
+
+    def validate_password(self, username: str, password: str) -> bool:
+        return username == USERNAME and password == PASSWORD
+
+
+class _Shell:
+    """One interactive session."""
+
+    def __init__(self, device: "FakeIOSDevice", process: asyncssh.SSHServerProcess) -> None:
+        self.device = device
+        self.process = process
+        self.enabled = False
+        self.mode: Optional[str] = None
+        self.length = 24
+
+    @property
+    def prompt(self) -> str:
+        if self.mode:
+            return f"{self.device.hostname}({self.mode})#"
+        return self.device.hostname + ("#" if self.enabled else ">")
+
+    def write(self, text: str) -> None:
+        self.process.stdout.write(text.replace("\n", "\r\n"))
+
+    async def readline(self, echo: bool = True) -> Optional[str]:
+        chars: List[str] = []
+        while True:
+            char = await self.process.stdin.read(1)
+            if not char:
+                return None
+            if char in "\r\n":
+                if char == "\r" or chars:
+                    self.write("\n")
+                    return "".join(chars)
+                continue
+            chars.append(char)
+            if echo:
+                self.process.stdout.write(char)
+
+    async def page(self, text: str) -> None:
+        lines = text.split("\n")
+        while self.length and len(lines) > self.length:
+            self.write("\n".join(lines[: self.length - 1]) + "\n --More-- ")
+            lines = lines[self.length - 1:]
+            if not await self.process.stdin.read(1):
+                return
+            self.process.stdout.write("\b" * 10 + " " * 10 + "\b" * 10)
+        self.write("\n".join(lines) + "\n")
+
+    async def run(self) -> None:
+        self.write("\nUser Access Verification\n\n" + self.prompt)
+        while True:
+            line = await self.readline()
+            if line is None:
+                break
+            command = " ".join(line.split())
+            if command in ("exit", "logout") and not self.mode:
+                break
+            await self.execute(command)
+            self.write(self.prompt)
+        self.process.exit(0)
+
+    async def execute(self, command: str) -> None:
+        if not command:
+            return
+        if self.mode:
+            self.configure(command)
+        elif command == "enable":
+            self.write("Password: ")
+            secret = await self.readline(echo=False)
+            if secret == SECRET:
+                self.enabled = True
+            else:
+                self.write("% Bad secrets\n\n")
+        elif command.startswith("terminal length "):
+            self.length = int(command.split()[-1])
+        elif command.startswith("terminal width "):
+            pass
+        elif command == "show running-config":
+            await self.page(running_config(self.device.hostname))
+        elif command == "configure terminal" and self.enabled:
+            self.write("Enter configuration commands, one per line.  End with CNTL/Z.\n")
+            self.mode = "config"
+        else:
+            self.write("              ^\n% Invalid input detected at '^' marker.\n\n")
+
+    def configure(self, command: str) -> None:
+        if command == "end":
+            self.mode = None
+        elif command == "exit":
+            self.mode = "config" if self.mode != "config" else None
+        elif command.startswith("bogus"):
+            self.write("              ^\n% Invalid input detected at '^' marker.\n\n")
+        else:
+            self.device.applied.append(command)
+            keyword = command.split()[0]
+            if keyword in _SUB_MODES:
+                self.mode = _SUB_MODES[keyword]
+
+
+class FakeIOSDevice:
+    """IOS SSH stand-in listening on a local port.
+
+    :param hostname: Hostname shown in the prompt.
+    """
+
+    def __init__(self, hostname: str = "rtr01") -> None:
+        self.hostname = hostname
+        self.applied: List[str] = []
+        self.sessions = 0
+        self._acceptor: Optional[asyncssh.SSHAcceptor] = None
+
+    async def _handle(self, process: asyncssh.SSHServerProcess) -> None:
+        self.sessions += 1
+        try:
+            await _Shell(self, process).run()
+        except (asyncssh.BreakReceived, asyncssh.TerminalSizeChanged, ConnectionError):
+            process.exit(1)
+
+    async def start(self) -> int:
+        """Start listening on 127.0.0.1 and return the port."""
+        self._acceptor = await asyncssh.listen(
+            "127.0.0.1",
+            0,
+            server_factory=_Server,
+            server_host_keys=[asyncssh.generate_private_key("ssh-ed25519")],
+            process_factory=self._handle,
+            line_editor=False,
+        )
+        return self._acceptor.get_port()
+
+    async def stop(self) -> None:
+        if self._acceptor is not None:
+            self._acceptor.close()
+            await self._acceptor.wait_closed()
+
+
+async def _main() -> None:  # pragma: no cover - manual use
+    device = FakeIOSDevice()
+    print(f"Listening on 127.0.0.1:{await device.start()}")
+    await asyncio.Event().wait()
+
+
+if __name__ == "__main__":  # pragma: no cover
+    asyncio.run(_main())
@@ -0,0 +1,68 @@
+"""Tests for :mod:`na_utils.change_plan`."""
+
+import pytest
+
+from na_utils.change_plan import ChangePlan, order_removals, plan_removals
+
+RUNNING = """hostname rtr01
+flow record FR1
+flow exporter FE1
+flow monitor FM1
+ record FR1
+ exporter FE1
+mgcp
+mgcp call-agent 10.0.0.1
+voice register global
+ mode cme
+voice register pool 1
+ id mac 0011.2233.4455
+"""
+
+
+def test_referrers_are_removed_first():
+    commands = ["no flow exporter FE1", "no flow record FR1", "no flow monitor FM1", "no mgcp"]
+    assert order_removals(commands) == [
+        "no flow monitor FM1",
+        "no flow exporter FE1",
+        "no flow record FR1",
+        "no mgcp",
+    ]
+
+
+def test_order_is_stable_without_dependencies():
+    commands = ["no mgcp", "no ccm-manager fallback-mgcp", "no sccp"]
+    assert order_removals(commands) == commands
+
+
+def test_voice_register_pool_before_global():
+    assert order_removals(["no voice register global", "no voice register pool 1"]) == [
+        "no voice register pool 1",
+        "no voice register global",
+    ]
+
+
+def test_plan_keeps_only_configured_targets():
+    plan = plan_removals(
+        ["no mgcp", "!", "no sccp", "no flow record FR1", "no flow monitor FM1", "no voice register global"],
+        RUNNING,
+    )
+    assert plan.commands == ["no mgcp", "no flow monitor FM1", "no flow record FR1", "no voice register global"]
+    assert plan.absent == ["no sccp"]
+
+
+def test_nothing_to_remove_is_falsy():
+    plan = plan_removals(["no sccp", "no mgcp call-agent 10.9.9.9"], RUNNING)
+    assert not plan
+    assert isinstance(plan, ChangePlan)
+
+
+def test_without_archive_everything_is_planned():
+    assert plan_removals(["no flow record FR1", "no flow monitor FM1"], None).commands == [
+        "no flow monitor FM1",
+        "no flow record FR1",
+    ]
+
+
+def test_non_removal_command_is_rejected():
+    with pytest.raises(ValueError):
+        plan_removals(["mgcp"], RUNNING)
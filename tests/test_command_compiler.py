@@ -0,0 +1,74 @@
+"""Tests for :mod:`na_utils.command_compiler`."""
+
+from na_utils.command_compiler import compile_commands, expand_interface_range, interface_ranges
+from na_utils.simulate import ConfigModel
+
+
+def _block(name, *body):
+    return [f"interface {name}", *body, "exit"]
+
+
+def test_identical_blocks_become_one_range():
+    commands = []
+    for port in range(1, 25):
+        commands += _block(f"GigabitEthernet1/0/{port}", "no lldp transmit", "no lldp receive")
+    assert compile_commands(commands) == [
+        "interface range GigabitEthernet1/0/1 - 24",
+        "no lldp transmit",
+        "no lldp receive",
+    ]
+
+
+def test_ranges_are_capped_per_command():
+    names = [f"Gi{stack}/0/{port}" for stack in range(1, 8) for port in (1, 3)]
+    commands = interface_ranges(names)
+    assert len(commands) == 3
+    assert all(len(command.split(" , ")) <= 5 for command in commands)
+    assert [name for command in commands for name in expand_interface_range(command[len("interface range "):])] == names
+
+
+def test_different_bodies_and_unrangeable_names():
+    commands = (
+        _block("Gi1/0/1", "shutdown")
+        + _block("Gi1/0/2", "no shutdown")
+        + _block("Gi1/0/3", "shutdown")
+        + _block("Gi1/0/1.100", "shutdown")
+    )
+    assert compile_commands(commands) == [
+        "interface Gi1/0/1.100",
+        "shutdown",
+        "interface range Gi1/0/1 , Gi1/0/3",
+        "shutdown",
+        "interface Gi1/0/2",
+        "no shutdown",
+    ]
+
+
+def test_global_commands_keep_their_position():
+    commands = _block("Gi1/0/1", "shutdown") + ["ip ssh version 2"] + _block("Gi1/0/2", "shutdown")
+    assert compile_commands(commands) == [
+        "interface Gi1/0/1",
+        "shutdown",
+        "exit",
+        "ip ssh version 2",
+        "interface Gi1/0/2",
+        "shutdown",
+    ]
+
+
+def test_repeated_interface_keeps_block_order():
+    commands = _block("Gi1/0/1", "shutdown") + _block("Gi1/0/2", "shutdown") + _block("Gi1/0/1", "no shutdown")
+    compiled = compile_commands(commands)
+    assert compiled == ["interface range Gi1/0/1 - 2", "shutdown", "interface Gi1/0/1", "no shutdown"]
+
+
+def test_compiled_commands_have_the_same_effect():
+    config = "".join(f"interface Gi1/0/{port}\n no cdp enable\n" for port in range(1, 13))
+    commands = []
+    for port in range(1, 13):
+        body = ("no lldp transmit", "no lldp receive") if port % 4 else ("description uplink",)
+        commands += _block(f"Gi1/0/{port}", *body)
+    flat, compiled = ConfigModel(config), ConfigModel(config)
+    flat.apply(commands)
+    compiled.apply(compile_commands(commands))
+    assert flat.render() == compiled.render()
@@ -0,0 +1,60 @@
+"""Tests for :class:`na_utils.config_store.ConfigStore`."""
+
+from datetime import date
+
+from na_utils.config_store import ConfigStore, normalize_config
+
+CONFIG_A = "hostname rtr01\n!\ninterface Gi0/0\n ip address 10.0.0.1 255.255.255.0\n"
+CONFIG_B = "hostname rtr01\n!\ninterface Gi0/0\n ip address 10.0.0.2 255.255.255.0\n"
+
+
+def test_normalize_drops_volatile_lines():
+    text = "Building configuration...\r\n! Last configuration change at 10:00\r\nhostname rtr01  \r\n"
+    assert normalize_config(text) == "hostname rtr01\n"
+
+
+def test_put_deduplicates_and_reports_changes(tmp_path):
+    store = ConfigStore(str(tmp_path))
+    first = store.put("rtr01", CONFIG_A, timestamp="2026-01-01T01:00:00")
+    same = store.put("rtr01", "! Last configuration change at 02:00\n" + CONFIG_A, timestamp="2026-01-02T01:00:00")
+    other = store.put("rtr01", CONFIG_B, timestamp="2026-01-03T01:00:00")
+    assert first.changed and not same.changed and other.changed
+    assert first.digest == same.digest
+    assert len(list((tmp_path / "objects").rglob("*.gz"))) == 2
+    assert [snap.timestamp for snap in store.history("rtr01", changes_only=True)] == [
+        "2026-01-01T01:00:00",
+        "2026-01-03T01:00:00",
+    ]
+
+
+def test_latest_and_as_of(tmp_path):
+    store = ConfigStore(str(tmp_path))
+    assert store.latest("rtr01") is None
+    store.put("rtr01", CONFIG_A, timestamp="2026-01-01T01:00:00")
+    store.put("rtr01", CONFIG_B, timestamp="2026-01-05T01:00:00")
+    assert store.latest("rtr01").timestamp == "2026-01-05T01:00:00"
+    assert store.as_of("rtr01", "2026-01-03").timestamp == "2026-01-01T01:00:00"
+    assert store.as_of("rtr01", date(2026, 1, 5)).timestamp == "2026-01-05T01:00:00"
+    assert store.as_of("rtr01", "2026-01-05T00:59:59").timestamp == "2026-01-01T01:00:00"
+    assert store.as_of("rtr01", "2025-12-31") is None
+    assert store.get_config("rtr01", as_of="2026-01-02") == normalize_config(CONFIG_A)
+
+
+def test_out_of_order_put_keeps_latest(tmp_path):
+    store = ConfigStore(str(tmp_path))
+    store.put("rtr01", CONFIG_A, timestamp="2026-02-01T00:00:00")
+    older = store.put("rtr01", CONFIG_B, timestamp="2026-01-01T00:00:00")
+    assert older.changed
+    assert store.latest("rtr01").timestamp == "2026-02-01T00:00:00"
+    assert not store.has_changed("rtr01", CONFIG_A)
+    assert not store.put("rtr01", CONFIG_A, timestamp="2026-02-02T00:00:00").changed
+    assert store.as_of("rtr01", "2026-01-15").timestamp == "2026-01-01T00:00:00"
+
+    # A new store reads the head from the tail of the index file.
+    reopened = ConfigStore(str(tmp_path))
+    assert reopened.latest("rtr01").timestamp == "2026-02-02T00:00:00"
+    assert [snap.timestamp for snap in reopened.history("rtr01")] == [
+        "2026-01-01T00:00:00",
+        "2026-02-01T00:00:00",
+        "2026-02-02T00:00:00",
+    ]
@@ -0,0 +1,50 @@
+"""Tests for the structured diff in :mod:`na_utils.config_utils`."""
+
+from na_utils.config_utils import diff_config_text
+from na_utils.simulate import ConfigModel
+
+OLD = """hostname rtr01
+interface Vlan10
+ description users
+ ip address 10.0.0.1 255.255.255.0
+ ip address 10.1.0.1 255.255.255.0 secondary
+ ipv6 address 2001:db8::1/64
+"""
+
+
+def test_replaced_single_value_needs_no_removal():
+    new = OLD.replace("hostname rtr01", "hostname rtr02").replace("description users", "description staff")
+    assert diff_config_text(OLD, new).remediation() == [
+        "hostname rtr02",
+        "interface Vlan10",
+        " description staff",
+    ]
+
+
+def test_removed_secondary_address_is_negated():
+    new = OLD.replace(
+        " ip address 10.1.0.1 255.255.255.0 secondary", " ip address 10.2.0.1 255.255.255.0 secondary"
+    ).replace("10.0.0.1", "10.0.0.2")
+    assert diff_config_text(OLD, new).remediation() == [
+        "interface Vlan10",
+        " no ip address 10.1.0.1 255.255.255.0 secondary",
+        " ip address 10.0.0.2 255.255.255.0",
+        " ip address 10.2.0.1 255.255.255.0 secondary",
+    ]
+
+
+def test_ipv6_addresses_are_multi_valued():
+    new = OLD.replace("2001:db8::1/64", "2001:db8::2/64")
+    assert diff_config_text(OLD, new).remediation() == [
+        "interface Vlan10",
+        " no ipv6 address 2001:db8::1/64",
+        " ipv6 address 2001:db8::2/64",
+    ]
+
+
+def test_remediation_applied_to_model_reaches_new_config():
+    new = OLD.replace(" ip address 10.1.0.1 255.255.255.0 secondary\n", " ip address 10.0.0.9 255.255.255.0\n")
+    new = new.replace(" ip address 10.0.0.1 255.255.255.0\n", "")
+    model = ConfigModel(OLD)
+    model.apply(diff_config_text(OLD, new).remediation())
+    assert not diff_config_text(model.render(), new)
@@ -0,0 +1,85 @@
+"""Tests for :mod:`na_utils.dnac` device filtering."""
+
+import email.utils
+import time
+
+from na_utils.dnac import DnacClient, build_device_query, retry_delay
+
+DEVICES = [
+    {"hostname": "rtr01", "family": "Routers", "role": "BORDER ROUTER", "siteId": "a"},
+    {"hostname": "sw01", "family": "Switches and Hubs", "role": "ACCESS", "siteId": "b"},
+    {"hostname": "ap01", "family": "Unified AP", "role": "ACCESS", "siteId": "a"},
+]
+
+
+def _client(server_filter=True):
+    """Client whose device pages come from ``DEVICES``, filtered like the server."""
+    client = DnacClient(base_url="https://dnac.example", user="u", password="p")
+    client.requests = []
+
+    def iter_paginated(endpoint, *, page_size=None, params=None, base_url=None, token=None):
+        client.requests.append(params)
+        for dev in DEVICES:
+            ok = True
+            for key, value in (params or {}).items():
+                accepted = value if isinstance(value, list) else [value]
+                ok = ok and dev.get(key) in accepted
+            if ok or not server_filter:
+                yield dev
+
+    client.iter_paginated = iter_paginated
+    return client
+
+
+def test_build_device_query_splits_filters():
+    params, local = build_device_query({"family": ("routers", "Switches and Hubs"), "siteId": "a", "role": None})
+    assert params == {"family": ["Routers", "Switches and Hubs"]}
+    assert local == {"siteId": ["a"]}
+
+
+def test_tuple_filter_is_evaluated_by_the_server_only():
+    client = _client()
+    devices = list(client.iter_devices(filters={"family": ("Routers", "Switches and Hubs")}))
+    assert [dev["hostname"] for dev in devices] == ["rtr01", "sw01"]
+    assert client.requests == [{"family": ["Routers", "Switches and Hubs"]}]
+
+
+def test_none_filter_is_ignored():
+    client = _client()
+    devices = list(client.iter_devices(filters={"family": "Routers", "role": None}))
+    assert [dev["hostname"] for dev in devices] == ["rtr01"]
+
+
+def test_server_side_matches_are_not_rechecked():
+    # The server matched a wildcard hostname; the record must not be dropped locally.
+    client = _client(server_filter=False)
+    devices = list(client.iter_devices(filters={"hostname": "rtr.*"}))
+    assert len(devices) == len(DEVICES)
+
+
+def test_local_filters_accept_sets_of_alternatives():
+    client = _client(server_filter=False)
+    devices = list(client.iter_devices(filters={"siteId": {"a"}}))
+    assert [dev["hostname"] for dev in devices] == ["rtr01", "ap01"]
+
+
+class _Response:
+    def __init__(self, retry_after=None):
+        self.headers = {"Retry-After": retry_after} if retry_after is not None else {}
+
+
+def test_retry_delay_honours_seconds_and_dates():
+    assert retry_delay(_Response("7"), 0) == 7.0
+    assert retry_delay(_Response("600"), 0) == 60.0
+    future = time.time() + 30
+    aware = email.utils.formatdate(future, usegmt=True)
+    naive = email.utils.formatdate(future - time.localtime(future).tm_gmtoff).rsplit(" ", 1)[0] + " -0000"
+    assert 25 <= retry_delay(_Response(aware), 0) <= 30
+    assert 25 <= retry_delay(_Response(naive), 0) <= 30
+
+
+def test_invalid_retry_after_falls_back_to_backoff():
+    for attempt in range(4):
+        delay = retry_delay(_Response("soon"), attempt)
+        assert 0.5 * 2 ** attempt <= delay <= 1.5 * 2 ** attempt
+    assert 0.5 <= retry_delay(_Response(), 0) <= 1.5
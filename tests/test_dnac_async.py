@@ -0,0 +1,91 @@
+"""Tests for :mod:`na_utils.dnac_async` against a local aiohttp server."""
+
+import asyncio
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+from na_utils.dnac import RateLimiter
+from na_utils.dnac_async import AsyncDnacClient
+
+CLIENTS = "/dna/data/api/v1/clients"
+
+
+async def _serve(statuses):
+    """Answer ``CLIENTS`` with ``statuses`` in turn, then with records."""
+    calls = []
+
+    async def clients(request):
+        calls.append(dict(request.query))
+        if len(calls) <= len(statuses):
+            return web.Response(status=statuses[len(calls) - 1], headers={"Retry-After": "0"})
+        return web.json_response({"response": [{"id": "a"}, {"id": "b"}]})
+
+    app = web.Application()
+    app.router.add_get(CLIENTS, clients)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    return runner, f"http://127.0.0.1:{port}", calls
+
+
+def _client(base_url, **kwargs):
+    return AsyncDnacClient(base_url=base_url, rate_limiter=RateLimiter({"data": 100.0}), **kwargs)
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_throttled_requests_are_retried(stream):
+    async def scenario():
+        runner, base_url, calls = await _serve([429, 503])
+        try:
+            async with _client(base_url) as client:
+                records = [
+                    rec async for rec in client.iter_paginated(CLIENTS, page_size=10, stream=stream, token="t")
+                ]
+        finally:
+            await runner.cleanup()
+        return client, records, calls
+
+    client, records, calls = asyncio.run(scenario())
+    assert records == [{"id": "a"}, {"id": "b"}]
+    assert len(calls) == 3
+    stats = client.rate_limiter.stats["data"]
+    assert stats["requests"] == 3
+    assert stats["retries"] == 2
+
+
+def test_persistent_throttling_raises_after_max_retries():
+    async def scenario():
+        runner, base_url, calls = await _serve([429] * 5)
+        try:
+            async with _client(base_url, max_retries=2) as client:
+                with pytest.raises(aiohttp.ClientResponseError) as excinfo:
+                    await client.get(CLIENTS, token="t")
+        finally:
+            await runner.cleanup()
+        return excinfo.value, calls
+
+    error, calls = asyncio.run(scenario())
+    assert error.status == 429
+    assert len(calls) == 3
+
+
+def test_async_requests_share_the_queue():
+    limiter = RateLimiter({"data": 20.0}, burst=1)
+
+    async def scenario():
+        runner, base_url, _ = await _serve([])
+        try:
+            async with AsyncDnacClient(base_url=base_url, rate_limiter=limiter) as client:
+                await asyncio.gather(*(client.get(CLIENTS, token="t") for _ in range(4)))
+        finally:
+            await runner.cleanup()
+
+    asyncio.run(scenario())
+    stats = limiter.stats["data"]
+    assert stats["requests"] == 4
+    assert stats["queued"] == 3
+    assert stats["queued_seconds"] > 0.2
@@ -0,0 +1,53 @@
+"""Tests for :mod:`na_utils.jsonstream`."""
+
+import json
+import random
+
+import pytest
+
+from na_utils.jsonstream import JsonArrayDecoder, iter_json_array
+
+RECORDS = [
+    {"hostname": f"sw{i}", "managementIpAddress": f"10.0.0.{i}", "note": "café \"quoted\" [x] {y}", "n": i * 1.5}
+    for i in range(50)
+]
+
+
+def _chunks(data, rng):
+    pos = 0
+    while pos < len(data):
+        size = rng.randrange(1, 17)
+        yield data[pos:pos + size]
+        pos += size
+
+
+def test_envelope_split_at_every_boundary():
+    body = json.dumps({"version": "1.0", "meta": {"response": [1]}, "response": RECORDS, "tail": [1, 2]}).encode()
+    rng = random.Random(3)
+    for _ in range(20):
+        assert list(iter_json_array(_chunks(body, rng))) == RECORDS
+
+
+def test_bare_list_and_projection():
+    body = json.dumps(RECORDS).encode()
+    result = list(iter_json_array([body[:100], body[100:]], fields=("hostname",)))
+    assert result == [{"hostname": record["hostname"]} for record in RECORDS]
+
+
+def test_multibyte_characters_split_across_chunks():
+    body = json.dumps({"response": [{"name": "é中"}]}, ensure_ascii=False).encode("utf-8")
+    assert list(iter_json_array([bytes([byte]) for byte in body])) == [{"name": "é中"}]
+
+
+def test_elements_are_emitted_as_soon_as_complete():
+    decoder = JsonArrayDecoder()
+    assert decoder.feed('{"response": [{"a": 1}, {"b"') == [{"a": 1}]
+    assert decoder.feed(": 2}]}") == [{"b": 2}]
+    assert decoder.close() == []
+    assert decoder.count == 2
+
+
+@pytest.mark.parametrize("body", ['{"response": [1, 2', '{"other": []}', '{"response": [1,, 2]}'])
+def test_malformed_bodies_raise(body):
+    with pytest.raises(ValueError):
+        list(iter_json_array([body]))
@@ -0,0 +1,67 @@
+"""Tests for :mod:`na_utils.line_diff` and the unified diff helpers."""
+
+import difflib
+import random
+
+from na_utils.config_utils import compare_configs
+from na_utils.line_diff import get_opcodes, unified_diff
+
+VOCABULARY = ["!", " shutdown", " switchport mode access", " description uplink", "interface Gi1/0/1", "end"]
+
+
+def _random_pair(rng):
+    old = [rng.choice(VOCABULARY) for _ in range(rng.randrange(0, 40))]
+    new = list(old)
+    for _ in range(rng.randrange(0, 6)):
+        if new and rng.random() < 0.5:
+            del new[rng.randrange(len(new))]
+        else:
+            new.insert(rng.randrange(len(new) + 1), rng.choice(VOCABULARY + [" mtu 9000"]))
+    return old, new
+
+
+def _changed(diff):
+    return sum(1 for line in diff[2:] if line[:1] in ("+", "-"))
+
+
+def test_opcodes_rebuild_the_new_sequence():
+    rng = random.Random(7)
+    for _ in range(500):
+        old, new = _random_pair(rng)
+        rebuilt = []
+        for tag, i1, i2, j1, j2 in get_opcodes(old, new):
+            if tag == "equal":
+                assert old[i1:i2] == new[j1:j2]
+                rebuilt.extend(old[i1:i2])
+            else:
+                rebuilt.extend(new[j1:j2])
+        assert rebuilt == new
+
+
+def test_diff_is_never_larger_than_difflib():
+    rng = random.Random(11)
+    for _ in range(500):
+        old, new = _random_pair(rng)
+        fast = list(unified_diff(old, new, "a", "b", lineterm=""))
+        slow = list(difflib.unified_diff(old, new, "a", "b", lineterm=""))
+        assert _changed(fast) <= _changed(slow)
+        assert bool(fast) == bool(slow)
+
+
+def test_unambiguous_edit_matches_difflib():
+    old = [f"line {i}" for i in range(100)]
+    new = old[:10] + ["inserted"] + old[10:50] + old[51:]
+    assert list(unified_diff(old, new, "a", "b")) == list(difflib.unified_diff(old, new, "a", "b"))
+
+
+def test_compare_configs_defaults_to_difflib(tmp_path):
+    old = ["interface Gi1/0/1\n", " shutdown\n", "!\n"] * 20
+    new = list(old)
+    del new[4]
+    new.insert(30, " shutdown\n")
+    (tmp_path / "a.conf").write_text("".join(old))
+    (tmp_path / "b.conf").write_text("".join(new))
+    a, b = str(tmp_path / "a.conf"), str(tmp_path / "b.conf")
+    expected = "\n".join(difflib.unified_diff(old, new, fromfile=a, tofile=b, lineterm=""))
+    assert compare_configs(a, b) == expected
+    assert compare_configs(a, b, fast=True) == "\n".join(unified_diff(old, new, fromfile=a, tofile=b, lineterm=""))
@@ -0,0 +1,126 @@
+"""Tests for :class:`na_utils.net_device.ConnectionPool`."""
+
+import threading
+import time
+
+import pytest
+
+from na_utils.net_device import ConnectionPool
+
+
+class FakeConnection:
+    def __init__(self, host):
+        self.host = host
+        self.closed = False
+
+    def find_prompt(self):
+        return f"{self.host}#"
+
+    def disconnect(self):
+        self.closed = True
+
+
+class FakeConnector:
+    """Slow ``connect`` callable that records every session it opens."""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.opened = []
+        self.lock = threading.Lock()
+
+    def __call__(self, host, **kwargs):
+        time.sleep(self.delay)
+        conn = FakeConnection(host)
+        with self.lock:
+            self.opened.append(conn)
+        return conn
+
+
+def _run_threads(count, target):
+    errors = []
+
+    def wrapper():
+        try:
+            target()
+        except BaseException as exc:  # pragma: no cover - reported below
+            errors.append(exc)
+
+    threads = [threading.Thread(target=wrapper) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+    assert not errors, errors
+
+
+def test_concurrent_acquire_of_new_host_connects_once():
+    connector = FakeConnector()
+    pool = ConnectionPool(connect=connector)
+    in_use = []
+    overlap = []
+
+    def worker():
+        with pool.session("h1") as conn:
+            if in_use:
+                overlap.append(conn)
+            in_use.append(conn)
+            time.sleep(0.01)
+            in_use.remove(conn)
+
+    _run_threads(4, worker)
+    pool.close()
+    assert len(connector.opened) == 1
+    assert not overlap
+    assert all(conn.closed for conn in connector.opened)
+    assert pool.stats["connects"] == 1
+    assert pool.stats["hits"] == 3
+
+
+def test_failed_connect_releases_reservation():
+    calls = []
+
+    def connect(host, **kwargs):
+        calls.append(host)
+        if len(calls) == 1:
+            return None
+        return FakeConnection(host)
+
+    pool = ConnectionPool(connect=connect, max_sessions=1)
+    with pytest.raises(RuntimeError):
+        pool.acquire("h1")
+    assert len(pool) == 0
+    with pool.session("h1") as conn:
+        assert conn.host == "h1"
+    pool.close()
+
+
+def test_release_by_other_thread_is_rejected():
+    pool = ConnectionPool(connect=FakeConnector(delay=0))
+    conn = pool.acquire("h1")
+    errors = []
+
+    def other():
+        try:
+            pool.release("h1")
+        except RuntimeError as exc:
+            errors.append(exc)
+
+    thread = threading.Thread(target=other)
+    thread.start()
+    thread.join()
+    assert errors
+    pool.release("h1")
+    pool.close()
+    assert conn.closed
+
+
+def test_max_sessions_evicts_least_recently_used():
+    connector = FakeConnector(delay=0)
+    pool = ConnectionPool(connect=connector, max_sessions=2)
+    for host in ("h1", "h2", "h3"):
+        with pool.session(host):
+            pass
+    assert len(pool) == 2
+    assert pool.stats["evicted"] == 1
+    assert connector.opened[0].closed
+    pool.close()
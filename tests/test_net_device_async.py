@@ -0,0 +1,130 @@
+"""Tests for :mod:`na_utils.net_device_async` against a local IOS stand-in."""
+
+import asyncio
+import socket
+
+from fake_ios_ssh import PASSWORD, SECRET, USERNAME, FakeIOSDevice, running_config
+
+from na_utils.net_device_async import connect_device, run_on_devices, send_command, send_config_commands
+
+
+def _connect(port, **kwargs):
+    return connect_device("127.0.0.1", port=port, username=USERNAME, password=PASSWORD, **kwargs)
+
+
+def test_prompt_enable_and_paging():
+    async def scenario():
+        device = FakeIOSDevice()
+        port = await device.start()
+        try:
+            conn = await _connect(port, secret=SECRET)
+            assert conn is not None
+            async with conn:
+                assert conn.base_prompt == "rtr01"
+                assert conn.check_enable_mode()
+                output = await send_command(conn, "show running-config")
+        finally:
+            await device.stop()
+        return output
+
+    output = asyncio.run(scenario())
+    expected = running_config("rtr01").splitlines()
+    assert output.splitlines() == expected
+
+
+def test_pager_answered_when_paging_stays_enabled():
+    async def scenario():
+        device = FakeIOSDevice()
+        port = await device.start()
+        try:
+            conn = await _connect(port, secret=SECRET)
+            async with conn:
+                await conn.send_command("terminal length 24")
+                output = await conn.send_command("show running-config")
+        finally:
+            await device.stop()
+        return output
+
+    output = asyncio.run(scenario())
+    assert "--More--" not in output
+    assert [line.strip() for line in output.splitlines() if line.strip()] == [
+        line.strip() for line in running_config("rtr01").splitlines() if line.strip()
+    ]
+
+
+def test_send_config_set_enters_and_leaves_config_mode():
+    async def scenario():
+        device = FakeIOSDevice()
+        port = await device.start()
+        try:
+            conn = await _connect(port, secret=SECRET)
+            async with conn:
+                output = await send_config_commands(
+                    conn, ["interface GigabitEthernet1/0/1", "no lldp transmit", "exit", "bogus command"]
+                )
+                prompt = conn.prompt
+        finally:
+            await device.stop()
+        return device, output, prompt
+
+    device, output, prompt = asyncio.run(scenario())
+    assert device.applied == ["interface GigabitEthernet1/0/1", "no lldp transmit"]
+    assert "rtr01(config-if)#" in output
+    assert "% Invalid input" in output
+    assert prompt == "rtr01#"
+
+
+def test_many_concurrent_sessions():
+    async def scenario():
+        device = FakeIOSDevice()
+        port = await device.start()
+
+        async def backup(host):
+            conn = await _connect(port, secret=SECRET)
+            if conn is None:
+                raise RuntimeError("SSH connection failed")
+            async with conn:
+                return await conn.send_command("show running-config")
+
+        try:
+            results = await run_on_devices(range(25), backup, concurrency=25, progress=False)
+        finally:
+            await device.stop()
+        return device, results
+
+    device, results = asyncio.run(scenario())
+    assert all(result.ok for result in results)
+    assert device.sessions == 25
+
+
+def test_refused_connection_is_reported(capsys):
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    assert asyncio.run(_connect(port)) is None
+    assert "Error connecting to 127.0.0.1" in capsys.readouterr().out
+
+
+def test_task_timeouts_are_failures_without_host_timeout():
+    async def task(host):
+        if host == "b":
+            raise asyncio.TimeoutError()
+        return host
+
+    results = asyncio.run(run_on_devices(["a", "b", "c"], task, progress=False))
+    assert [(result.status, result.result) for result in results] == [("ok", "a"), ("failed", None), ("ok", "c")]
+    assert results[1].error == "TimeoutError"
+
+
+def test_host_timeout_is_reported():
+    async def task(host):
+        if host == "slow":
+            await asyncio.sleep(5)
+        if host == "own":
+            raise asyncio.TimeoutError("read timed out")
+        return host
+
+    results = asyncio.run(run_on_devices(["fast", "slow", "own"], task, per_host_timeout=0.2, progress=False))
+    assert [result.status for result in results] == ["ok", "timeout", "failed"]
+    assert results[1].error == "timed out after 0.2s"
+    assert results[2].error == "read timed out"
@@ -0,0 +1,141 @@
+"""Tests for :func:`na_utils.transaction.run_transaction`."""
+
+import re
+
+import pytest
+
+from na_utils.simulate import ConfigModel
+from na_utils.transaction import (
+    SNAPSHOT_PATH,
+    TransactionError,
+    run_transaction,
+    send_confirmed,
+    touched_sections,
+)
+
+RUNNING = """hostname rtr01
+mgcp
+mgcp call-agent 10.0.0.1
+ccm-manager config server 10.0.0.2
+voice register global
+ mode cme
+interface GigabitEthernet0/0
+ ip address 192.0.2.1 255.255.255.0
+"""
+COMMANDS = ["no mgcp call-agent 10.0.0.1", "no mgcp", "no ccm-manager config server 10.0.0.2"]
+CONFIRM = ["no voice register global"]
+
+
+class FakeDevice:
+    """Netmiko stand-in applying configuration commands to a :class:`ConfigModel`.
+
+    :param flash: Whether copying to flash succeeds.
+    :param ignore: Commands the device accepts but does not apply.
+    """
+
+    def __init__(self, flash=True, ignore=()):
+        self.model = ConfigModel(RUNNING)
+        self.flash = flash
+        self.ignore = ignore
+        self.files = {}
+        self.sent = []
+        self._prompt = None
+
+    def _sections(self, pattern):
+        regex = re.compile(pattern)
+        lines, keep = [], False
+        for line in self.model.render().splitlines():
+            if not line.startswith(" "):
+                keep = bool(regex.search(line))
+            if keep:
+                lines.append(line)
+        return "\n".join(lines)
+
+    def send_command(self, command, **kwargs):
+        self.sent.append(command)
+        if command.startswith("show running-config | section "):
+            return self._sections(command.split("section ", 1)[1])
+        return "[OK]" if command == "write memory" else ""
+
+    def send_config_set(self, commands, **kwargs):
+        self.sent.extend(commands)
+        self.model.apply([command for command in commands if command not in self.ignore])
+        return "\n".join(commands)
+
+    def send_command_timing(self, command, **kwargs):
+        self.sent.append(command)
+        prompt, self._prompt = self._prompt, None
+        if command.startswith("copy running-config "):
+            if not self.flash:
+                return "%Error opening flash:na-rollback.cfg (No space left on device)"
+            self._prompt = "copy"
+            return "Destination filename [na-rollback.cfg]? "
+        if prompt == "copy" and command == "":
+            self.files[SNAPSHOT_PATH] = self.model.render()
+            return "2048 bytes copied in 0.1 secs"
+        if command.startswith("delete /force "):
+            self.files.pop(command.split()[-1], None)
+            return ""
+        if command == f"configure replace {SNAPSHOT_PATH} force":
+            self.model = ConfigModel(self.files[SNAPSHOT_PATH])
+            return "Total number of passes: 1\nRollback Done"
+        if command in CONFIRM:
+            self._prompt = command
+            return "This will remove all voice register pools [yes/no]: "
+        if prompt and command == "yes" and prompt not in self.ignore:
+            self.model.apply([prompt])
+        return ""
+
+
+def test_touched_sections_drops_covered_keywords():
+    assert touched_sections(COMMANDS + CONFIRM) == ["mgcp", "ccm-manager config", "voice register"]
+    assert touched_sections(["interface range Gi1/0/1 - 2", " no lldp transmit", "exit", "ip ssh version 2"]) == [
+        "interface",
+        "ip ssh",
+    ]
+
+
+def test_send_confirmed_answers_each_prompt_once():
+    device = FakeDevice()
+    send_confirmed(device, CONFIRM[0])
+    assert device.sent == [CONFIRM[0], "yes"]
+
+
+def test_successful_change_is_saved_and_snapshot_deleted():
+    device = FakeDevice()
+    result = run_transaction(device, COMMANDS, confirm_commands=CONFIRM)
+    assert result.snapshot == SNAPSHOT_PATH
+    assert not result.problems and not result.rolled_back
+    assert result.after == ""
+    assert "write memory" in device.sent
+    assert device.files == {}
+    assert "mgcp" not in device.model.render()
+
+
+@pytest.mark.parametrize("flash", [True, False])
+def test_unverified_change_is_rolled_back(flash):
+    device = FakeDevice(flash=flash, ignore=("no mgcp",))
+    with pytest.raises(TransactionError) as info:
+        run_transaction(device, COMMANDS, confirm_commands=CONFIRM)
+    result = info.value.result
+    assert result.problems == ["'mgcp' is still configured"]
+    assert result.snapshot == (SNAPSHOT_PATH if flash else "capture")
+    assert result.rolled_back and result.restored
+    assert "write memory" not in device.sent
+    assert device.files == {}
+    assert sorted(device.model.render().splitlines()) == sorted(ConfigModel(RUNNING).render().splitlines())
+
+
+def test_snapshot_deleted_when_rollback_fails():
+    device = FakeDevice(ignore=("no mgcp",))
+
+    def failing_replace(command, **kwargs):
+        if command.startswith("configure replace"):
+            return "%Error: rollback aborted"
+        return FakeDevice.send_command_timing(device, command, **kwargs)
+
+    device.send_command_timing = failing_replace
+    with pytest.raises(TransactionError, match="rollback failed") as info:
+        run_transaction(device, COMMANDS)
+    assert not info.value.result.rolled_back
+    assert device.files == {}